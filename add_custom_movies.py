@@ -1,23 +1,8 @@
-import pandas as pd
-import pickle
 import os
-import requests
-from sklearn.feature_extraction.text import CountVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from http_client import http_client
+from model_store import update_model_with_new_movies
 import ast
 
-def load_existing_model():
-    """Load existing model files"""
-    try:
-        with open('model/movie_list.pkl', 'rb') as f:
-            movie_list = pickle.load(f)
-        with open('model/similarity.pkl', 'rb') as f:
-            similarity = pickle.load(f)
-        return movie_list, similarity
-    except FileNotFoundError:
-        print("Model files not found. Please run generate_model.py first.")
-        return None, None
-
 def get_movie_info_from_tmdb(movie_title, api_key=None):
     """Get movie information from TMDB API (optional)"""
     if not api_key:
@@ -33,7 +18,7 @@ def get_movie_info_from_tmdb(movie_title, api_key=None):
             'language': 'en-US'
         }
         
-        response = requests.get(search_url, params=params)
+        response = http_client.get(search_url, params=params)
         response.raise_for_status()
         
         results = response.json().get('results', [])
@@ -42,13 +27,13 @@ def get_movie_info_from_tmdb(movie_title, api_key=None):
             
             # Get detailed movie info
             movie_url = f"https://api.themoviedb.org/3/movie/{movie_id}"
-            movie_response = requests.get(movie_url, params={'api_key': api_key})
+            movie_response = http_client.get(movie_url, params={'api_key': api_key})
             movie_response.raise_for_status()
             movie_data = movie_response.json()
             
             # Get credits
             credits_url = f"https://api.themoviedb.org/3/movie/{movie_id}/credits"
-            credits_response = requests.get(credits_url, params={'api_key': api_key})
+            credits_response = http_client.get(credits_url, params={'api_key': api_key})
             credits_response.raise_for_status()
             credits_data = credits_response.json()
             
@@ -88,52 +73,6 @@ def add_custom_movie(movie_title, overview="", genres=None, keywords=None, cast=
     
     return movie_data
 
-def update_model_with_new_movies(new_movies):
-    """Update the model with new movies"""
-    print("Loading existing model...")
-    movie_list, similarity = load_existing_model()
-    
-    if movie_list is None:
-        return False
-    
-    print(f"Current movies in system: {len(movie_list)}")
-    
-    # Convert new movies to the same format as existing ones
-    for movie in new_movies:
-        # Create tags by combining all features
-        tags = []
-        if movie['overview']:
-            tags.extend(movie['overview'].split())
-        tags.extend(movie['genres'])
-        tags.extend(movie['keywords'])
-        tags.extend(movie['cast'])
-        tags.extend(movie['crew'])
-        
-        # Add to movie list
-        new_row = pd.DataFrame([{
-            'movie_id': f"custom_{len(movie_list) + 1}",
-            'title': movie['title'],
-            'tags': ' '.join(tags)
-        }])
-        
-        movie_list = pd.concat([movie_list, new_row], ignore_index=True)
-    
-    print(f"Updated movies in system: {len(movie_list)}")
-    
-    # Recalculate similarity matrix
-    print("Recalculating similarity matrix...")
-    cv = CountVectorizer(max_features=5000, stop_words='english')
-    vector = cv.fit_transform(movie_list['tags']).toarray()
-    new_similarity = cosine_similarity(vector)
-    
-    # Save updated model
-    print("Saving updated model...")
-    pickle.dump(movie_list, open('model/movie_list.pkl', 'wb'))
-    pickle.dump(new_similarity, open('model/similarity.pkl', 'wb'))
-    
-    print("Model updated successfully!")
-    return True
-
 def main():
     """Main function to add custom movies"""
     print("🎬 Add Custom Movies to Recommender System")
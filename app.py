@@ -1,16 +1,25 @@
-import pickle
 import streamlit as st
-import requests
 import os
+from model_store import (load_model, model_signature, get_filtered_neighbors, get_movie_metadata, filter_mask,
+                         find_movie_row, find_movie_row_by_id, letter_counts, letter_rows,
+                         MODEL_PATH, LETTER_BUCKETS)
+from movie_metadata import RUNTIME_BUCKETS
+from http_client import http_client
+from search_index import TitleSearchIndex
+from movie_links import (TRAILER_URLS, COMPREHENSIVE_TRAILER_URLS, COMMON_TRAILER_IDS, STREAMING_SERVICES,
+                         DISNEY_TITLES, NETFLIX_TITLES)
 
 # Import enhanced movie service (replaces TMDB dependency)
 try:
     from enhanced_movie_service import movie_service
-    from config import CACHE_SIZE, REQUEST_TIMEOUT
+    from config import CACHE_SIZE, REQUEST_TIMEOUT, RECOMMENDATION_COUNT, MOVIE_LIST_PAGE_SIZE, SEARCH_RESULT_COUNT
 except ImportError:
     # Fallback to default values if config.py doesn't exist
     CACHE_SIZE = 100
     REQUEST_TIMEOUT = 10
+    RECOMMENDATION_COUNT = 5
+    MOVIE_LIST_PAGE_SIZE = 24
+    SEARCH_RESULT_COUNT = 20
     # Create a fallback movie service
     class FallbackMovieService:
         def get_movie_details(self, movie_title, movie_id=None):
@@ -25,6 +34,12 @@ except ImportError:
                 'original_language': "en"
             }
         
+        def get_many_details(self, movie_titles, timeout=None):
+            return [self.get_movie_details(movie_title) for movie_title in movie_titles]
+        
+        def get_genre_poster(self, genre_string):
+            return "https://via.placeholder.com/500x750/4ECDC4/FFFFFF?text=🎬+Movie+Poster"
+        
         def get_popular_movies_list(self):
             return [
                 "The Godfather",
@@ -952,6 +967,13 @@ st.markdown("""
 def fetch_movie_details(movie_id):
     """Fetch movie details using enhanced movie service (no TMDB dependency)"""
     try:
+        # Catalog movies are described by the model's metadata snapshot, no network needed
+        row = find_movie_row_by_id(model, movie_id)
+        if row is not None:
+            snapshot_details = get_snapshot_details(row)
+            if snapshot_details:
+                return snapshot_details
+        
         # Get movie title from the movie list
         movie_title = get_movie_title_by_id(movie_id)
         if not movie_title:
@@ -972,9 +994,9 @@ def get_movie_title_by_id(movie_id):
     """Get movie title by ID from the loaded movie list"""
     try:
         # Find the movie in the loaded movie list by ID
-        movie_row = movies[movies['movie_id'] == movie_id]
-        if not movie_row.empty:
-            return movie_row.iloc[0]['title']
+        row = find_movie_row_by_id(model, movie_id)
+        if row is not None:
+            return movies.iloc[row]['title']
         else:
             # Fallback: try to find by index if movie_id is actually an index
             try:
@@ -999,6 +1021,30 @@ def get_default_movie_details():
         'original_language': "en"  # Default language
     }
 
+def get_snapshot_details(row):
+    """Movie details from the model's metadata snapshot, or None if it doesn't describe the movie"""
+    details = get_movie_metadata(model, row)
+    # Custom movies may only have genres and an overview, the movie service knows more
+    if not details or 'vote_average' not in details:
+        return None
+    
+    movie_details = get_default_movie_details()
+    movie_details.update(details)
+    movie_details['poster_path'] = movie_service.get_genre_poster(', '.join(details.get('genres', [])))
+    return movie_details
+
+def get_catalog_movie_details(rows):
+    """Details of catalog movies by row, from the metadata snapshot first and the movie service otherwise"""
+    all_details = [get_snapshot_details(row) for row in rows]
+    
+    # Only movies missing from the snapshot go to the network, in one batch
+    missing = [position for position, details in enumerate(all_details) if details is None]
+    if missing:
+        fetched = movie_service.get_many_details([movies.iloc[rows[position]].title for position in missing])
+        for position, details in zip(missing, fetched):
+            all_details[position] = details
+    return all_details
+
 def search_youtube_trailer(movie_title, year=None):
     """Search for YouTube trailer using movie title and optional year"""
     try:
@@ -1020,78 +1066,10 @@ def search_youtube_trailer(movie_title, year=None):
 def search_direct_trailer(movie_title, year=None):
     """Try to find direct trailer links for movies not in our mapping"""
     try:
-        # Common trailer video IDs for popular movies (expanded list)
-        common_trailers = {
-            # More classic movies
-            "titanic": "kVrqfYjkRgQ",
-            "forrest gump": "bLvqoHBptjg",
-            "the green mile": "Ki4haFrqSrw",
-            "schindler's list": "gG22XNhtnoY",
-            "saving private ryan": "zwhP5b4tD6g",
-            "gladiator": "owK1qxDselE",
-            "braveheart": "wj0I8xV_T18",
-            "the lord of the rings": "V75dMMIW2B4",
-            "the hobbit": "JTSoD4BBCJc",
-            "harry potter": "VyHV0QtdDW0",
-            
-            # More recent popular movies
-            "black panther": "xjDjIWPwcPU",
-            "wonder woman": "1Q8fG0TtVAY",
-            "aquaman": "WDkg3hpsHPQ",
-            "shazam": "uilJZZ_iVwY",
-            "captain marvel": "Z1BCujXkoPY",
-            "ant-man": "pWdKf3MneyI",
-            "doctor strange": "HSzx-zryEgM",
-            "spider-man homecoming": "U0D3AOldjMU",
-            "spider-man far from home": "Nt9L1jCKGnE",
-            "spider-man no way home": "JfVOs4VSpmA",
-            
-            # More Disney movies
-            "beauty and the beast": "e3Nl_TCQXuw",
-            "aladdin": "e3Nl_TCQXuw",
-            "mulan": "1ONzD9bDmUw",
-            "hercules": "1ONzD9bDmUw",
-            "tarzan": "1ONzD9bDmUw",
-            "lilo and stitch": "1ONzD9bDmUw",
-            "brother bear": "1ONzD9bDmUw",
-            "chicken little": "1ONzD9bDmUw",
-            "meet the robinsons": "1ONzD9bDmUw",
-            "bolt": "1ONzD9bDmUw",
-            "princess and the frog": "1ONzD9bDmUw",
-            "winnie the pooh": "1ONzD9bDmUw",
-            "planes": "1ONzD9bDmUw",
-            "big hero 6": "1ONzD9bDmUw",
-            "wreck it ralph": "1ONzD9bDmUw",
-            "brave": "1ONzD9bDmUw",
-            "tangled": "1ONzD9bDmUw",
-            "ralph breaks the internet": "1ONzD9bDmUw",
-            "toy story 4": "1ONzD9bDmUw",
-            "frozen 2": "1ONzD9bDmUw",
-            "onward": "1ONzD9bDmUw",
-            "soul": "1ONzD9bDmUw",
-            "luca": "1ONzD9bDmUw",
-            "lightyear": "1ONzD9bDmUw",
-            "elemental": "1ONzD9bDmUw",
-            "wish": "1ONzD9bDmUw",
-            
-            # More Indian movies
-            "dangal": "x_7YlGv9z1k",
-            "3 idiots": "K0eDlFX9GMc",
-            "pk": "K0eDlFX9GMc",
-            "lagaan": "K0eDlFX9GMc",
-            "dilwale dulhania le jayenge": "K0eDlFX9GMc",
-            "sholay": "K0eDlFX9GMc",
-            "mother india": "K0eDlFX9GMc",
-            "pyaasa": "K0eDlFX9GMc",
-            "do bigha zamin": "K0eDlFX9GMc",
-            "guide": "K0eDlFX9GMc"
-        }
-        
         # Try to find a match in common trailers
-        movie_lower = movie_title.lower()
-        for key, video_id in common_trailers.items():
-            if key in movie_lower or movie_lower in key:
-                return f"https://www.youtube.com/watch?v={video_id}"
+        video_id = COMMON_TRAILER_IDS.match(movie_title)
+        if video_id is not None:
+            return f"https://www.youtube.com/watch?v={video_id}"
         
         # If no match found, return a smart search URL
         search_query = f"{movie_title} official trailer"
@@ -1111,209 +1089,10 @@ def search_direct_trailer(movie_title, year=None):
 
 def get_trailer_embed_url(movie_title, year=None):
     """Get trailer embed URL for common movies with direct trailer links"""
-    # Enhanced trailer mapping with VERIFIED WORKING YouTube trailer URLs
-    trailer_mapping = {
-        # Classic Movies - VERIFIED WORKING TRAILERS (TESTED)
-        "The Dark Knight": "https://www.youtube.com/watch?v=EXeTwQWrcwY",
-        "Inception": "https://www.youtube.com/watch?v=YoHD9XEInc0",
-        "The Matrix": "https://www.youtube.com/watch?v=m8e-FF8MsqU",
-        "Pulp Fiction": "https://www.youtube.com/watch?v=s7EdQ4FqbhY",
-        "The Godfather": "https://www.youtube.com/watch?v=sY1S34973zA",
-        "Fight Club": "https://www.youtube.com/watch?v=SUXWAEX2jlg",
-        "Goodfellas": "https://www.youtube.com/watch?v=qo5jJ5Xf8Qk",
-        "The Silence of the Lambs": "https://www.youtube.com/watch?v=W6Mm8Sbe__o",
-        "Interstellar": "https://www.youtube.com/watch?v=2LqzF5WauAw",
-        "The Shawshank Redemption": "https://www.youtube.com/watch?v=6hB3S9bIaco",
-        "Forrest Gump": "https://www.youtube.com/watch?v=bLvqoHBptjg",
-        "Titanic": "https://www.youtube.com/watch?v=kVrqfYjkRgQ",
-        "The Green Mile": "https://www.youtube.com/watch?v=Ki4haFrqSrw",
-        "Schindler's List": "https://www.youtube.com/watch?v=gG22XNhtnoY",
-        "Saving Private Ryan": "https://www.youtube.com/watch?v=zwhP5b4tD6g",
-        "Gladiator": "https://www.youtube.com/watch?v=owK1qxDselE",
-        "Braveheart": "https://www.youtube.com/watch?v=wj0I8xV_T18",
-        "The Lord of the Rings": "https://www.youtube.com/watch?v=V75dMMIW2B4",
-        "The Hobbit": "https://www.youtube.com/watch?v=JTSoD4BBCJc",
-        "Harry Potter": "https://www.youtube.com/watch?v=VyHV0QtdDW0",
-        
-        # Disney/Pixar Movies - VERIFIED WORKING TRAILERS
-        "Frozen": "https://www.youtube.com/watch?v=TbQm5doF_Uc",
-        "The Lion King": "https://www.youtube.com/watch?v=7TavVZMewpY",
-        "Toy Story": "https://www.youtube.com/watch?v=KYz2wyBy3kc",
-        "Finding Nemo": "https://www.youtube.com/watch?v=wZdpNglLbt8",
-        "Moana": "https://www.youtube.com/watch?v=LKFuXETZUsI",
-        "Coco": "https://www.youtube.com/watch?v=Ga6RYejo6Hk",
-        "Zootopia": "https://www.youtube.com/watch?v=jWM0ct-OLsM",
-        "Encanto": "https://www.youtube.com/watch?v=CaimKeDcudo",
-        "Up": "https://www.youtube.com/watch?v=pkqzFUhGPJg",
-        "Inside Out": "https://www.youtube.com/watch?v=seMwpP0yeu4",
-        "Monsters Inc": "https://www.youtube.com/watch?v=cvOQeozL4S0",
-        "Big Hero 6": "https://www.youtube.com/watch?v=z3biFxZIJOQ",
-        "Wreck It Ralph": "https://www.youtube.com/watch?v=8iTk2Xgv5U4",
-        "Brave": "https://www.youtube.com/watch?v=TEHWDA_6e3M",
-        "Tangled": "https://www.youtube.com/watch?v=ip_0CFTTOwo",
-        "Aladdin": "https://www.youtube.com/watch?v=e3Nl_TCQXuw",
-        "Beauty and the Beast": "https://www.youtube.com/watch?v=e3Nl_TCQXuw",
-        "Mulan": "https://www.youtube.com/watch?v=1ONzD9bDmUw",
-        "Hercules": "https://www.youtube.com/watch?v=1ONzD9bDmUw",
-        "Tarzan": "https://www.youtube.com/watch?v=1ONzD9bDmUw",
-        "Lilo and Stitch": "https://www.youtube.com/watch?v=1ONzD9bDmUw",
-        
-        # Marvel Movies
-        "Avengers: Endgame": "https://www.youtube.com/watch?v=TcMBFSGVi1c",
-        "Iron Man": "https://www.youtube.com/watch?v=8hYlB38asDY",
-        "Captain America": "https://www.youtube.com/watch?v=JerVrbLldXw",
-        "Thor": "https://www.youtube.com/watch?v=JOddp-nlNvQ",
-        "Black Panther": "https://www.youtube.com/watch?v=xjDjIWPwcPU",
-        "Spider-Man": "https://www.youtube.com/watch?v=TYMMOjBUPMM",
-        "Guardians of the Galaxy": "https://www.youtube.com/watch?v=d96cjJhvlMA",
-        "Doctor Strange": "https://www.youtube.com/watch?v=HSzx-zryEgM",
-        "Ant-Man": "https://www.youtube.com/watch?v=pWdKf3MneyI",
-        "Captain Marvel": "https://www.youtube.com/watch?v=Z1BCujXkoPY",
-        "Black Widow": "https://www.youtube.com/watch?v=Fp9bNP8n76M",
-        "Eternals": "https://www.youtube.com/watch?v=x_me3JsvIbo",
-        "Shang-Chi": "https://www.youtube.com/watch?v=8YjFbMbfXaQ",
-        "Spider-Man: No Way Home": "https://www.youtube.com/watch?v=JfVOs4VSpmA",
-        "Doctor Strange in the Multiverse of Madness": "https://www.youtube.com/watch?v=aWzlQ2N6qqg",
-        "Thor: Love and Thunder": "https://www.youtube.com/watch?v=Go8nTmfrQd8",
-        "Black Panther: Wakanda Forever": "https://www.youtube.com/watch?v=_Z3QKkl1WyM",
-        "Ant-Man and the Wasp: Quantumania": "https://www.youtube.com/watch?v=ZlNFpri-Y40",
-        "Guardians of the Galaxy Vol. 3": "https://www.youtube.com/watch?v=u3V5KDHRQvk",
-        "The Marvels": "https://www.youtube.com/watch?v=mSyknItcqfg",
-        "Deadpool": "https://www.youtube.com/watch?v=ONHBaC-pfsk",
-        "Deadpool 2": "https://www.youtube.com/watch?v=D86RtevtfrA",
-        "X-Men": "https://www.youtube.com/watch?v=VNxwlx6etXI",
-        "Fantastic Four": "https://www.youtube.com/watch?v=AAyWhIq3Uqk",
-        
-        # Star Wars
-        "Star Wars": "https://www.youtube.com/watch?v=1g3_CFmnU7k",
-        "The Empire Strikes Back": "https://www.youtube.com/watch?v=JNwNXF9Y6kY",
-        "Return of the Jedi": "https://www.youtube.com/watch?v=5UfA_aKBGMc",
-        "The Force Awakens": "https://www.youtube.com/watch?v=sGbxmsDFVnE",
-        "The Last Jedi": "https://www.youtube.com/watch?v=Q0CbN8sfihY",
-        "The Rise of Skywalker": "https://www.youtube.com/watch?v=8Qn_spdM5Zg",
-        "Rogue One": "https://www.youtube.com/watch?v=frdj1zb9rMY",
-        "Solo": "https://www.youtube.com/watch?v=Q0CbN8sfihY",
-        
-        # Popular Recent Movies
-        "Joker": "https://www.youtube.com/watch?v=zAGVQLHdxOY",
-        "Parasite": "https://www.youtube.com/watch?v=5xH0HfJHsaY",
-        "La La Land": "https://www.youtube.com/watch?v=0pdqf4P9M8Y",
-        "The Shape of Water": "https://www.youtube.com/watch?v=uUV_LEwqIuo",
-        "Moonlight": "https://www.youtube.com/watch?v=9NJj12tJzqc",
-        "Spotlight": "https://www.youtube.com/watch?v=EwdCIpbTN5g",
-        "Birdman": "https://www.youtube.com/watch?v=uJfLoE6hanc",
-        "The Grand Budapest Hotel": "https://www.youtube.com/watch?v=1Fg5iWmQjv0",
-        "The Big Short": "https://www.youtube.com/watch?v=vgqG3ITMv1Q",
-        
-        # Action Movies
-        "Mad Max: Fury Road": "https://www.youtube.com/watch?v=hA2h0MKKoqU",
-        "John Wick": "https://www.youtube.com/watch?v=2AUmvWm5ZDQ",
-        "Mission: Impossible": "https://www.youtube.com/watch?v=Ohws8y572KE",
-        "Fast & Furious": "https://www.youtube.com/watch?v=2TAOizOnNPo",
-        "Transformers": "https://www.youtube.com/watch?v=dxQxgBppWu0",
-        "John Wick: Chapter 2": "https://www.youtube.com/watch?v=ChpLV9AMqm4",
-        "John Wick: Chapter 3": "https://www.youtube.com/watch?v=pU8-7BX9uxs",
-        "John Wick: Chapter 4": "https://www.youtube.com/watch?v=qEVUtrk8_B4",
-        "Mission: Impossible - Fallout": "https://www.youtube.com/watch?v=wb49-oV0F78",
-        "Mission: Impossible - Dead Reckoning": "https://www.youtube.com/watch?v=avz06pxqJHY",
-        
-        # Horror Movies
-        "Get Out": "https://www.youtube.com/watch?v=DzfpyUB60YY",
-        "A Quiet Place": "https://www.youtube.com/watch?v=WR7cc5t7tv8",
-        "Hereditary": "https://www.youtube.com/watch?v=V6wWKNij_1M",
-        "The Conjuring": "https://www.youtube.com/watch?v=k10ETZ41q5o",
-        "The Conjuring 2": "https://www.youtube.com/watch?v=VFsmuRPClr4",
-        "The Conjuring: The Devil Made Me Do It": "https://www.youtube.com/watch?v=h9Q4zZS2v1k",
-        "Insidious": "https://www.youtube.com/watch?v=zuZnRUcoWos",
-        "The Nun": "https://www.youtube.com/watch?v=pzD9zGcUNrw",
-        "Annabelle": "https://www.youtube.com/watch?v=paFgQNPGlsg",
-        
-        # Indian Movies
-        "RRR": "https://www.youtube.com/watch?v=vf3b0IWVzWA",
-        "Baahubali": "https://www.youtube.com/watch?v=3NQRhE772b0",
-        "KGF": "https://www.youtube.com/watch?v=Qah9sSIXJqk",
-        "Dangal": "https://www.youtube.com/watch?v=x_7YlGv9z1k",
-        "3 Idiots": "https://www.youtube.com/watch?v=K0eDlFX9GMc",
-        "PK": "https://www.youtube.com/watch?v=K0eDlFX9GMc",
-        "Lagaan": "https://www.youtube.com/watch?v=K0eDlFX9GMc",
-        "Dilwale Dulhania Le Jayenge": "https://www.youtube.com/watch?v=K0eDlFX9GMc",
-        "Sholay": "https://www.youtube.com/watch?v=K0eDlFX9GMc",
-        "Mother India": "https://www.youtube.com/watch?v=K0eDlFX9GMc",
-        "Pyaasa": "https://www.youtube.com/watch?v=K0eDlFX9GMc",
-        "Do Bigha Zamin": "https://www.youtube.com/watch?v=K0eDlFX9GMc",
-        "Guide": "https://www.youtube.com/watch?v=K0eDlFX9GMc",
-        
-        # More Recent Popular Movies
-        "Oppenheimer": "https://www.youtube.com/watch?v=uYPbbksJxIg",
-        "Barbie": "https://www.youtube.com/watch?v=pBk4NYhWNMM",
-        "Top Gun: Maverick": "https://www.youtube.com/watch?v=giXco2jaZ_4",
-        "Avatar: The Way of Water": "https://www.youtube.com/watch?v=d9MyW72ELq0",
-        "The Batman": "https://www.youtube.com/watch?v=mqqft2x_Aa4",
-        "Black Adam": "https://www.youtube.com/watch?v=X0tOpbnbYJA",
-        "Shazam! Fury of the Gods": "https://www.youtube.com/watch?v=AIc671o9yCI",
-        "The Flash": "https://www.youtube.com/watch?v=r51cYVZWKdY",
-        "Blue Beetle": "https://www.youtube.com/watch?v=vS3_72Gb-bI",
-        "Aquaman and the Lost Kingdom": "https://www.youtube.com/watch?v=yN6Ot1bgtRE",
-        "The Super Mario Bros. Movie": "https://www.youtube.com/watch?v=TnGl01FkMME",
-        "Elemental": "https://www.youtube.com/watch?v=9Ef5jVw1e_c",
-        "Wish": "https://www.youtube.com/watch?v=oyRxxpD3yNw",
-        "Lightyear": "https://www.youtube.com/watch?v=BwPL0Md_QFQ",
-        "Soul": "https://www.youtube.com/watch?v=xOsLIiBStEs",
-        "Luca": "https://www.youtube.com/watch?v=mYfJwlgA2jE",
-        "Onward": "https://www.youtube.com/watch?v=gn5QmllRCn4",
-        "Frozen 2": "https://www.youtube.com/watch?v=Zi4LMpSDddd",
-        "Toy Story 4": "https://www.youtube.com/watch?v=wmiGOomWD2w",
-        "Ralph Breaks the Internet": "https://www.youtube.com/watch?v=JcvLuO0ZbIM",
-        "Incredibles 2": "https://www.youtube.com/watch?v=i5qOzqD9Rms",
-        "Coco": "https://www.youtube.com/watch?v=Ga6RYejo6Hk",
-        "Moana": "https://www.youtube.com/watch?v=LKFuXETZUsI",
-        "Zootopia": "https://www.youtube.com/watch?v=jWM0ct-OLsM",
-        "Big Hero 6": "https://www.youtube.com/watch?v=z3biFxZIJOQ",
-        "Wreck It Ralph": "https://www.youtube.com/watch?v=8iTk2Xgv5U4",
-        "Brave": "https://www.youtube.com/watch?v=TEHWDA_6e3M",
-        "Tangled": "https://www.youtube.com/watch?v=ip_0CFTTOwo",
-        "Aladdin": "https://www.youtube.com/watch?v=e3Nl_TCQXuw",
-        "Beauty and the Beast": "https://www.youtube.com/watch?v=e3Nl_TCQXuw",
-        "Mulan": "https://www.youtube.com/watch?v=1ONzD9bDmUw",
-        "Hercules": "https://www.youtube.com/watch?v=1ONzD9bDmUw",
-        "Tarzan": "https://www.youtube.com/watch?v=1ONzD9bDmUw",
-        "Lilo and Stitch": "https://www.youtube.com/watch?v=1ONzD9bDmUw",
-        "Brother Bear": "https://www.youtube.com/watch?v=1ONzD9bDmUw",
-        "Chicken Little": "https://www.youtube.com/watch?v=1ONzD9bDmUw",
-        "Meet the Robinsons": "https://www.youtube.com/watch?v=1ONzD9bDmUw",
-        "Bolt": "https://www.youtube.com/watch?v=1ONzD9bDmUw",
-        "Princess and the Frog": "https://www.youtube.com/watch?v=1ONzD9bDmUw",
-        "Winnie the Pooh": "https://www.youtube.com/watch?v=1ONzD9bDmUw",
-        "Planes": "https://www.youtube.com/watch?v=1ONzD9bDmUw",
-        "Big Hero 6": "https://www.youtube.com/watch?v=z3biFxZIJOQ",
-        "Wreck It Ralph": "https://www.youtube.com/watch?v=8iTk2Xgv5U4",
-        "Brave": "https://www.youtube.com/watch?v=TEHWDA_6e3M",
-        "Tangled": "https://www.youtube.com/watch?v=ip_0CFTTOwo",
-        "Ralph Breaks the Internet": "https://www.youtube.com/watch?v=JcvLuO0ZbIM",
-        "Toy Story 4": "https://www.youtube.com/watch?v=wmiGOomWD2w",
-        "Frozen 2": "https://www.youtube.com/watch?v=Zi4LMpSDddd",
-        "Onward": "https://www.youtube.com/watch?v=gn5QmllRCn4",
-        "Soul": "https://www.youtube.com/watch?v=xOsLIiBStEs",
-        "Luca": "https://www.youtube.com/watch?v=mYfJwlgA2jE",
-        "Lightyear": "https://www.youtube.com/watch?v=BwPL0Md_QFQ",
-        "Elemental": "https://www.youtube.com/watch?v=9Ef5jVw1e_c",
-        "Wish": "https://www.youtube.com/watch?v=oyRxxpD3yNw"
-    }
-    
-    # Try exact match first
-    if movie_title in trailer_mapping:
-        return trailer_mapping[movie_title]
-    
-    # Try partial matches for variations (more flexible matching)
-    movie_lower = movie_title.lower().strip()
-    for key, url in trailer_mapping.items():
-        key_lower = key.lower().strip()
-        # Check if movie title contains key words or vice versa
-        if (movie_lower in key_lower or 
-            key_lower in movie_lower or 
-            any(word in movie_lower for word in key_lower.split()) or
-            any(word in key_lower for word in movie_lower.split())):
-            return url
+    # Exact or normalized title first, then the closest one (sequels, typos)
+    trailer_url = TRAILER_URLS.match(movie_title)
+    if trailer_url is not None:
+        return trailer_url
     
     # If no match found, try to find a direct trailer using improved search
     return search_direct_trailer(movie_title, year)
@@ -1323,7 +1102,7 @@ def validate_youtube_video(video_id):
     try:
         # Test URL to check if video is accessible
         test_url = f"https://www.youtube.com/oembed?url=https://www.youtube.com/watch?v={video_id}&format=json"
-        response = requests.get(test_url, timeout=5)
+        response = http_client.get(test_url, timeout=5)
         
         if response.status_code == 200:
             return True
@@ -1348,102 +1127,10 @@ def get_working_trailer_url(movie_title, year=None):
 
 def get_simple_trailer_url(movie_title, year=None):
     """Get trailer URL for ANY movie - works for ALL movies!"""
-    # Comprehensive trailer mapping for popular movies (direct links)
-    comprehensive_trailers = {
-        # Classic Movies - Direct Trailer Links
-        "The Dark Knight": "https://www.youtube.com/watch?v=EXeTwQWrcwY",
-        "Inception": "https://www.youtube.com/watch?v=YoHD9XEInc0",
-        "The Matrix": "https://www.youtube.com/watch?v=m8e-FF8MsqU",
-        "Pulp Fiction": "https://www.youtube.com/watch?v=s7EdQ4FqbhY",
-        "The Godfather": "https://www.youtube.com/watch?v=sY1S34973zA",
-        "Fight Club": "https://www.youtube.com/watch?v=SUXWAEX2jlg",
-        "Interstellar": "https://www.youtube.com/watch?v=2LqzF5WauAw",
-        "The Shawshank Redemption": "https://www.youtube.com/watch?v=6hB3S9bIaco",
-        "Forrest Gump": "https://www.youtube.com/watch?v=bLvqoHBptjg",
-        "Titanic": "https://www.youtube.com/watch?v=kVrqfYjkRgQ",
-        "Avatar": "https://www.youtube.com/watch?v=d1_JBMrrYw8",
-        "The Lord of the Rings": "https://www.youtube.com/watch?v=V75dMMIW2B4",
-        "Goodfellas": "https://www.youtube.com/watch?v=qo5jJ5XfQTA",
-        "The Silence of the Lambs": "https://www.youtube.com/watch?v=W6Mm8Sbe__o",
-        "The Green Mile": "https://www.youtube.com/watch?v=Ki4haFrqSrw",
-        "Schindler's List": "https://www.youtube.com/watch?v=gG22XNhtnoY",
-        "Saving Private Ryan": "https://www.youtube.com/watch?v=zwhP5b4tD6g",
-        "Gladiator": "https://www.youtube.com/watch?v=owK1qxDselE",
-        "Braveheart": "https://www.youtube.com/watch?v=wj0I8xV_T18",
-        "The Hobbit": "https://www.youtube.com/watch?v=JTSoD4BBCJc",
-        "Harry Potter": "https://www.youtube.com/watch?v=VyHV0QtdDW0",
-        
-        # Modern Blockbusters
-        "Black Panther": "https://www.youtube.com/watch?v=xjDjIWPwcPU",
-        "Wonder Woman": "https://www.youtube.com/watch?v=1Q8fG0TtVAY",
-        "Aquaman": "https://www.youtube.com/watch?v=WDkg3hpsHPQ",
-        "Shazam": "https://www.youtube.com/watch?v=uilJZZ_iVwY",
-        "Captain Marvel": "https://www.youtube.com/watch?v=Z1BCujXkoPY",
-        "Ant-Man": "https://www.youtube.com/watch?v=pWdKf3MneyI",
-        "Doctor Strange": "https://www.youtube.com/watch?v=HSzx-zryEgM",
-        "Spider-Man": "https://www.youtube.com/watch?v=U0D3AOldjMU",
-        "Avengers": "https://www.youtube.com/watch?v=eOrNdBpGMv8",
-        "Iron Man": "https://www.youtube.com/watch?v=8ugaeA-nMTc",
-        "Thor": "https://www.youtube.com/watch?v=JOddp-nlOMv",
-        "Captain America": "https://www.youtube.com/watch?v=JerVrbLldXw",
-        
-        # Disney/Pixar Movies
-        "Frozen": "https://www.youtube.com/watch?v=TbQm5doF_Uc",
-        "The Lion King": "https://www.youtube.com/watch?v=7TavVZMffpM",
-        "Beauty and the Beast": "https://www.youtube.com/watch?v=e3Nl_TCQXuw",
-        "Aladdin": "https://www.youtube.com/watch?v=e3Nl_TCQXuw",
-        "Mulan": "https://www.youtube.com/watch?v=1ONzD9bDmUw",
-        "Hercules": "https://www.youtube.com/watch?v=1ONzD9bDmUw",
-        "Tarzan": "https://www.youtube.com/watch?v=1ONzD9bDmUw",
-        "Lilo and Stitch": "https://www.youtube.com/watch?v=1ONzD9bDmUw",
-        "Brother Bear": "https://www.youtube.com/watch?v=1ONzD9bDmUw",
-        "Chicken Little": "https://www.youtube.com/watch?v=1ONzD9bDmUw",
-        "Meet the Robinsons": "https://www.youtube.com/watch?v=1ONzD9bDmUw",
-        "Bolt": "https://www.youtube.com/watch?v=1ONzD9bDmUw",
-        "The Princess and the Frog": "https://www.youtube.com/watch?v=1ONzD9bDmUw",
-        "Winnie the Pooh": "https://www.youtube.com/watch?v=1ONzD9bDmUw",
-        "Planes": "https://www.youtube.com/watch?v=1ONzD9bDmUw",
-        "Big Hero 6": "https://www.youtube.com/watch?v=1ONzD9bDmUw",
-        "Wreck-It Ralph": "https://www.youtube.com/watch?v=1ONzD9bDmUw",
-        "Brave": "https://www.youtube.com/watch?v=1ONzD9bDmUw",
-        "Tangled": "https://www.youtube.com/watch?v=1ONzD9bDmUw",
-        "Ralph Breaks the Internet": "https://www.youtube.com/watch?v=1ONzD9bDmUw",
-        "Toy Story": "https://www.youtube.com/watch?v=1ONzD9bDmUw",
-        "Frozen 2": "https://www.youtube.com/watch?v=1ONzD9bDmUw",
-        "Onward": "https://www.youtube.com/watch?v=1ONzD9bDmUw",
-        "Soul": "https://www.youtube.com/watch?v=1ONzD9bDmUw",
-        "Luca": "https://www.youtube.com/watch?v=1ONzD9bDmUw",
-        "Lightyear": "https://www.youtube.com/watch?v=1ONzD9bDmUw",
-        "Elemental": "https://www.youtube.com/watch?v=1ONzD9bDmUw",
-        "Wish": "https://www.youtube.com/watch?v=1ONzD9bDmUw",
-        
-        # Indian Movies
-        "Dangal": "https://www.youtube.com/watch?v=x_7YlGv9z1k",
-        "3 Idiots": "https://www.youtube.com/watch?v=K0eDlFX9GMc",
-        "PK": "https://www.youtube.com/watch?v=K0eDlFX9GMc",
-        "Lagaan": "https://www.youtube.com/watch?v=K0eDlFX9GMc",
-        "Dilwale Dulhania Le Jayenge": "https://www.youtube.com/watch?v=K0eDlFX9GMc",
-        "Sholay": "https://www.youtube.com/watch?v=K0eDlFX9GMc",
-        "Mother India": "https://www.youtube.com/watch?v=K0eDlFX9GMc",
-        "Pyaasa": "https://www.youtube.com/watch?v=K0eDlFX9GMc",
-        "Do Bigha Zamin": "https://www.youtube.com/watch?v=K0eDlFX9GMc",
-        "Guide": "https://www.youtube.com/watch?v=K0eDlFX9GMc"
-    }
-    
-    # Try exact match first
-    if movie_title in comprehensive_trailers:
-        return comprehensive_trailers[movie_title]
-    
-    # Try partial match for better coverage
-    movie_lower = movie_title.lower().strip()
-    for key, url in comprehensive_trailers.items():
-        key_lower = key.lower().strip()
-        # Check if movie title contains key words or vice versa
-        if (movie_lower in key_lower or 
-            key_lower in movie_lower or 
-            any(word in movie_lower for word in key_lower.split()) or
-            any(word in key_lower for word in movie_lower.split())):
-            return url
+    # Exact or normalized title first, then the closest one (sequels, typos)
+    trailer_url = COMPREHENSIVE_TRAILER_URLS.match(movie_title)
+    if trailer_url is not None:
+        return trailer_url
     
     # If no direct trailer found, create a smart search URL that will find trailers
     search_query = f"{movie_title} official trailer"
@@ -1462,231 +1149,16 @@ def get_simple_trailer_url(movie_title, year=None):
 
 def get_streaming_services(movie_title, year=None):
     """Get streaming service information for a movie with improved accuracy"""
+    # Exact or normalized title first, then the closest one
+    services = STREAMING_SERVICES.match(movie_title)
+    if services is not None:
+        return services
     
-    # Enhanced streaming mapping with more accurate availability
-    streaming_mapping = {
-        # Popular movies with known streaming availability
-        "The Dark Knight": {
-            "netflix": None,  # Not currently on Netflix
-            "prime": "https://www.amazon.com/s?k=The+Dark+Knight+movie",
-            "hbo": "https://play.hbomax.com/search?q=The%20Dark%20Knight",
-            "disney": None,
-            "hulu": None,
-            "hotstar": None,
-            "peacock": "https://www.peacocktv.com/search?q=The+Dark+Knight"
-        },
-        "Inception": {
-            "netflix": None,
-            "prime": "https://www.amazon.com/s?k=Inception+movie",
-            "hbo": None,
-            "disney": None,
-            "hulu": None,
-            "hotstar": None,
-            "peacock": None
-        },
-        "The Matrix": {
-            "netflix": None,
-            "prime": "https://www.amazon.com/s?k=The+Matrix+movie",
-            "hbo": None,
-            "disney": None,
-            "hulu": None,
-            "hotstar": None,
-            "peacock": None
-        },
-        "Pulp Fiction": {
-            "netflix": None,
-            "prime": "https://www.amazon.com/s?k=Pulp+Fiction+movie",
-            "hbo": None,
-            "disney": None,
-            "hulu": None,
-            "hotstar": None,
-            "peacock": None
-        },
-        "The Godfather": {
-            "netflix": None,
-            "prime": "https://www.amazon.com/s?k=The+Godfather+movie",
-            "hbo": "https://play.hbomax.com/search?q=The%20Godfather",
-            "disney": None,
-            "hulu": None,
-            "hotstar": None,
-            "peacock": None
-        },
-        # Disney/Pixar movies
-        "Frozen": {
-            "netflix": None,
-            "prime": None,
-            "hbo": None,
-            "disney": "https://www.disneyplus.com/movies/frozen/1lyBSoVbf1Xn",
-            "hulu": None,
-            "hotstar": "https://www.hotstar.com/in/movies/frozen/1260018316",
-            "peacock": None
-        },
-        "The Lion King": {
-            "netflix": None,
-            "prime": None,
-            "hbo": None,
-            "disney": "https://www.disneyplus.com/movies/the-lion-king-2019/1Hq96Cw4VCqM",
-            "hulu": None,
-            "hotstar": "https://www.hotstar.com/in/movies/the-lion-king/1260018316",
-            "peacock": None
-        },
-        "Avengers: Endgame": {
-            "netflix": None,
-            "prime": None,
-            "hbo": None,
-            "disney": "https://www.disneyplus.com/movies/marvel-studios-avengers-endgame/3VxpMAdQJMmc",
-            "hulu": None,
-            "hotstar": "https://www.hotstar.com/in/movies/avengers-endgame/1260018316",
-            "peacock": None
-        },
-        "Toy Story": {
-            "netflix": None,
-            "prime": None,
-            "hbo": None,
-            "disney": "https://www.disneyplus.com/movies/toy-story/1Hq96Cw4VCqM",
-            "hulu": None,
-            "hotstar": "https://www.hotstar.com/in/movies/toy-story/1260018316",
-            "peacock": None
-        },
-        "Finding Nemo": {
-            "netflix": None,
-            "prime": None,
-            "hbo": None,
-            "disney": "https://www.disneyplus.com/movies/finding-nemo/1Hq96Cw4VCqM",
-            "hulu": None,
-            "hotstar": "https://www.hotstar.com/in/movies/finding-nemo/1260018316",
-            "peacock": None
-        },
-        "Moana": {
-            "netflix": None,
-            "prime": None,
-            "hbo": None,
-            "disney": "https://www.disneyplus.com/movies/moana/1Hq96Cw4VCqM",
-            "hulu": None,
-            "hotstar": "https://www.hotstar.com/in/movies/moana/1260018316",
-            "peacock": None
-        },
-        "Coco": {
-            "netflix": None,
-            "prime": None,
-            "hbo": None,
-            "disney": "https://www.disneyplus.com/movies/coco/1Hq96Cw4VCqM",
-            "hulu": None,
-            "hotstar": "https://www.hotstar.com/in/movies/coco/1260018316",
-            "peacock": None
-        },
-        "Zootopia": {
-            "netflix": None,
-            "prime": None,
-            "hbo": None,
-            "disney": "https://www.disneyplus.com/movies/zootopia/1Hq96Cw4VCqM",
-            "hulu": None,
-            "hotstar": "https://www.hotstar.com/in/movies/zootopia/1260018316",
-            "peacock": None
-        },
-        "Encanto": {
-            "netflix": None,
-            "prime": None,
-            "hbo": None,
-            "disney": "https://www.disneyplus.com/movies/encanto/1Hq96Cw4VCqM",
-            "hulu": None,
-            "hotstar": "https://www.hotstar.com/in/movies/encanto/1260018316",
-            "peacock": None
-        },
-        # Popular Indian movies on Hotstar
-        "RRR": {
-            "netflix": None,
-            "prime": None,
-            "hbo": None,
-            "disney": None,
-            "hulu": None,
-            "hotstar": "https://www.hotstar.com/in/movies/rrr/1260103776",
-            "peacock": None
-        },
-        "Baahubali": {
-            "netflix": None,
-            "prime": None,
-            "hbo": None,
-            "disney": None,
-            "hulu": None,
-            "hotstar": "https://www.hotstar.com/in/movies/baahubali/1260018316",
-            "peacock": None
-        },
-        "KGF": {
-            "netflix": None,
-            "prime": None,
-            "hbo": None,
-            "disney": None,
-            "hulu": None,
-            "hotstar": "https://www.hotstar.com/in/movies/kgf/1260018316",
-            "peacock": None
-        },
-        # Netflix Originals
-        "Stranger Things": {
-            "netflix": "https://www.netflix.com/title/80057281",
-            "prime": None,
-            "hbo": None,
-            "disney": None,
-            "hulu": None,
-            "hotstar": None,
-            "peacock": None
-        },
-        "The Crown": {
-            "netflix": "https://www.netflix.com/title/80025678",
-            "prime": None,
-            "hbo": None,
-            "disney": None,
-            "hulu": None,
-            "hotstar": None,
-            "peacock": None
-        },
-        "Bridgerton": {
-            "netflix": "https://www.netflix.com/title/80232398",
-            "prime": None,
-            "hbo": None,
-            "disney": None,
-            "hulu": None,
-            "hotstar": None,
-            "peacock": None
-        },
-        "Wednesday": {
-            "netflix": "https://www.netflix.com/title/81231974",
-            "prime": None,
-            "hbo": None,
-            "disney": None,
-            "hulu": None,
-            "hotstar": None,
-            "peacock": None
-        },
-        "Money Heist": {
-            "netflix": "https://www.netflix.com/title/80192098",
-            "prime": None,
-            "hbo": None,
-            "disney": None,
-            "hulu": None,
-            "hotstar": None,
-            "peacock": None
-        }
-    }
-    
-    # Try exact match first
-    if movie_title in streaming_mapping:
-        return streaming_mapping[movie_title]
-    
-    # Try partial matches for variations
-    for key, services in streaming_mapping.items():
-        if movie_title.lower() in key.lower() or key.lower() in movie_title.lower():
-            return services
-    
-    # Check if it's a Disney/Pixar movie (likely to be on Disney+ and Hotstar)
-    disney_keywords = ["frozen", "lion king", "toy story", "finding nemo", "monsters inc", "up", "inside out", "coco", "moana", "zootopia", "big hero 6", "wreck it ralph", "brave", "tangled", "aladdin", "beauty and the beast", "mulan", "pocahontas", "hercules", "tarzan", "lilo and stitch", "brother bear", "chicken little", "meet the robinsons", "bolt", "princess and the frog", "winnie the pooh", "planes", "ralph breaks the internet", "frozen 2", "onward", "soul", "luca", "encanto", "lightyear", "elemental", "wish", "avengers", "iron man", "captain america", "thor", "black panther", "spider-man", "guardians of the galaxy", "doctor strange", "ant-man", "captain marvel", "black widow", "eternals", "shang-chi", "spider-man no way home", "doctor strange multiverse", "thor love and thunder", "black panther wakanda forever", "ant-man quantumania", "guardians of the galaxy vol 3", "the marvels", "deadpool", "x-men", "fantastic four", "star wars", "mandalorian", "boba fett", "obi-wan", "andalor", "ahsoka", "skeleton crew", "acolyte", "rogue squadron", "lando", "rangers of the new republic", "high republic", "old republic", "clone wars", "rebels", "bad batch", "resistance", "forces of destiny", "visions", "tales of the jedi", "young jedi adventures", "galaxy of adventures", "forces of destiny", "resistance", "bad batch", "clone wars", "rebels", "mandalorian", "boba fett", "obi-wan", "andalor", "ahsoka", "skeleton crew", "acolyte", "rogue squadron", "lando", "rangers of the new republic", "high republic", "old republic", "clone wars", "rebels", "bad batch", "resistance", "forces of destiny", "visions", "tales of the jedi", "young jedi adventures", "galaxy of adventures"]
-    
-    is_disney_movie = any(keyword in movie_title.lower() for keyword in disney_keywords)
+    # Check if it's a Disney/Pixar movie (a known title appears as whole words in the title)
+    is_disney_movie = DISNEY_TITLES.find_in(movie_title) is not None
     
     # Check if it's a Netflix original
-    netflix_keywords = ["stranger things", "bridgerton", "wednesday", "money heist", "the crown", "house of cards", "orange is the new black", "narcos", "ozark", "dark", "squid game", "the witcher", "you", "13 reasons why", "riverdale", "chilling adventures of sabrina", "the haunting of hill house", "midnight mass", "the umbrella academy", "sex education", "never have i ever", "outer banks", "elite", "la casa de papel", "dark", "babylon berlin", "the last kingdom", "peaky blinders", "the end of the f***ing world", "i am not okay with this", "the society", "daybreak", "the order", "chambers", "the rain", "the 100", "shadow and bone", "the irregulars", "cursed", "warrior nun", "fate: the winx saga", "cowboy bebop", "arcane", "castlevania", "blood of zeus", "love death + robots", "bojack horseman", "big mouth", "disenchantment", "f is for family", "tuca & bertie", "final space", "close enough", "inside job", "human resources", "big mouth", "disenchantment", "f is for family", "tuca & bertie", "final space", "close enough", "inside job", "human resources"]
-    
-    is_netflix_original = any(keyword in movie_title.lower() for keyword in netflix_keywords)
+    is_netflix_original = NETFLIX_TITLES.find_in(movie_title) is not None
     
     # Return improved streaming services based on movie type
     if is_disney_movie:
@@ -2002,26 +1474,26 @@ def fetch_poster(movie_id):
     movie_details = fetch_movie_details(movie_id)
     return movie_details['poster_path']
 
-def recommend(movie):
+def recommend(movie, top_n=RECOMMENDATION_COUNT, mask=None):
     try:
         # Find the movie index
-        movie_indices = movies[movies['title'] == movie].index
-        if len(movie_indices) == 0:
+        index = find_movie_row(model, movie)
+        if index is None:
             st.error(f"Movie '{movie}' not found in the database")
             return []
         
-        index = movie_indices[0]
-        distances = sorted(list(enumerate(similarity[index])), reverse=True, key=lambda x: x[1])
+        # Neighbors are precomputed and already sorted by similarity; mask keeps the filtered movies only
+        recommended_ids, recommended_scores = get_filtered_neighbors(model, index, top_n, mask)
+        recommended_titles = [movies.iloc[neighbor].title for neighbor in recommended_ids]
         recommended_movies = []
         
-        for i in distances[1:6]:
+        # Snapshot details first; the rest are fetched at once, waiting for the slowest lookup only
+        all_details = get_catalog_movie_details(list(recommended_ids))
+        
+        for movie_title, movie_details, score in zip(recommended_titles, all_details, recommended_scores):
             try:
-                # Get the movie title directly from the movie list
-                movie_title = movies.iloc[i[0]].title
-                # Use the movie title directly with the enhanced service
-                movie_details = movie_service.get_movie_details(movie_title)
                 movie_details['title'] = movie_title
-                movie_details['similarity_score'] = round(distances[i[0]][1], 3)
+                movie_details['similarity_score'] = round(float(score), 3)
                 recommended_movies.append(movie_details)
             except Exception as e:
                 # Silently continue without showing warnings
@@ -2032,6 +1504,81 @@ def recommend(movie):
         st.error(f"Error generating recommendations: {str(e)}")
         return []
 
+def render_page_navigation(item_count, key, page_size=MOVIE_LIST_PAGE_SIZE):
+    """Previous/next buttons and page number of a paged list, kept in session state; returns the page's (start, stop)"""
+    page_key = f"{key}_page"
+    page_count = max(1, -(-item_count // page_size))
+    # The list may have shrunk (filters, search) since the page was chosen
+    st.session_state[page_key] = min(max(st.session_state.get(page_key, 1), 1), page_count)
+    
+    def turn_page(step):
+        st.session_state[page_key] = min(max(st.session_state[page_key] + step, 1), page_count)
+    
+    nav_cols = st.columns([1, 2, 1])
+    with nav_cols[0]:
+        st.button("⬅️ Previous", key=f"{key}_previous", on_click=turn_page, args=(-1,),
+                  disabled=st.session_state[page_key] <= 1, use_container_width=True)
+    with nav_cols[1]:
+        st.number_input(f"Page (of {page_count})", min_value=1, max_value=page_count, step=1, key=page_key)
+    with nav_cols[2]:
+        st.button("Next ➡️", key=f"{key}_next", on_click=turn_page, args=(1,),
+                  disabled=st.session_state[page_key] >= page_count, use_container_width=True)
+    
+    start = (st.session_state[page_key] - 1) * page_size
+    stop = min(start + page_size, item_count)
+    if stop > start:
+        st.caption(f"Showing movies {start + 1}-{stop} of {item_count}")
+    return start, stop
+
+def render_movie_list_page(movie_titles, key, page_size=MOVIE_LIST_PAGE_SIZE):
+    """Render one page of a movie list with page navigation"""
+    # Only the visible page is rendered, so a rerun costs the same for any catalog size
+    start, stop = render_page_navigation(len(movie_titles), key, page_size)
+    page_titles = movie_titles[start:stop]
+    
+    cols = st.columns(4)
+    for i, movie in enumerate(page_titles, start=start):
+        col_idx = i % 4
+        with cols[col_idx]:
+            if st.button(f"🎬 {movie}", key=f"{key}_{i}", use_container_width=True):
+                st.session_state.selected_movie = movie
+                st.rerun()
+            
+            # Collection status for each movie (read-only)
+            st.markdown("**📚 Collection Status:**")
+            
+            # Watchlist status
+            if movie in st.session_state.watchlist:
+                st.success("📋 In Watchlist")
+            else:
+                st.info("📋 Not in Watchlist")
+            
+            # Favorites status
+            if movie in st.session_state.favorites:
+                st.success("⭐ In Favorites")
+            else:
+                st.info("⭐ Not in Favorites")
+            
+            # Watch History status
+            if movie in st.session_state.watch_history:
+                st.success("📺 In History")
+            else:
+                st.info("📺 Not in History")
+            
+            # Add free watching options for each movie in the list
+            free_links = get_free_watching_links(movie, "")
+            # Show top 2 free platforms for the list (space constraint)
+            top_platforms = list(free_links.items())[:2]
+            for platform_key, platform_info in top_platforms:
+                st.markdown(f"""
+                    <a href="{platform_info['url']}" target="_blank" 
+                       style="display: block; background: linear-gradient(135deg, {platform_info['color']}, {platform_info['color']}dd); 
+                              color: white; padding: 0.2rem 0.5rem; border-radius: 6px; text-decoration: none; 
+                              text-align: center; margin: 0.1rem 0; font-size: 0.7rem; font-weight: bold;">
+                        🆓 {platform_info['name']}
+                    </a>
+                """, unsafe_allow_html=True)
+
 # Main header with gradient background
 st.markdown("""
 <div class="main-header">
@@ -2067,11 +1614,28 @@ if 'selected_movie' not in st.session_state:
 # Initialize selected_movie variable with a default value (will be set after filtered_movie_list is defined)
 selected_movie = None
 
+@st.cache_resource(max_entries=1, show_spinner="Loading movie model...")
+def load_cached_model(model_dir, signature):
+    """Load the model once per server; a rebuilt model changes the signature and is reloaded"""
+    return load_model(model_dir)
+
+@st.cache_resource(max_entries=1, show_spinner="Indexing movie titles...")
+def load_search_index(model_dir, signature):
+    """Build the title search index of the model once per server, keyed like the model itself"""
+    return TitleSearchIndex(load_cached_model(model_dir, signature)['movies']['title'].values)
+
+@st.cache_resource(show_spinner=False)
+def load_popular_search_index():
+    """Build the search index of the popular movies once per server (the list is fixed)"""
+    return TitleSearchIndex(movie_service.get_popular_movies_list())
+
 # Load the model
 try:
-    movies = pickle.load(open('model/movie_list.pkl','rb'))
-    similarity = pickle.load(open('model/similarity.pkl','rb'))
+    signature = model_signature(MODEL_PATH)
+    model = load_cached_model(MODEL_PATH, signature)
+    movies = model['movies']
     movie_list = movies['title'].values
+    search_index = load_search_index(MODEL_PATH, signature)
 except Exception as e:
     st.error(f"Error loading model files: {str(e)}")
     st.stop()
@@ -2173,64 +1737,68 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
-# Language and Runtime filters
-col1, col2 = st.columns(2)
+# Language, Runtime and Genre filters
+col1, col2, col3 = st.columns(3)
+
+# Languages and genres of the catalog, from the model's metadata snapshot
+catalog_metadata = model['metadata']
+language_codes = {}
+if catalog_metadata is not None:
+    for language_code in catalog_metadata.languages:
+        language_codes.setdefault(get_language_name(language_code), language_code)
 
 with col1:
     st.markdown("**🌍 Language Filter:**")
-    
-    # Simplified language filter - use common languages without API calls
-    common_languages = [
-        "All Languages",
-        "English",
-        "Spanish", 
-        "French",
-        "German",
-        "Italian",
-        "Japanese",
-        "Korean",
-        "Chinese",
-        "Hindi",
-        "Russian"
-    ]
-    
     selected_language = st.selectbox(
         "Select language:",
-        common_languages,
+        ["All Languages"] + list(language_codes),
         key="language_filter"
     )
 
 with col2:
     st.markdown("**⏱️ Runtime Filter:**")
-    runtime_options = ["All Durations", "Short (<90 min)", "Medium (90-120 min)", "Long (>120 min)"]
+    runtime_options = ["All Durations"] + RUNTIME_BUCKETS
     selected_runtime = st.selectbox(
         "Select runtime:",
         runtime_options,
         key="runtime_filter"
     )
 
-# Apply filters to movie list
-filtered_movie_list = list(movie_list.copy())
-
-# Apply language filter (simplified)
-if selected_language != "All Languages":
-    # For now, show all movies since we're not doing real-time language filtering
-    # This prevents the error messages and makes the app work smoothly
-    pass
+with col3:
+    st.markdown("**🎭 Genre Filter:**")
+    genre_options = ["All Genres"] + (sorted(catalog_metadata.genre_names) if catalog_metadata is not None else [])
+    selected_genre = st.selectbox(
+        "Select genre:",
+        genre_options,
+        key="genre_filter"
+    )
 
-# Apply runtime filter (simplified to avoid API calls)
-if selected_runtime != "All Durations":
-    # For now, skip runtime filtering to improve performance
-    # In a production app, you'd cache runtime data as well
-    pass
+# Apply filters to movie list with one vectorized mask over the precomputed columns
+filtered_movie_list = list(movie_list.copy())
+catalog_filter_mask = None
+
+if selected_language != "All Languages" or selected_runtime != "All Durations" or selected_genre != "All Genres":
+    catalog_filter_mask = filter_mask(
+        model,
+        languages=[language_codes[selected_language]] if selected_language != "All Languages" else None,
+        runtime_bucket=RUNTIME_BUCKETS.index(selected_runtime) if selected_runtime != "All Durations" else None,
+        genres=[selected_genre] if selected_genre != "All Genres" else None
+    )
+    
+    if catalog_filter_mask is not None and catalog_filter_mask.any():
+        filtered_movie_list = list(movie_list[catalog_filter_mask])
+    elif catalog_filter_mask is not None:
+        st.warning("😕 No movies match the selected filters. Showing all movies.")
+        catalog_filter_mask = None
 
 # Now initialize selected_movie with the proper value
 if selected_movie is None:
     selected_movie = st.session_state.selected_movie if st.session_state.selected_movie else (filtered_movie_list[0] if len(filtered_movie_list) > 0 else movie_list[0] if len(movie_list) > 0 else "The Shawshank Redemption")
 
-# Show filter results (simplified)
-if selected_language != "All Languages" or selected_runtime != "All Durations":
-    st.info("🔍 **Note**: Language and Runtime filters are currently simplified for better performance. All movies are shown.")
+# Show filter results
+if selected_language != "All Languages" or selected_runtime != "All Durations" or selected_genre != "All Genres":
+    if catalog_metadata is None:
+        st.info("🔍 **Note**: This model has no metadata snapshot, so filters can't be applied. All movies are shown.")
     
     # Show active filters
     active_filters = []
@@ -2238,21 +1806,30 @@ if selected_language != "All Languages" or selected_runtime != "All Durations":
         active_filters.append(f"🌍 {selected_language}")
     if selected_runtime != "All Durations":
         active_filters.append(f"⏱️ {selected_runtime}")
+    if selected_genre != "All Genres":
+        active_filters.append(f"🎭 {selected_genre}")
     
     if active_filters:
-        st.info(f"**Selected Filters**: {' | '.join(active_filters)} (Display mode)")
+        st.info(f"**Selected Filters**: {' | '.join(active_filters)} ({len(filtered_movie_list)} of {len(movie_list)} movies)")
         
-        # Clear filters button
-        if st.button("🗑️ Clear All Filters", key="clear_filters"):
-            st.rerun()
+        # Clear filters button: widget values can only be reset before the widgets are drawn
+        def clear_filters():
+            st.session_state.language_filter = "All Languages"
+            st.session_state.runtime_filter = "All Durations"
+            st.session_state.genre_filter = "All Genres"
+        
+        st.button("🗑️ Clear All Filters", key="clear_filters", on_click=clear_filters)
 
 # Filter movies based on search term
 if search_term and search_term.strip():
-    # More sophisticated search - check if search term appears in movie title
-    filtered_movies = [movie for movie in filtered_movie_list if search_term.lower() in movie.lower()]
+    # Ranked matches from the title index (exact title first), among the filtered movies only
+    filtered_movies = search_index.search_titles(search_term, allowed=catalog_filter_mask)
     
     if filtered_movies:
-        st.success(f"Found {len(filtered_movies)} movies matching '{search_term}'")
+        if len(filtered_movies) >= SEARCH_RESULT_COUNT:
+            st.success(f"Showing the {len(filtered_movies)} best matches for '{search_term}'")
+        else:
+            st.success(f"Found {len(filtered_movies)} movies matching '{search_term}'")
         
         # Display all matching movies as clickable suggestions
         st.markdown("""
@@ -2380,52 +1957,7 @@ if search_term and search_term.strip():
         <div style="max-height: 400px; overflow-y: auto; padding: 1rem; background: rgba(255,255,255,0.1); border-radius: 10px;">
         """, unsafe_allow_html=True)
         
-        # Create columns for better organization
-        cols = st.columns(4)
-        for i, movie in enumerate(filtered_movie_list):
-            col_idx = i % 4
-            with cols[col_idx]:
-                if st.button(f"🎬 {movie}", key=f"complete_list_{i}", use_container_width=True):
-                    st.session_state.selected_movie = movie
-                    st.rerun()
-                
-                # Enhanced collection buttons for complete list
-                st.markdown("**📚 Add to Collections:**")
-                
-                # Collection status for each movie (read-only)
-                st.markdown("**📚 Collection Status:**")
-                
-                # Watchlist status
-                if movie in st.session_state.watchlist:
-                    st.success("📋 In Watchlist")
-                else:
-                    st.info("📋 Not in Watchlist")
-                
-                # Favorites status
-                if movie in st.session_state.favorites:
-                    st.success("⭐ In Favorites")
-                else:
-                    st.info("⭐ Not in Favorites")
-                
-                # Watch History status
-                if movie in st.session_state.watch_history:
-                    st.success("📺 In History")
-                else:
-                    st.info("📺 Not in History")
-                
-                # Add free watching options for each movie in complete list
-                free_links = get_free_watching_links(movie, "")
-                # Show top 2 free platforms for complete list (space constraint)
-                top_platforms = list(free_links.items())[:2]
-                for platform_key, platform_info in top_platforms:
-                    st.markdown(f"""
-                        <a href="{platform_info['url']}" target="_blank" 
-                           style="display: block; background: linear-gradient(135deg, {platform_info['color']}, {platform_info['color']}dd); 
-                                  color: white; padding: 0.2rem 0.5rem; border-radius: 6px; text-decoration: none; 
-                                  text-align: center; margin: 0.1rem 0; font-size: 0.7rem; font-weight: bold;">
-                            🆓 {platform_info['name']}
-                        </a>
-                    """, unsafe_allow_html=True)
+        render_movie_list_page(filtered_movie_list, "complete_list")
         
         st.markdown("</div>", unsafe_allow_html=True)
             
@@ -2445,48 +1977,7 @@ if search_term and search_term.strip():
         <div style="max-height: 400px; overflow-y: auto; padding: 1rem; background: rgba(255,255,255,0.1); border-radius: 10px;">
         """, unsafe_allow_html=True)
         
-        cols = st.columns(4)
-        for i, movie in enumerate(filtered_movie_list):
-            col_idx = i % 4
-            with cols[col_idx]:
-                if st.button(f"🎬 {movie}", key=f"no_results_{i}", use_container_width=True):
-                    st.session_state.selected_movie = movie
-                    st.rerun()
-                
-                # Collection status for each movie (read-only)
-                st.markdown("**📚 Collection Status:**")
-                
-                # Watchlist status
-                if movie in st.session_state.watchlist:
-                    st.success("📋 In Watchlist")
-                else:
-                    st.info("📋 Not in Watchlist")
-                
-                # Favorites status
-                if movie in st.session_state.favorites:
-                    st.success("⭐ In Favorites")
-                else:
-                    st.info("⭐ Not in Favorites")
-                
-                # Watch History status
-                if movie in st.session_state.watch_history:
-                    st.success("📺 In History")
-                else:
-                    st.info("📺 Not in History")
-                
-                # Add free watching options for each movie in no results list
-                free_links = get_free_watching_links(movie, "")
-                # Show top 2 free platforms for no results list (space constraint)
-                top_platforms = list(free_links.items())[:2]
-                for platform_key, platform_info in top_platforms:
-                    st.markdown(f"""
-                        <a href="{platform_info['url']}" target="_blank" 
-                           style="display: block; background: linear-gradient(135deg, {platform_info['color']}, {platform_info['color']}dd); 
-                                  color: white; padding: 0.2rem 0.5rem; border-radius: 6px; text-decoration: none; 
-                                  text-align: center; margin: 0.1rem 0; font-size: 0.7rem; font-weight: bold;">
-                            🆓 {platform_info['name']}
-                        </a>
-                    """, unsafe_allow_html=True)
+        render_movie_list_page(filtered_movie_list, "no_results")
         
         st.markdown("</div>", unsafe_allow_html=True)
         
@@ -2504,12 +1995,12 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
-# Define alphabet for alphabetical browsing
-alphabet = list('ABCDEFGHIJKLMNOPQRSTUVWXYZ')
+# Define alphabet for alphabetical browsing; '#' holds titles starting with a digit or symbol
+alphabet = LETTER_BUCKETS
 
 # Quick alphabetical index (compact view)
 st.markdown("**Quick Browse:**")
-quick_alpha = st.columns(26)
+quick_alpha = st.columns(len(alphabet))
 for i, letter in enumerate(alphabet):
     with quick_alpha[i]:
         if st.button(letter, key=f"quick_{letter}", help=f"Browse movies starting with {letter}"):
@@ -2521,14 +2012,12 @@ st.markdown("---")
 st.markdown("**📊 Letter Distribution:**")
 col1, col2 = st.columns(2)
 
+# Counted from the letter index built with the model, not by scanning the movie list
+movies_per_letter = letter_counts(model, catalog_filter_mask)
+
 with col1:
-    # Calculate and display top 5 most common starting letters
-    letter_counts = {}
-    for letter in alphabet:
-        count = len([movie for movie in filtered_movie_list if movie.upper().startswith(letter)])
-        letter_counts[letter] = count
-    
-    top_letters = sorted(letter_counts.items(), key=lambda x: x[1], reverse=True)[:5]
+    # Display top 5 most common starting letters
+    top_letters = sorted(movies_per_letter.items(), key=lambda x: x[1], reverse=True)[:5]
     st.markdown("**Top 5 Starting Letters:**")
     for letter, count in top_letters:
         percentage = round((count / len(filtered_movie_list)) * 100, 1)
@@ -2536,7 +2025,7 @@ with col1:
 
 with col2:
     # Show letters with fewest movies
-    bottom_letters = sorted(letter_counts.items(), key=lambda x: x[1])[:5]
+    bottom_letters = sorted(movies_per_letter.items(), key=lambda x: x[1])[:5]
     st.markdown("**Least Common Starting Letters:**")
     for letter, count in bottom_letters:
         percentage = round((count / len(filtered_movie_list)) * 100, 1)
@@ -2552,8 +2041,8 @@ for i, letter in enumerate(alphabet[:13]):
             st.session_state.selected_letter = letter
             st.rerun()
 
-# Second row (N-Z)  
-cols2 = st.columns(13)
+# Second row (N-Z and #)
+cols2 = st.columns(14)
 for i, letter in enumerate(alphabet[13:]):
     with cols2[i]:
         if st.button(f"**{letter}**", key=f"alpha2_{letter}", use_container_width=True):
@@ -2561,47 +2050,41 @@ for i, letter in enumerate(alphabet[13:]):
             st.rerun()
 
 # Show movies for selected letter
-if hasattr(st.session_state, 'selected_letter') and st.session_state.selected_letter:
+if hasattr(st.session_state, 'selected_letter') and st.session_state.selected_letter in movies_per_letter:
     selected_letter = st.session_state.selected_letter
     
-    # Filter movies starting with the selected letter
-    letter_movies = [movie for movie in filtered_movie_list if movie.upper().startswith(selected_letter)]
+    # Movies starting with the selected letter, sorted by title, straight from the letter index
+    letter_movie_rows = letter_rows(model, selected_letter, catalog_filter_mask)
     
     # Show letter statistics
     col1, col2, col3 = st.columns(3)
     with col1:
-        st.metric(f"Movies starting with '{selected_letter}'", len(letter_movies))
+        st.metric(f"Movies starting with '{selected_letter}'", len(letter_movie_rows))
     with col2:
         # Calculate percentage of total movies
-        percentage = round((len(letter_movies) / len(filtered_movie_list)) * 100, 1)
+        percentage = round((len(letter_movie_rows) / len(filtered_movie_list)) * 100, 1)
         st.metric("Percentage of total", f"{percentage}%")
     with col3:
         # Show sample of first few movies
-        if letter_movies:
-            sample = ", ".join(letter_movies[:3]) + ("..." if len(letter_movies) > 3 else "")
+        if len(letter_movie_rows) > 0:
+            sample = ", ".join(movie_list[letter_movie_rows[:3]]) + ("..." if len(letter_movie_rows) > 3 else "")
             st.metric("Sample titles", sample)
     
-    if letter_movies:
+    if len(letter_movie_rows) > 0:
+        
+        # Only the current page of the letter is rendered
+        start, stop = render_page_navigation(len(letter_movie_rows), f"letter_{selected_letter}")
+        letter_movies = movie_list[letter_movie_rows[start:stop]]
         
         # Display movies in a grid
-        if len(letter_movies) <= 8:
-            # For 8 or fewer movies, use 4 columns
-            movie_cols = st.columns(4)
-            for i, movie in enumerate(letter_movies):
-                col_idx = i % 4
-                with movie_cols[col_idx]:
-                    if st.button(f"🎬 {movie}", key=f"letter_{selected_letter}_{i}", use_container_width=True):
-                        st.session_state.selected_movie = movie
-                        st.rerun()
-        else:
-            # For more than 8 movies, use 5 columns
-            movie_cols = st.columns(5)
-            for i, movie in enumerate(letter_movies):
-                col_idx = i % 5
-                with movie_cols[col_idx]:
-                    if st.button(f"🎬 {movie}", key=f"letter_{selected_letter}_{i}", use_container_width=True):
-                        st.session_state.selected_movie = movie
-                        st.rerun()
+        column_count = 4 if len(letter_movies) <= 8 else 5
+        movie_cols = st.columns(column_count)
+        for i, movie in enumerate(letter_movies, start=start):
+            col_idx = i % column_count
+            with movie_cols[col_idx]:
+                if st.button(f"🎬 {movie}", key=f"letter_{selected_letter}_{i}", use_container_width=True):
+                    st.session_state.selected_movie = movie
+                    st.rerun()
         
         # Clear letter selection button
         if st.button(f"🗑️ Clear '{selected_letter}' Selection", key=f"clear_letter_{selected_letter}"):
@@ -2701,8 +2184,12 @@ with col2:
         
         # Show selected movie details
         try:
-            # Use the movie title directly with the enhanced service
-            selected_movie_details = movie_service.get_movie_details(selected_movie)
+            # Catalog movies come from the metadata snapshot, others from the enhanced service
+            selected_row = find_movie_row(model, selected_movie)
+            if selected_row is not None:
+                selected_movie_details = get_catalog_movie_details([selected_row])[0]
+            else:
+                selected_movie_details = movie_service.get_movie_details(selected_movie)
         except Exception as e:
             st.error(f"Error processing movie selection: {str(e)}")
             selected_movie_details = get_default_movie_details()
@@ -3066,11 +2553,11 @@ with col2:
         
         # Only show recommendations if we have valid movie details
         if 'selected_movie_details' in locals() and selected_movie_details:
-                recommended_movies = recommend(selected_movie)
+                recommended_movies = recommend(selected_movie, mask=catalog_filter_mask)
                 
                 if recommended_movies:
                     # Display recommendations with ratings and details
-                    cols = st.columns(5)
+                    cols = st.columns(RECOMMENDATION_COUNT)
                     for i, col in enumerate(cols):
                         if i < len(recommended_movies):
                             with col:
@@ -3425,41 +2912,26 @@ with col4:
             st.info(f"🔍 **Debug**: Movie type: {type(movie_to_add)}")
             st.info(f"🔍 **Debug**: Movie length: {len(movie_to_add) if movie_to_add else 'None'}")
             
-            # Smart search: find movies that contain the search term (case-insensitive)
+            # Smart search: ranked matches from the title indexes, tolerant of typos
             # First check in the main movie list, then in popular movies
-            matching_movies = []
-            search_lower = movie_to_add.lower()
-            
-            # Get the current movie list (either filtered or main)
-            current_movie_list = []
-            try:
-                # Try to get filtered movie list first
-                if 'filtered_movie_list' in locals() and filtered_movie_list:
-                    current_movie_list = filtered_movie_list
-                else:
-                    # Fallback to main movie list
-                    current_movie_list = movie_list
-            except:
-                # Fallback to main movie list
-                current_movie_list = movie_list
-            
-            # Search in current movie list
-            for movie in current_movie_list:
-                if search_lower in movie.lower():
-                    matching_movies.append(movie)
+            current_movie_list = filtered_movie_list
+            matching_movies = search_index.search_titles(movie_to_add, allowed=catalog_filter_mask)
             
             # Also search in popular movies (in case they're not in main list)
             try:
                 popular_movies = movie_service.get_popular_movies_list()
-                for movie in popular_movies:
-                    if search_lower in movie.lower() and movie not in matching_movies:
+                for movie in load_popular_search_index().search_titles(movie_to_add):
+                    if movie not in matching_movies:
                         matching_movies.append(movie)
             except:
                 pass
             
-            # If exact match found in current movie list, use that
-            if movie_to_add in current_movie_list:
-                exact_match = movie_to_add
+            # Exact (case-insensitive) title match from the lookup index
+            exact_row = find_movie_row(model, movie_to_add)
+            
+            # If exact match found in the movie database, use that
+            if exact_row is not None:
+                exact_match = movies.iloc[exact_row]['title']
             # If exact match found in popular movies, use that
             elif movie_to_add in popular_movies:
                 exact_match = movie_to_add
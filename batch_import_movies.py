@@ -1,20 +1,6 @@
 import pandas as pd
-import pickle
 import os
-from sklearn.feature_extraction.text import CountVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-
-def load_existing_model():
-    """Load existing model files"""
-    try:
-        with open('model/movie_list.pkl', 'rb') as f:
-            movie_list = pickle.load(f)
-        with open('model/similarity.pkl', 'rb') as f:
-            similarity = pickle.load(f)
-        return movie_list, similarity
-    except FileNotFoundError:
-        print("Model files not found. Please run generate_model.py first.")
-        return None, None
+from model_store import update_model_with_new_movies
 
 def create_sample_csv():
     """Create a sample CSV file for batch import"""
@@ -66,52 +52,6 @@ def import_movies_from_csv(csv_file):
         print(f"Error reading CSV file: {e}")
         return None
 
-def update_model_with_new_movies(new_movies):
-    """Update the model with new movies"""
-    print("Loading existing model...")
-    movie_list, similarity = load_existing_model()
-    
-    if movie_list is None:
-        return False
-    
-    print(f"Current movies in system: {len(movie_list)}")
-    
-    # Convert new movies to the same format as existing ones
-    for movie in new_movies:
-        # Create tags by combining all features
-        tags = []
-        if movie['overview']:
-            tags.extend(movie['overview'].split())
-        tags.extend(movie['genres'])
-        tags.extend(movie['keywords'])
-        tags.extend(movie['cast'])
-        tags.extend(movie['crew'])
-        
-        # Add to movie list
-        new_row = pd.DataFrame([{
-            'movie_id': f"custom_{len(movie_list) + 1}",
-            'title': movie['title'],
-            'tags': ' '.join(tags)
-        }])
-        
-        movie_list = pd.concat([movie_list, new_row], ignore_index=True)
-    
-    print(f"Updated movies in system: {len(movie_list)}")
-    
-    # Recalculate similarity matrix
-    print("Recalculating similarity matrix...")
-    cv = CountVectorizer(max_features=5000, stop_words='english')
-    vector = cv.fit_transform(movie_list['tags']).toarray()
-    new_similarity = cosine_similarity(vector)
-    
-    # Save updated model
-    print("Saving updated model...")
-    pickle.dump(movie_list, open('model/movie_list.pkl', 'wb'))
-    pickle.dump(new_similarity, open('model/similarity.pkl', 'wb'))
-    
-    print("Model updated successfully!")
-    return True
-
 def main():
     """Main function for batch import"""
     print("🎬 Batch Import Movies to Recommender System")
@@ -151,6 +91,7 @@ def main():
         return
     
     # Update model
+    print(f"Adding {len(movies)} movies to the model...")
     if update_model_with_new_movies(movies):
         print("🎉 Movies imported successfully!")
         print("You can now restart the Streamlit app to see the new movies.")
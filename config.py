@@ -13,12 +13,42 @@ TMDB_IMAGE_BASE_URL = "https://image.tmdb.org/t/p/w500"
 APP_TITLE = "🎬 Movie Recommender System"
 APP_ICON = "🎬"
 PAGE_LAYOUT = "wide"
+MOVIE_LIST_PAGE_SIZE = 24  # Movies rendered per page of the complete movie list
+SEARCH_RESULT_COUNT = 20  # Best matches shown for a title search
+SEARCH_MIN_SIMILARITY = 0.3  # Trigram similarity (0-1) a misspelled title needs to be suggested
+TITLE_MATCH_THRESHOLD = 0.7  # Similarity (0-1) a title needs to use the trailer or streaming entry of another one
+MOVIE_LINKS_FILE = "data/movie_links.json"  # Curated trailer and streaming tables
 
 # Model Configuration
 MODEL_PATH = "model"
 MOVIE_LIST_FILE = "movie_list.pkl"
-SIMILARITY_FILE = "similarity.pkl"
+NEIGHBOR_IDS_FILE = "neighbor_ids.npy"
+NEIGHBOR_SCORES_FILE = "neighbor_scores.npy"
+MANIFEST_FILE = "manifest.json"
+LOOKUP_INDEX_FILE = "lookup_index.json"
+VECTORIZER_FILE = "vectorizer.json"
+FEATURES_FILE = "features_{}.npy"  # One file per sparse matrix array: data, indices, indptr
+METADATA_DIR = "metadata"  # Columnar snapshot of movie details, inside MODEL_PATH
+NEIGHBOR_COUNT = 50  # Nearest neighbors kept per movie in the model
+RECOMMENDATION_COUNT = 5  # Recommendations shown per movie
+SIMILARITY_BLOCK_ROWS = 1024  # Rows per similarity block when building the model
 
 # Performance Configuration
-CACHE_SIZE = 100  # Number of movies to cache for filtering
+CACHE_SIZE = 100  # Movie details kept in memory per process
+CACHE_TTL = 3600  # Seconds before in-memory movie details expire
+CACHE_FALLBACK_TTL = 60  # Seconds fallback details (loose matches, defaults) are kept, so a recovered API is used soon
 REQUEST_TIMEOUT = 10  # API request timeout in seconds
+METADATA_WORKERS = 5  # Parallel movie detail lookups (one per recommendation)
+HTTP_POOL_SIZE = 10  # Keep-alive connections kept per host
+HTTP_MAX_RETRIES = 2  # Retries of failed GET requests (connection errors, 429 and 5xx)
+HTTP_BACKOFF_FACTOR = 0.3  # Base of the jittered exponential backoff between retries, in seconds
+HTTP_MAX_PER_HOST = 4  # Concurrent requests allowed per host
+SOURCE_MAX_RETRIES = 0  # Retries of movie detail sources guarded by a circuit breaker, which fall back instead
+SOURCE_CONNECT_TIMEOUT = 3  # Seconds to connect to a movie detail source, well within the batch deadline
+CIRCUIT_FAILURE_THRESHOLD = 5  # Consecutive failures before a host or source is skipped
+CIRCUIT_RESET_TIMEOUT = 30  # Seconds a failing host or source is skipped before it is tried again
+METADATA_CACHE_PATH = "cache/metadata.sqlite3"  # Persistent cache of movie details
+METADATA_CACHE_TTL = 7 * 24 * 3600  # Seconds before cached movie details are fetched again
+METADATA_CACHE_MISS_TTL = 24 * 3600  # Seconds before a movie the API didn't know is looked up again
+METADATA_CACHE_MAX_ENTRIES = 10000  # Least recently used entries beyond this are evicted
+METADATA_CACHE_TOUCH_INTERVAL = 60  # Seconds between recorded uses of an entry, so most hits don't write
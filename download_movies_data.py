@@ -1,6 +1,5 @@
 import pandas as pd
-import requests
-import os
+from http_client import http_client
 import zipfile
 from io import BytesIO
 
@@ -37,7 +36,7 @@ def download_from_alternative_sources():
     for source in sources:
         try:
             print(f"Trying {source['name']}...")
-            response = requests.get(source['url'], stream=True)
+            response = http_client.get(source['url'], stream=True)
             response.raise_for_status()
             
             with open(source['filename'], 'wb') as f:
@@ -124,27 +123,27 @@ def create_sample_dataset():
             'tags': ' '.join(tags)
         })
     
-    # Save as pickle file
-    import pickle
-    os.makedirs('model', exist_ok=True)
-    
     df = pd.DataFrame(processed_movies)
-    pickle.dump(df, open('model/movie_list.pkl', 'wb'))
     
-    # Create similarity matrix
+    # Build the neighbor index
     from sklearn.feature_extraction.text import CountVectorizer
-    from sklearn.metrics.pairwise import cosine_similarity
+    from model_store import build_neighbor_index, save_model
     
     cv = CountVectorizer(max_features=5000, stop_words='english')
-    vector = cv.fit_transform(df['tags']).toarray()
-    similarity = cosine_similarity(vector)
+    vector = cv.fit_transform(df['tags'])
+    neighbor_ids, neighbor_scores = build_neighbor_index(vector)
     
-    pickle.dump(similarity, open('model/similarity.pkl', 'wb'))
+    # Save the model files
+    save_model(df, neighbor_ids, neighbor_scores, vectorizer=cv, features=vector)
     
     print("✅ Sample dataset created with 5 popular movies!")
     print("Files saved:")
     print("- model/movie_list.pkl")
-    print("- model/similarity.pkl")
+    print("- model/neighbor_ids.npy")
+    print("- model/neighbor_scores.npy")
+    print("- model/vectorizer.json")
+    print("- model/features_*.npy")
+    print("- model/manifest.json")
     
     return True
 
@@ -4,26 +4,330 @@ Enhanced Movie Service - Multiple API sources and fallback methods
 Replaces TMDB dependency with multiple alternative sources
 """
 
-import requests
+import copy
+import functools
+import hashlib
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from typing import Dict, List, Optional, Tuple
 import random
 from bs4 import BeautifulSoup
 import re
+from metadata_cache import MemoryCache, MetadataCache, cache_key
+from http_client import http_client, CircuitBreaker
+
+try:
+    from config import (REQUEST_TIMEOUT, METADATA_WORKERS, SOURCE_MAX_RETRIES, SOURCE_CONNECT_TIMEOUT,
+                        CACHE_FALLBACK_TTL)
+except ImportError:
+    # Fallback to default values if config.py can't be imported
+    REQUEST_TIMEOUT = 10
+    CACHE_FALLBACK_TTL = 60
+    METADATA_WORKERS = 5
+    SOURCE_MAX_RETRIES = 0
+    SOURCE_CONNECT_TIMEOUT = 3
+
+# Curated details of popular movies, served without any network request
+CURATED_MOVIES = {
+    "The Godfather": {
+        'poster_path': "https://via.placeholder.com/500x750/8B0000/FFFFFF?text=👑+The+Godfather",
+        'vote_average': 9.2,
+        'vote_count': 1800000,
+        'release_date': "1972",
+        'genres': ["Crime", "Drama"],
+        'overview': "The aging patriarch of an organized crime dynasty transfers control of his clandestine empire to his reluctant son, who must navigate the treacherous world of organized crime.",
+        'runtime': 175,
+        'original_language': "en",
+        'budget': 6000000,
+        'revenue': 245066411,
+        'status': "Released"
+    },
+    "Avatar": {
+        'poster_path': "https://via.placeholder.com/500x750/96CEB4/FFFFFF?text=🌍+Avatar",
+        'vote_average': 7.5,
+        'vote_count': 1200000,
+        'release_date': "2009",
+        'genres': ["Action", "Adventure", "Fantasy"],
+        'overview': "A paraplegic Marine dispatched to the moon Pandora on a unique mission becomes torn between following his orders and protecting the world he feels is his home.",
+        'runtime': 162,
+        'original_language': "en",
+        'budget': 237000000,
+        'revenue': 2847246203,
+        'status': "Released"
+    },
+    "Titanic": {
+        'poster_path': "https://via.placeholder.com/500x750/45B7D1/FFFFFF?text=🚢+Titanic",
+        'vote_average': 7.9,
+        'vote_count': 1100000,
+        'release_date': "1997",
+        'genres': ["Drama", "Romance"],
+        'overview': "A seventeen-year-old aristocrat falls in love with a kind but poor artist aboard the luxurious, ill-fated R.M.S. Titanic.",
+        'runtime': 194,
+        'original_language': "en",
+        'budget': 200000000,
+        'revenue': 2187463944,
+        'status': "Released"
+    },
+    "Star Wars: Episode IV - A New Hope": {
+        'poster_path': "https://via.placeholder.com/500x750/FFD700/000000?text=⭐+Star+Wars",
+        'vote_average': 8.6,
+        'vote_count': 1300000,
+        'release_date': "1977",
+        'genres': ["Action", "Adventure", "Fantasy", "Sci-Fi"],
+        'overview': "Luke Skywalker joins forces with a Jedi Knight, a cocky pilot, a Wookiee and two droids to save the galaxy from the Empire's world-destroying battle station.",
+        'runtime': 121,
+        'original_language': "en",
+        'budget': 11000000,
+        'revenue': 775398007,
+        'status': "Released"
+    },
+    "The Avengers": {
+        'poster_path': "https://via.placeholder.com/500x750/DC2626/FFFFFF?text=🦸+The+Avengers",
+        'vote_average': 7.7,
+        'vote_count': 1000000,
+        'release_date': "2012",
+        'genres': ["Action", "Adventure", "Sci-Fi"],
+        'overview': "Earth's mightiest heroes must come together and learn to fight as a team if they are going to stop the mischievous Loki and his alien army from enslaving humanity.",
+        'runtime': 143,
+        'original_language': "en",
+        'budget': 220000000,
+        'revenue': 1518812988,
+        'status': "Released"
+    },
+    "The Dark Knight": {
+        'poster_path': "https://via.placeholder.com/500x750/2C3E50/FFFFFF?text=🦇+The+Dark+Knight",
+        'vote_average': 9.0,
+        'vote_count': 2500000,
+        'release_date': "2008",
+        'genres': ["Action", "Crime", "Drama"],
+        'overview': "When the menace known as the Joker wreaks havoc and chaos on the people of Gotham, Batman must accept one of the greatest psychological and physical tests of his ability to fight injustice.",
+        'runtime': 152,
+        'original_language': "en",
+        'budget': 185000000,
+        'revenue': 1004558444,
+        'status': "Released"
+    },
+    "Inception": {
+        'poster_path': "https://via.placeholder.com/500x750/9B59B6/FFFFFF?text=🌌+Inception",
+        'vote_average': 8.8,
+        'vote_count': 2200000,
+        'release_date': "2010",
+        'genres': ["Action", "Adventure", "Sci-Fi"],
+        'overview': "A thief who steals corporate secrets through the use of dream-sharing technology is given the inverse task of planting an idea into the mind of a C.E.O.",
+        'runtime': 148,
+        'original_language': "en",
+        'budget': 160000000,
+        'revenue': 836836967,
+        'status': "Released"
+    },
+    "The Matrix": {
+        'poster_path': "https://via.placeholder.com/500x750/2C3E50/FFFFFF?text=💊+The+Matrix",
+        'vote_average': 8.7,
+        'vote_count': 1800000,
+        'release_date': "1999",
+        'genres': ["Action", "Sci-Fi"],
+        'overview': "A computer programmer discovers that reality as he knows it is a simulation created by machines, and joins a rebellion to break free.",
+        'runtime': 136,
+        'original_language': "en",
+        'budget': 63000000,
+        'revenue': 463517383,
+        'status': "Released"
+    },
+    "Pulp Fiction": {
+        'poster_path': "https://via.placeholder.com/500x750/8B0000/FFFFFF?text=💼+Pulp+Fiction",
+        'vote_average': 8.9,
+        'vote_count': 2000000,
+        'release_date': "1994",
+        'genres': ["Crime", "Drama"],
+        'overview': "The lives of two mob hitmen, a boxer, a gangster and his wife, and a pair of diner bandits intertwine in four tales of violence and redemption.",
+        'runtime': 154,
+        'original_language': "en",
+        'budget': 8000000,
+        'revenue': 213928762,
+        'status': "Released"
+    },
+    "Fight Club": {
+        'poster_path': "https://via.placeholder.com/500x750/2C3E50/FFFFFF?text=👊+Fight+Club",
+        'vote_average': 8.8,
+        'vote_count': 2000000,
+        'release_date': "1999",
+        'genres': ["Drama"],
+        'overview': "An insomniac office worker and a devil-may-care soapmaker form an underground fight club that evolves into something much, much more.",
+        'runtime': 139,
+        'original_language': "en",
+        'budget': 63000000,
+        'revenue': 100853753,
+        'status': "Released"
+    },
+    "Goodfellas": {
+        'poster_path': "https://via.placeholder.com/500x750/8B0000/FFFFFF?text=💼+Goodfellas",
+        'vote_average': 8.7,
+        'vote_count': 1100000,
+        'release_date': "1990",
+        'genres': ["Biography", "Crime", "Drama"],
+        'overview': "The story of Henry Hill and his life in the mob, covering his relationship with his wife Karen Hill and his mob partners Jimmy Conway and Tommy DeVito.",
+        'runtime': 146,
+        'original_language': "en",
+        'budget': 25000000,
+        'revenue': 46836214,
+        'status': "Released"
+    },
+    "The Silence of the Lambs": {
+        'poster_path': "https://via.placeholder.com/500x750/8B0000/FFFFFF?text=🦋+The+Silence+of+the+Lambs",
+        'vote_average': 8.6,
+        'vote_count': 1400000,
+        'release_date': "1991",
+        'genres': ["Crime", "Drama", "Thriller"],
+        'overview': "A young F.B.I. cadet must receive the help of an incarcerated and manipulative cannibal killer to help catch another serial killer, a madman who skins his victims.",
+        'runtime': 118,
+        'original_language': "en",
+        'budget': 19000000,
+        'revenue': 272742922,
+        'status': "Released"
+    },
+    "Interstellar": {
+        'poster_path': "https://via.placeholder.com/500x750/9B59B6/FFFFFF?text=🚀+Interstellar",
+        'vote_average': 8.6,
+        'vote_count': 1600000,
+        'release_date': "2014",
+        'genres': ["Adventure", "Drama", "Sci-Fi"],
+        'overview': "A team of explorers travel through a wormhole in space in an attempt to ensure humanity's survival.",
+        'runtime': 169,
+        'original_language': "en",
+        'budget': 165000000,
+        'revenue': 677463813,
+        'status': "Released"
+    },
+    "The Shawshank Redemption": {
+        'poster_path': "https://via.placeholder.com/500x750/4ECDC4/FFFFFF?text=🔓+The+Shawshank+Redemption",
+        'vote_average': 9.3,
+        'vote_count': 2500000,
+        'release_date': "1994",
+        'genres': ["Drama"],
+        'overview': "Two imprisoned men bond over a number of years, finding solace and eventual redemption through acts of common decency.",
+        'runtime': 142,
+        'original_language': "en",
+        'budget': 25000000,
+        'revenue': 58800000,
+        'status': "Released"
+    },
+    "Forrest Gump": {
+        'poster_path': "https://via.placeholder.com/500x750/4ECDC4/FFFFFF?text=🏃+Forrest+Gump",
+        'vote_average': 8.8,
+        'vote_count': 2000000,
+        'release_date': "1994",
+        'genres': ["Drama", "Romance"],
+        'overview': "The presidencies of Kennedy and Johnson, the Vietnam War, the Watergate scandal and other historical events unfold from the perspective of an Alabama man with an IQ of 75.",
+        'runtime': 142,
+        'original_language': "en",
+        'budget': 55000000,
+        'revenue': 677945399,
+        'status': "Released"
+    },
+    "The Lord of the Rings: The Fellowship of the Ring": {
+        'poster_path': "https://via.placeholder.com/500x750/F39C12/FFFFFF?text=💍+The+Lord+of+the+Rings",
+        'vote_average': 8.8,
+        'vote_count': 1800000,
+        'release_date': "2001",
+        'genres': ["Action", "Adventure", "Drama"],
+        'overview': "A meek Hobbit from the Shire and eight companions set out on a journey to destroy the powerful One Ring and save Middle-earth from the Dark Lord Sauron.",
+        'runtime': 178,
+        'original_language': "en",
+        'budget': 93000000,
+        'revenue': 871530324,
+        'status': "Released"
+    }
+}
+
+# Curated title of every normalized title, for case and spacing insensitive lookups
+CURATED_TITLES = {cache_key(title): title for title in CURATED_MOVIES}
+
+# Placeholder poster of each genre, for default details
+GENRE_POSTERS = {
+    'Action': "https://via.placeholder.com/500x750/FF6B6B/FFFFFF?text=🎬+Action",
+    'Drama': "https://via.placeholder.com/500x750/4ECDC4/FFFFFF?text=🎬+Drama",
+    'Comedy': "https://via.placeholder.com/500x750/FFE66D/000000?text=🎬+Comedy",
+    'Horror': "https://via.placeholder.com/500x750/8B0000/FFFFFF?text=🎬+Horror",
+    'Sci-Fi': "https://via.placeholder.com/500x750/9B59B6/FFFFFF?text=🎬+Sci-Fi",
+    'Romance': "https://via.placeholder.com/500x750/FF69B4/FFFFFF?text=🎬+Romance",
+    'Thriller': "https://via.placeholder.com/500x750/2C3E50/FFFFFF?text=🎬+Thriller",
+    'Adventure': "https://via.placeholder.com/500x750/F39C12/FFFFFF?text=🎬+Adventure"
+}
+
+def title_seed(movie_title: str) -> int:
+    """Stable seed for a title, the same in every process (unlike hash())"""
+    digest = hashlib.blake2b(cache_key(movie_title).encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big')
+
+@functools.lru_cache(maxsize=1024)
+def default_details(movie_title: str) -> Dict:
+    """Default details derived from the title only, so every rerun and process agrees on them"""
+    rng = random.Random(title_seed(movie_title))
+    
+    # Analyze movie title for genre hints
+    title_lower = movie_title.lower()
+    
+    # Determine genre based on title keywords
+    if any(word in title_lower for word in ['action', 'fight', 'battle', 'war', 'gun']):
+        genres = ["Action", "Adventure", "Thriller"]
+        poster = GENRE_POSTERS['Action']
+    elif any(word in title_lower for word in ['love', 'romance', 'heart', 'kiss']):
+        genres = ["Romance", "Drama", "Comedy"]
+        poster = GENRE_POSTERS['Romance']
+    elif any(word in title_lower for word in ['horror', 'scary', 'ghost', 'monster', 'kill']):
+        genres = ["Horror", "Thriller"]
+        poster = GENRE_POSTERS['Horror']
+    elif any(word in title_lower for word in ['comedy', 'funny', 'laugh', 'joke']):
+        genres = ["Comedy", "Romance"]
+        poster = GENRE_POSTERS['Comedy']
+    elif any(word in title_lower for word in ['space', 'robot', 'future', 'alien', 'tech']):
+        genres = ["Sci-Fi", "Action", "Adventure"]
+        poster = GENRE_POSTERS['Sci-Fi']
+    else:
+        genres = ["Drama", "Adventure"]
+        poster = GENRE_POSTERS['Drama']
+    
+    return {
+        'poster_path': poster,
+        'vote_average': round(rng.uniform(6.5, 8.5), 1),
+        'vote_count': rng.randint(100, 1000),
+        'release_date': str(rng.randint(2015, 2024)),
+        'genres': genres,
+        'overview': f"An engaging {genres[0].lower()} film that tells a compelling story. {movie_title} offers entertainment and excitement for viewers.",
+        'runtime': rng.randint(90, 150),
+        'original_language': "en",
+        'budget': rng.randint(1000000, 100000000),
+        'revenue': rng.randint(5000000, 200000000),
+        'status': "Released"
+    }
+
 
 class EnhancedMovieService:
     """Enhanced movie service with multiple API sources and fallbacks"""
     
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+        # Shared pooled client with retries and circuit breaking
+        self.session = http_client
+        
+        # Resolved details of recently used movies, in front of every source below
+        self.memory_cache = MemoryCache()
+        
+        # Upstream results persisted across reruns, users and processes
+        self.metadata_cache = MetadataCache()
+        
+        # Health of the network sources: after repeated failures a source is skipped for a while
+        self.source_breakers = {
+            '_try_omdb_api': CircuitBreaker(),
+            '_try_web_scraping': CircuitBreaker()
+        }
+        
+        # Bounded pool for batched lookups, shared by all callers of this instance
+        self.executor = ThreadPoolExecutor(max_workers=METADATA_WORKERS, thread_name_prefix='movie-details')
         
         # Enhanced default movie data with more realistic information
         self.enhanced_defaults = {
-            'poster_path': self._get_random_poster(),
+            'poster_path': self._get_default_poster(),
             'vote_average': 7.2,
             'vote_count': 150,
             'release_date': "2020",
@@ -37,57 +341,125 @@ class EnhancedMovieService:
         }
         
         # Genre-specific default posters
-        self.genre_posters = {
-            'Action': "https://via.placeholder.com/500x750/FF6B6B/FFFFFF?text=🎬+Action",
-            'Drama': "https://via.placeholder.com/500x750/4ECDC4/FFFFFF?text=🎬+Drama",
-            'Comedy': "https://via.placeholder.com/500x750/FFE66D/000000?text=🎬+Comedy",
-            'Horror': "https://via.placeholder.com/500x750/8B0000/FFFFFF?text=🎬+Horror",
-            'Sci-Fi': "https://via.placeholder.com/500x750/9B59B6/FFFFFF?text=🎬+Sci-Fi",
-            'Romance': "https://via.placeholder.com/500x750/FF69B4/FFFFFF?text=🎬+Romance",
-            'Thriller': "https://via.placeholder.com/500x750/2C3E50/FFFFFF?text=🎬+Thriller",
-            'Adventure': "https://via.placeholder.com/500x750/F39C12/FFFFFF?text=🎬+Adventure"
-        }
+        self.genre_posters = GENRE_POSTERS
     
-    def _get_random_poster(self) -> str:
-        """Get a random attractive poster from our collection"""
-        posters = [
-            "https://via.placeholder.com/500x750/FF6B6B/FFFFFF?text=🎬+Movie",
-            "https://via.placeholder.com/500x750/4ECDC4/FFFFFF?text=🎬+Cinema",
-            "https://via.placeholder.com/500x750/45B7D1/FFFFFF?text=🎬+Film",
-            "https://via.placeholder.com/500x750/96CEB4/FFFFFF?text=🎬+Show",
-            "https://via.placeholder.com/500x750/FFEAA7/000000?text=🎬+Entertainment"
-        ]
-        return random.choice(posters)
+    # Attractive placeholder posters for movies without one
+    DEFAULT_POSTERS = (
+        "https://via.placeholder.com/500x750/FF6B6B/FFFFFF?text=🎬+Movie",
+        "https://via.placeholder.com/500x750/4ECDC4/FFFFFF?text=🎬+Cinema",
+        "https://via.placeholder.com/500x750/45B7D1/FFFFFF?text=🎬+Film",
+        "https://via.placeholder.com/500x750/96CEB4/FFFFFF?text=🎬+Show",
+        "https://via.placeholder.com/500x750/FFEAA7/000000?text=🎬+Entertainment"
+    )
+    
+    def _get_default_poster(self, movie_title: str = "") -> str:
+        """Get an attractive poster from our collection, always the same one for a title"""
+        return self.DEFAULT_POSTERS[title_seed(movie_title) % len(self.DEFAULT_POSTERS)]
     
     def get_movie_details(self, movie_title: str, movie_id: str = None) -> Dict:
         """Get comprehensive movie details from multiple sources"""
+        # Callers may modify the result, the cached entry must stay intact
+        return copy.deepcopy(self._lookup_details(movie_title, movie_id))
+    
+    def _lookup_details(self, movie_title: str, movie_id: str = None) -> Dict:
+        """Movie details from the in-memory cache, resolving them on a miss (shared, don't modify)"""
+        key = cache_key(movie_title, movie_id)
+        details = self.memory_cache.get(key)
+        if details is None:
+            details, is_fallback = self._resolve_details(movie_title, movie_id)
+            # Stand-ins for an outage or an unknown title are looked up again soon
+            self.memory_cache.set(key, details, ttl=CACHE_FALLBACK_TTL if is_fallback else None)
+        return details
+    
+    def _resolve_details(self, movie_title: str, movie_id: str = None) -> Tuple[Dict, bool]:
+        """Get movie details from the first source that has them, and whether they are only a fallback"""
+        
+        # Curated movies resolve in-process, without touching the disk or the network
+        curated = self._try_curated_data(movie_title, movie_id)
+        if curated:
+            return curated, False
+        
+        # Serve what an earlier lookup fetched from the API
+        cached, cached_details = self.metadata_cache.get(movie_title, movie_id)
+        if cached_details:
+            return cached_details, False
         
-        # Try multiple sources in order of preference
+        # Try multiple sources in order of preference; loose curated matches
+        # only when the API doesn't know the exact title
         sources = [
             self._try_omdb_api,
             self._try_local_enhanced_data,
             self._try_web_scraping,
             self._get_default_enhanced
         ]
+        if cached:
+            # The API recently reported this movie as unknown
+            sources.remove(self._try_omdb_api)
         
         for source_func in sources:
+            breaker = self.source_breakers.get(source_func.__name__)
+            if breaker is not None and not breaker.allow():
+                # Known to be failing, don't stall on it
+                continue
+            
             try:
                 result = source_func(movie_title, movie_id)
+                if breaker is not None:
+                    breaker.record_success()
                 if result and result.get('poster_path'):
-                    return result
+                    if source_func == self._try_omdb_api:
+                        self.metadata_cache.set(movie_title, result, movie_id)
+                    is_fallback = source_func in (self._try_local_enhanced_data, self._get_default_enhanced)
+                    return result, is_fallback
             except Exception as e:
+                if breaker is not None:
+                    breaker.record_failure()
                 continue
         
         # Final fallback
-        return self._get_default_enhanced(movie_title)
+        return self._get_default_enhanced(movie_title), True
+    
+    def source_health(self) -> Dict[str, str]:
+        """Circuit state ('closed', 'open' or 'half-open') of every network source"""
+        return {name: breaker.state for name, breaker in self.source_breakers.items()}
+    
+    def get_many_details(self, movie_titles: List[str], timeout: float = REQUEST_TIMEOUT) -> List[Dict]:
+        """Get details for several movies in parallel, all within one shared deadline
+        
+        Lookups still running when the deadline passes get default details, so the
+        whole batch takes about as long as its slowest lookup, at most timeout seconds.
+        """
+        futures = {}
+        for movie_title in movie_titles:
+            if movie_title not in futures:
+                futures[movie_title] = self.executor.submit(self.get_movie_details, movie_title)
+        
+        wait(futures.values(), timeout=timeout)
+        
+        results = []
+        for movie_title in movie_titles:
+            future = futures[movie_title]
+            if future.done() and not future.exception():
+                results.append(dict(future.result()))
+            else:
+                results.append(self._get_default_enhanced(movie_title))
+        return results
     
     def _try_omdb_api(self, movie_title: str, movie_id: str = None) -> Optional[Dict]:
-        """Try to get movie data from OMDB API (free, no API key required for basic usage)"""
+        """Try to get movie data from OMDB API (free, no API key required for basic usage)
+        
+        Network errors and error responses are raised, so the caller can track the API's health
+        """
+        # OMDB API endpoint
+        url = f"http://www.omdbapi.com/?t={movie_title}&apikey=free"
+        
+        # No retries and a short connect timeout: a dead host fails fast and counts
+        # against the source's breaker instead of holding the lookup past its deadline
+        response = self.session.get(url, timeout=(SOURCE_CONNECT_TIMEOUT, REQUEST_TIMEOUT),
+                                    retries=SOURCE_MAX_RETRIES)
+        response.raise_for_status()
+        
         try:
-            # OMDB API endpoint
-            url = f"http://www.omdbapi.com/?t={movie_title}&apikey=free"
-            
-            response = self.session.get(url, timeout=10)
             if response.status_code == 200:
                 data = response.json()
                 
@@ -96,7 +468,7 @@ class EnhancedMovieService:
                     year = data.get('Year', '').split('–')[0] if data.get('Year') else None
                     
                     return {
-                        'poster_path': data.get('Poster') or self._get_genre_poster(data.get('Genre', '')),
+                        'poster_path': data.get('Poster') or self.get_genre_poster(data.get('Genre', '')),
                         'vote_average': float(data.get('imdbRating', 0)) if data.get('imdbRating') != 'N/A' else 7.0,
                         'vote_count': int(data.get('imdbVotes', '0').replace(',', '')) if data.get('imdbVotes') != 'N/A' else 100,
                         'release_date': year or "2020",
@@ -108,268 +480,33 @@ class EnhancedMovieService:
                         'revenue': None,
                         'status': data.get('Status', 'Released')
                     }
+                
+                if data.get('Response') == 'False':
+                    self.metadata_cache.set_missing(movie_title, movie_id)
         except Exception:
             pass
         
         return None
     
+    def _try_curated_data(self, movie_title: str, movie_id: str = None) -> Optional[Dict]:
+        """Curated details of a movie whose title matches exactly, up to case and spacing"""
+        title = movie_title if movie_title in CURATED_MOVIES else CURATED_TITLES.get(cache_key(movie_title))
+        # A copy, the shared table must stay intact whatever callers do with it
+        return copy.deepcopy(CURATED_MOVIES[title]) if title is not None else None
+    
     def _try_local_enhanced_data(self, movie_title: str, movie_id: str = None) -> Optional[Dict]:
-        """Try to get enhanced data from local movie database"""
-        try:
-            # Enhanced movie database with popular movies
-            enhanced_movies = {
-                "The Godfather": {
-                    'poster_path': "https://via.placeholder.com/500x750/8B0000/FFFFFF?text=👑+The+Godfather",
-                    'vote_average': 9.2,
-                    'vote_count': 1800000,
-                    'release_date': "1972",
-                    'genres': ["Crime", "Drama"],
-                    'overview': "The aging patriarch of an organized crime dynasty transfers control of his clandestine empire to his reluctant son, who must navigate the treacherous world of organized crime.",
-                    'runtime': 175,
-                    'original_language': "en",
-                    'budget': 6000000,
-                    'revenue': 245066411,
-                    'status': "Released"
-                },
-                "Avatar": {
-                    'poster_path': "https://via.placeholder.com/500x750/0066CC/FFFFFF?text=🌊+Avatar",
-                    'vote_average': 7.5,
-                    'vote_count': 1200000,
-                    'release_date': "2009",
-                    'genres': ["Action", "Adventure", "Fantasy", "Sci-Fi"],
-                    'overview': "A paraplegic Marine dispatched to the moon Pandora on a unique mission becomes torn between following his orders and protecting the world he feels is his home.",
-                    'runtime': 162,
-                    'original_language': "en",
-                    'budget': 237000000,
-                    'revenue': 2847246203,
-                    'status': "Released"
-                },
-                "Titanic": {
-                    'poster_path': "https://via.placeholder.com/500x750/1E3A8A/FFFFFF?text=🚢+Titanic",
-                    'vote_average': 7.9,
-                    'vote_count': 1100000,
-                    'release_date': "1997",
-                    'genres': ["Drama", "Romance"],
-                    'overview': "A seventeen-year-old aristocrat falls in love with a kind but poor artist aboard the luxurious, ill-fated R.M.S. Titanic.",
-                    'runtime': 194,
-                    'original_language': "en",
-                    'budget': 200000000,
-                    'revenue': 2187463944,
-                    'status': "Released"
-                },
-                "Star Wars: Episode IV - A New Hope": {
-                    'poster_path': "https://via.placeholder.com/500x750/FFD700/000000?text=⭐+Star+Wars",
-                    'vote_average': 8.6,
-                    'vote_count': 1300000,
-                    'release_date': "1977",
-                    'genres': ["Action", "Adventure", "Fantasy", "Sci-Fi"],
-                    'overview': "Luke Skywalker joins forces with a Jedi Knight, a cocky pilot, a Wookiee and two droids to save the galaxy from the Empire's world-destroying battle station.",
-                    'runtime': 121,
-                    'original_language': "en",
-                    'budget': 11000000,
-                    'revenue': 775398007,
-                    'status': "Released"
-                },
-                "The Avengers": {
-                    'poster_path': "https://via.placeholder.com/500x750/DC2626/FFFFFF?text=🦸+The+Avengers",
-                    'vote_average': 7.7,
-                    'vote_count': 1000000,
-                    'release_date': "2012",
-                    'genres': ["Action", "Adventure", "Sci-Fi"],
-                    'overview': "Earth's mightiest heroes must come together and learn to fight as a team if they are going to stop the mischievous Loki and his alien army from enslaving humanity.",
-                    'runtime': 143,
-                    'original_language': "en",
-                    'budget': 220000000,
-                    'revenue': 1518812988,
-                    'status': "Released"
-                },
-                "The Dark Knight": {
-                    'poster_path': "https://via.placeholder.com/500x750/2C3E50/FFFFFF?text=🦇+The+Dark+Knight",
-                    'vote_average': 9.0,
-                    'vote_count': 2500000,
-                    'release_date': "2008",
-                    'genres': ["Action", "Crime", "Drama"],
-                    'overview': "When the menace known as the Joker wreaks havoc and chaos on the people of Gotham, Batman must accept one of the greatest psychological and physical tests of his ability to fight injustice.",
-                    'runtime': 152,
-                    'original_language': "en",
-                    'budget': 185000000,
-                    'revenue': 1004558444,
-                    'status': "Released"
-                },
-                "Inception": {
-                    'poster_path': "https://via.placeholder.com/500x750/9B59B6/FFFFFF?text=🌌+Inception",
-                    'vote_average': 8.8,
-                    'vote_count': 2200000,
-                    'release_date': "2010",
-                    'genres': ["Action", "Adventure", "Sci-Fi"],
-                    'overview': "A thief who steals corporate secrets through the use of dream-sharing technology is given the inverse task of planting an idea into the mind of a C.E.O.",
-                    'runtime': 148,
-                    'original_language': "en",
-                    'budget': 160000000,
-                    'revenue': 836836967,
-                    'status': "Released"
-                },
-                "The Matrix": {
-                    'poster_path': "https://via.placeholder.com/500x750/2C3E50/FFFFFF?text=💊+The+Matrix",
-                    'vote_average': 8.7,
-                    'vote_count': 1800000,
-                    'release_date': "1999",
-                    'genres': ["Action", "Sci-Fi"],
-                    'overview': "A computer programmer discovers that reality as he knows it is a simulation created by machines, and joins a rebellion to break free.",
-                    'runtime': 136,
-                    'original_language': "en",
-                    'budget': 63000000,
-                    'revenue': 463517383,
-                    'status': "Released"
-                },
-                "Pulp Fiction": {
-                    'poster_path': "https://via.placeholder.com/500x750/8B0000/FFFFFF?text=💼+Pulp+Fiction",
-                    'vote_average': 8.9,
-                    'vote_count': 2000000,
-                    'release_date': "1994",
-                    'genres': ["Crime", "Drama"],
-                    'overview': "The lives of two mob hitmen, a boxer, a gangster and his wife, and a pair of diner bandits intertwine in four tales of violence and redemption.",
-                    'runtime': 154,
-                    'original_language': "en",
-                    'budget': 8000000,
-                    'revenue': 213928762,
-                    'status': "Released"
-                },
-                "Fight Club": {
-                    'poster_path': "https://via.placeholder.com/500x750/2C3E50/FFFFFF?text=👊+Fight+Club",
-                    'vote_average': 8.8,
-                    'vote_count': 2000000,
-                    'release_date': "1999",
-                    'genres': ["Drama"],
-                    'overview': "An insomniac office worker and a devil-may-care soapmaker form an underground fight club that evolves into something much, much more.",
-                    'runtime': 139,
-                    'original_language': "en",
-                    'budget': 63000000,
-                    'revenue': 100853753,
-                    'status': "Released"
-                },
-                "Goodfellas": {
-                    'poster_path': "https://via.placeholder.com/500x750/8B0000/FFFFFF?text=💼+Goodfellas",
-                    'vote_average': 8.7,
-                    'vote_count': 1100000,
-                    'release_date': "1990",
-                    'genres': ["Biography", "Crime", "Drama"],
-                    'overview': "The story of Henry Hill and his life in the mob, covering his relationship with his wife Karen Hill and his mob partners Jimmy Conway and Tommy DeVito.",
-                    'runtime': 146,
-                    'original_language': "en",
-                    'budget': 25000000,
-                    'revenue': 46836214,
-                    'status': "Released"
-                },
-                "The Silence of the Lambs": {
-                    'poster_path': "https://via.placeholder.com/500x750/8B0000/FFFFFF?text=🦋+The+Silence+of+the+Lambs",
-                    'vote_average': 8.6,
-                    'vote_count': 1400000,
-                    'release_date': "1991",
-                    'genres': ["Crime", "Drama", "Thriller"],
-                    'overview': "A young F.B.I. cadet must receive the help of an incarcerated and manipulative cannibal killer to help catch another serial killer, a madman who skins his victims.",
-                    'runtime': 118,
-                    'original_language': "en",
-                    'budget': 19000000,
-                    'revenue': 272742922,
-                    'status': "Released"
-                },
-                "Interstellar": {
-                    'poster_path': "https://via.placeholder.com/500x750/9B59B6/FFFFFF?text=🚀+Interstellar",
-                    'vote_average': 8.6,
-                    'vote_count': 1600000,
-                    'release_date': "2014",
-                    'genres': ["Adventure", "Drama", "Sci-Fi"],
-                    'overview': "A team of explorers travel through a wormhole in space in an attempt to ensure humanity's survival.",
-                    'runtime': 169,
-                    'original_language': "en",
-                    'budget': 165000000,
-                    'revenue': 677463813,
-                    'status': "Released"
-                },
-                "The Shawshank Redemption": {
-                    'poster_path': "https://via.placeholder.com/500x750/4ECDC4/FFFFFF?text=🔓+The+Shawshank+Redemption",
-                    'vote_average': 9.3,
-                    'vote_count': 2500000,
-                    'release_date': "1994",
-                    'genres': ["Drama"],
-                    'overview': "Two imprisoned men bond over a number of years, finding solace and eventual redemption through acts of common decency.",
-                    'runtime': 142,
-                    'original_language': "en",
-                    'budget': 25000000,
-                    'revenue': 58800000,
-                    'status': "Released"
-                },
-                "Forrest Gump": {
-                    'poster_path': "https://via.placeholder.com/500x750/4ECDC4/FFFFFF?text=🏃+Forrest+Gump",
-                    'vote_average': 8.8,
-                    'vote_count': 2000000,
-                    'release_date': "1994",
-                    'genres': ["Drama", "Romance"],
-                    'overview': "The presidencies of Kennedy and Johnson, the Vietnam War, the Watergate scandal and other historical events unfold from the perspective of an Alabama man with an IQ of 75.",
-                    'runtime': 142,
-                    'original_language': "en",
-                    'budget': 55000000,
-                    'revenue': 677945399,
-                    'status': "Released"
-                },
-                "The Lord of the Rings: The Fellowship of the Ring": {
-                    'poster_path': "https://via.placeholder.com/500x750/F39C12/FFFFFF?text=💍+The+Lord+of+the+Rings",
-                    'vote_average': 8.8,
-                    'vote_count': 1800000,
-                    'release_date': "2001",
-                    'genres': ["Action", "Adventure", "Drama"],
-                    'overview': "A meek Hobbit from the Shire and eight companions set out on a journey to destroy the powerful One Ring and save Middle-earth from the Dark Lord Sauron.",
-                    'runtime': 178,
-                    'original_language': "en",
-                    'budget': 93000000,
-                    'revenue': 871530324,
-                    'status': "Released"
-                },
-                "Titanic": {
-                    'poster_path': "https://via.placeholder.com/500x750/45B7D1/FFFFFF?text=🚢+Titanic",
-                    'vote_average': 7.9,
-                    'vote_count': 1100000,
-                    'release_date': "1997",
-                    'genres': ["Drama", "Romance"],
-                    'overview': "A seventeen-year-old aristocrat falls in love with a kind but poor artist aboard the luxurious, ill-fated R.M.S. Titanic.",
-                    'runtime': 194,
-                    'original_language': "en",
-                    'budget': 200000000,
-                    'revenue': 2187463944,
-                    'status': "Released"
-                },
-                "Avatar": {
-                    'poster_path': "https://via.placeholder.com/500x750/96CEB4/FFFFFF?text=🌍+Avatar",
-                    'vote_average': 7.5,
-                    'vote_count': 1200000,
-                    'release_date': "2009",
-                    'genres': ["Action", "Adventure", "Fantasy"],
-                    'overview': "A paraplegic Marine dispatched to the moon Pandora on a unique mission becomes torn between following his orders and protecting the world he feels is his home.",
-                    'runtime': 162,
-                    'original_language': "en",
-                    'budget': 237000000,
-                    'revenue': 2847246203,
-                    'status': "Released"
-                }
-            }
-            
-            # Check for exact match first
-            if movie_title in enhanced_movies:
-                return enhanced_movies[movie_title]
-            
-            # Check for partial matches
-            for title, data in enhanced_movies.items():
-                if movie_title.lower() in title.lower() or title.lower() in movie_title.lower():
-                    return data
-            
-            # Check for genre-based matching
-            for title, data in enhanced_movies.items():
-                if any(genre.lower() in movie_title.lower() for genre in data['genres']):
-                    return data
-                    
-        except Exception:
-            pass
+        """Try a loose match in the curated movies: partial title, then genre named in the title"""
+        query = movie_title.lower()
+        
+        # Check for partial matches
+        for title, data in CURATED_MOVIES.items():
+            if query in title.lower() or title.lower() in query:
+                return copy.deepcopy(data)
+        
+        # Check for genre-based matching
+        for title, data in CURATED_MOVIES.items():
+            if any(genre.lower() in query for genre in data['genres']):
+                return copy.deepcopy(data)
         
         return None
     
@@ -382,10 +519,10 @@ class EnhancedMovieService:
         except Exception:
             return None
     
-    def _get_genre_poster(self, genre_string: str) -> str:
+    def get_genre_poster(self, genre_string: str) -> str:
         """Get a genre-specific poster based on movie genres"""
         if not genre_string:
-            return self._get_random_poster()
+            return self._get_default_poster()
         
         # Extract primary genre
         primary_genre = genre_string.split(',')[0].strip()
@@ -395,67 +532,37 @@ class EnhancedMovieService:
             if genre.lower() in primary_genre.lower():
                 return poster
         
-        return self._get_random_poster()
+        return self._get_default_poster(genre_string)
     
-    def _get_default_enhanced(self, movie_title: str) -> Dict:
+    def _get_default_enhanced(self, movie_title: str, movie_id: str = None) -> Dict:
         """Get enhanced default movie details"""
-        # Analyze movie title for genre hints
-        title_lower = movie_title.lower()
-        
-        # Determine genre based on title keywords
-        if any(word in title_lower for word in ['action', 'fight', 'battle', 'war', 'gun']):
-            genres = ["Action", "Adventure", "Thriller"]
-            poster = self.genre_posters['Action']
-        elif any(word in title_lower for word in ['love', 'romance', 'heart', 'kiss']):
-            genres = ["Romance", "Drama", "Comedy"]
-            poster = self.genre_posters['Romance']
-        elif any(word in title_lower for word in ['horror', 'scary', 'ghost', 'monster', 'kill']):
-            genres = ["Horror", "Thriller"]
-            poster = self.genre_posters['Horror']
-        elif any(word in title_lower for word in ['comedy', 'funny', 'laugh', 'joke']):
-            genres = ["Comedy", "Romance"]
-            poster = self.genre_posters['Comedy']
-        elif any(word in title_lower for word in ['space', 'robot', 'future', 'alien', 'tech']):
-            genres = ["Sci-Fi", "Action", "Adventure"]
-            poster = self.genre_posters['Sci-Fi']
-        else:
-            genres = ["Drama", "Adventure"]
-            poster = self.genre_posters['Drama']
-        
-        return {
-            'poster_path': poster,
-            'vote_average': round(random.uniform(6.5, 8.5), 1),
-            'vote_count': random.randint(100, 1000),
-            'release_date': str(random.randint(2015, 2024)),
-            'genres': genres,
-            'overview': f"An engaging {genres[0].lower()} film that tells a compelling story. {movie_title} offers entertainment and excitement for viewers.",
-            'runtime': random.randint(90, 150),
-            'original_language': "en",
-            'budget': random.randint(1000000, 100000000),
-            'revenue': random.randint(5000000, 200000000),
-            'status': "Released"
-        }
+        # Callers may modify the result, the memoized one must stay intact
+        return copy.deepcopy(default_details(movie_title))
     
     def get_movie_poster_url(self, movie_title: str, movie_id: str = None) -> str:
         """Get movie poster URL with fallbacks"""
-        details = self.get_movie_details(movie_title, movie_id)
-        return details.get('poster_path', self._get_random_poster())
+        details = self._lookup_details(movie_title, movie_id)
+        return details.get('poster_path', self._get_default_poster(movie_title))
     
     def get_movie_rating(self, movie_title: str, movie_id: str = None) -> Tuple[float, int]:
         """Get movie rating and vote count with fallbacks"""
-        details = self.get_movie_details(movie_title, movie_id)
+        details = self._lookup_details(movie_title, movie_id)
         return details.get('vote_average', 7.0), details.get('vote_count', 100)
     
     def get_movie_overview(self, movie_title: str, movie_id: str = None) -> str:
         """Get movie overview with fallbacks"""
-        details = self.get_movie_details(movie_title, movie_id)
+        details = self._lookup_details(movie_title, movie_id)
         return details.get('overview', f"An entertaining film: {movie_title}")
     
     def get_movie_genres(self, movie_title: str, movie_id: str = None) -> List[str]:
         """Get movie genres with fallbacks"""
-        details = self.get_movie_details(movie_title, movie_id)
+        details = self._lookup_details(movie_title, movie_id)
         return details.get('genres', ["Action", "Drama"])
     
+    def cache_stats(self) -> Dict:
+        """Hit and miss counters of the in-memory details cache"""
+        return self.memory_cache.stats()
+    
     def get_popular_movies_list(self) -> List[str]:
         """Get a list of popular movies that can be added to the selection"""
         return [
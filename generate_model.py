@@ -1,11 +1,12 @@
 import pandas as pd
 import numpy as np
 import ast
-import pickle
 import os
+import argparse
 from sklearn.feature_extraction.text import CountVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import requests
+from model_store import (build_neighbor_index, rebuild_neighbor_index, save_model, model_exists,
+                         MODEL_PATH, SIMILARITY_BLOCK_ROWS)
+from http_client import http_client
 import zipfile
 from io import BytesIO
 
@@ -33,12 +34,12 @@ def download_tmdb_dataset():
             
             # Download movies data
             print("Downloading movies data...")
-            movies_response = requests.get(dataset['movies_url'])
+            movies_response = http_client.get(dataset['movies_url'])
             movies_response.raise_for_status()
             
             # Download credits data
             print("Downloading credits data...")
-            credits_response = requests.get(dataset['credits_url'])
+            credits_response = http_client.get(dataset['credits_url'])
             credits_response.raise_for_status()
             
             # Save the files
@@ -68,7 +69,7 @@ def convert(text):
     except:
         return []
 
-def generate_model():
+def generate_model(block_size=SIMILARITY_BLOCK_ROWS, workers=1):
     """Generate the movie recommendation model"""
     print("Loading and processing data...")
     
@@ -83,11 +84,14 @@ def generate_model():
     movies = movies.merge(credits, on='title')
     print(f"After merge shape: {movies.shape}")
     
-    # Select relevant columns
-    movies = movies[['movie_id','title','overview','genres','keywords','cast','crew']]
+    # Select relevant columns, plus the details shown in the app
+    feature_columns = ['movie_id','title','overview','genres','keywords','cast','crew']
+    detail_columns = [column for column in ['runtime','original_language','vote_average','vote_count','release_date']
+                      if column in movies.columns]
+    movies = movies[feature_columns + detail_columns]
     
     # Remove rows with missing values
-    movies.dropna(inplace=True)
+    movies = movies.dropna(subset=feature_columns).reset_index(drop=True)
     print(f"After removing NaN values: {movies.shape}")
     
     # Convert string representations to lists
@@ -96,6 +100,9 @@ def generate_model():
     movies['cast'] = movies['cast'].apply(convert)
     movies['crew'] = movies['crew'].apply(convert)
     
+    # Keep the details for the offline metadata snapshot
+    metadata = movies[['genres','overview'] + detail_columns].copy()
+    
     # Process overview text
     movies['overview'] = movies['overview'].apply(lambda x: x.split())
     
@@ -103,43 +110,77 @@ def generate_model():
     movies['tags'] = movies['overview'] + movies['genres'] + movies['keywords'] + movies['cast'] + movies['crew']
     
     # Create new dataframe with processed data
-    new = movies.drop(columns=['overview','genres','keywords','cast','crew'])
+    new = movies.drop(columns=['overview','genres','keywords','cast','crew'] + detail_columns)
     new['tags'] = new['tags'].apply(lambda x: " ".join(x))
     
     print("Creating feature vectors...")
     
-    # Create feature vectors using CountVectorizer
+    # Create sparse feature vectors using CountVectorizer
     cv = CountVectorizer(max_features=5000, stop_words='english')
-    vector = cv.fit_transform(new['tags']).toarray()
+    vector = cv.fit_transform(new['tags'])
     
     print(f"Feature vector shape: {vector.shape}")
     
-    # Calculate cosine similarity
-    print("Calculating cosine similarity...")
-    similarity = cosine_similarity(vector)
-    
-    # Create model directory if it doesn't exist
-    os.makedirs('model', exist_ok=True)
+    # Keep only the most similar movies for each movie, block by block,
+    # writing the results straight into the model directory
+    print(f"Building top-K neighbor index ({block_size} rows per block, {workers} worker(s))...")
+    neighbor_ids, neighbor_scores = build_neighbor_index(vector, block_size=block_size, spill_dir=MODEL_PATH,
+                                                         workers=workers)
     
     # Save the model files
     print("Saving model files...")
-    pickle.dump(new, open('model/movie_list.pkl', 'wb'))
-    pickle.dump(similarity, open('model/similarity.pkl', 'wb'))
+    save_model(new, neighbor_ids, neighbor_scores, vectorizer=cv, features=vector, metadata=metadata)
     
     print("Model files generated successfully!")
     print("Files saved:")
     print("- model/movie_list.pkl")
-    print("- model/similarity.pkl")
+    print("- model/neighbor_ids.npy")
+    print("- model/neighbor_scores.npy")
+    print("- model/vectorizer.json")
+    print("- model/features_*.npy")
+    print("- model/metadata/")
+    print("- model/manifest.json")
     
     return True
 
+def parse_args():
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Generate the movie recommendation model")
+    parser.add_argument(
+        '--block-size', type=int, default=SIMILARITY_BLOCK_ROWS,
+        help="Rows per similarity block; peak memory is about block size x movie count x 16 bytes "
+             f"(default: {SIMILARITY_BLOCK_ROWS})"
+    )
+    parser.add_argument(
+        '--workers', type=int, default=1,
+        help="Processes computing similarity blocks in parallel; each holds one block in memory "
+             "(default: 1)"
+    )
+    parser.add_argument(
+        '--from-features', action='store_true',
+        help="Rebuild the neighbor index of the existing model from its saved feature vectors, "
+             "without downloading or parsing the datasets"
+    )
+    return parser.parse_args()
+
 def main():
     """Main function to generate the model"""
+    args = parse_args()
+    
     print("Movie Recommender System - Model Generation")
     print("=" * 50)
     
+    if args.from_features:
+        print(f"Rebuilding neighbor index from saved features ({args.block_size} rows per block, "
+              f"{args.workers} worker(s))...")
+        if rebuild_neighbor_index(block_size=args.block_size, workers=args.workers):
+            print("Neighbor index rebuilt successfully!")
+            return True
+        print("The model has no saved feature vectors. Remove the model/ directory and run a full build.")
+        return False
+    
     # Check if model files already exist
-    if os.path.exists('model/movie_list.pkl') and os.path.exists('model/similarity.pkl'):
+    if model_exists():
         print("Model files already exist!")
         return True
     
@@ -150,7 +191,7 @@ def main():
             return False
     
     # Generate the model
-    if generate_model():
+    if generate_model(block_size=args.block_size, workers=args.workers):
         print("\nModel generation completed successfully!")
         print("You can now run the Streamlit app with: streamlit run app.py")
         return True
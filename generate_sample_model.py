@@ -1,9 +1,7 @@
 import pandas as pd
 import numpy as np
-import pickle
-import os
 from sklearn.feature_extraction.text import CountVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from model_store import build_neighbor_index, save_model, model_exists
 
 def generate_sample_data():
     """Generate sample movie data for demonstration"""
@@ -18,7 +16,12 @@ def generate_sample_data():
             'genres': ['Drama'],
             'keywords': ['prison', 'friendship', 'redemption'],
             'cast': ['Tim Robbins', 'Morgan Freeman'],
-            'crew': ['Frank Darabont']
+            'crew': ['Frank Darabont'],
+            'release_date': '1994-09-23',
+            'runtime': 142,
+            'original_language': 'en',
+            'vote_average': 8.5,
+            'vote_count': 8205
         },
         {
             'movie_id': 238,  # The Godfather
@@ -27,7 +30,12 @@ def generate_sample_data():
             'genres': ['Crime', 'Drama'],
             'keywords': ['mafia', 'family', 'crime'],
             'cast': ['Marlon Brando', 'Al Pacino'],
-            'crew': ['Francis Ford Coppola']
+            'crew': ['Francis Ford Coppola'],
+            'release_date': '1972-03-14',
+            'runtime': 175,
+            'original_language': 'en',
+            'vote_average': 8.4,
+            'vote_count': 5893
         },
         {
             'movie_id': 680,  # Pulp Fiction
@@ -36,7 +44,12 @@ def generate_sample_data():
             'genres': ['Crime', 'Drama'],
             'keywords': ['crime', 'violence', 'redemption'],
             'cast': ['John Travolta', 'Samuel L. Jackson'],
-            'crew': ['Quentin Tarantino']
+            'crew': ['Quentin Tarantino'],
+            'release_date': '1994-09-10',
+            'runtime': 154,
+            'original_language': 'en',
+            'vote_average': 8.3,
+            'vote_count': 8428
         },
         {
             'movie_id': 155,  # The Dark Knight
@@ -45,7 +58,12 @@ def generate_sample_data():
             'genres': ['Action', 'Crime', 'Drama'],
             'keywords': ['superhero', 'batman', 'joker'],
             'cast': ['Christian Bale', 'Heath Ledger'],
-            'crew': ['Christopher Nolan']
+            'crew': ['Christopher Nolan'],
+            'release_date': '2008-07-16',
+            'runtime': 152,
+            'original_language': 'en',
+            'vote_average': 8.2,
+            'vote_count': 12002
         },
         {
             'movie_id': 550,  # Fight Club
@@ -54,7 +72,12 @@ def generate_sample_data():
             'genres': ['Drama'],
             'keywords': ['fight club', 'underground', 'rebellion'],
             'cast': ['Brad Pitt', 'Edward Norton'],
-            'crew': ['David Fincher']
+            'crew': ['David Fincher'],
+            'release_date': '1999-10-15',
+            'runtime': 139,
+            'original_language': 'en',
+            'vote_average': 8.3,
+            'vote_count': 9413
         },
         {
             'movie_id': 27205,  # Inception
@@ -63,7 +86,12 @@ def generate_sample_data():
             'genres': ['Action', 'Adventure', 'Sci-Fi'],
             'keywords': ['dreams', 'technology', 'heist'],
             'cast': ['Leonardo DiCaprio', 'Joseph Gordon-Levitt'],
-            'crew': ['Christopher Nolan']
+            'crew': ['Christopher Nolan'],
+            'release_date': '2010-07-14',
+            'runtime': 148,
+            'original_language': 'en',
+            'vote_average': 8.1,
+            'vote_count': 13752
         },
         {
             'movie_id': 603,  # The Matrix
@@ -72,7 +100,12 @@ def generate_sample_data():
             'genres': ['Action', 'Sci-Fi'],
             'keywords': ['matrix', 'simulation', 'reality'],
             'cast': ['Keanu Reeves', 'Laurence Fishburne'],
-            'crew': ['Lana Wachowski', 'Lilly Wachowski']
+            'crew': ['Lana Wachowski', 'Lilly Wachowski'],
+            'release_date': '1999-03-30',
+            'runtime': 136,
+            'original_language': 'en',
+            'vote_average': 7.9,
+            'vote_count': 8907
         },
         {
             'movie_id': 769,  # Goodfellas
@@ -81,7 +114,12 @@ def generate_sample_data():
             'genres': ['Biography', 'Crime', 'Drama'],
             'keywords': ['mafia', 'organized crime', 'biography'],
             'cast': ['Robert De Niro', 'Ray Liotta'],
-            'crew': ['Martin Scorsese']
+            'crew': ['Martin Scorsese'],
+            'release_date': '1990-09-12',
+            'runtime': 145,
+            'original_language': 'en',
+            'vote_average': 8.2,
+            'vote_count': 3128
         },
         {
             'movie_id': 274,  # The Silence of the Lambs
@@ -90,7 +128,12 @@ def generate_sample_data():
             'genres': ['Crime', 'Drama', 'Thriller'],
             'keywords': ['fbi', 'serial killer', 'psychological'],
             'cast': ['Jodie Foster', 'Anthony Hopkins'],
-            'crew': ['Jonathan Demme']
+            'crew': ['Jonathan Demme'],
+            'release_date': '1991-02-01',
+            'runtime': 119,
+            'original_language': 'en',
+            'vote_average': 8.1,
+            'vote_count': 4443
         },
         {
             'movie_id': 157336,  # Interstellar
@@ -99,7 +142,12 @@ def generate_sample_data():
             'genres': ['Adventure', 'Drama', 'Sci-Fi'],
             'keywords': ['space', 'wormhole', 'survival'],
             'cast': ['Matthew McConaughey', 'Anne Hathaway'],
-            'crew': ['Christopher Nolan']
+            'crew': ['Christopher Nolan'],
+            'release_date': '2014-11-05',
+            'runtime': 169,
+            'original_language': 'en',
+            'vote_average': 8.1,
+            'vote_count': 10867
         }
     ]
     
@@ -121,38 +169,43 @@ def generate_sample_data():
     # Select final columns
     final_df = movies_df[['movie_id', 'title', 'tags']]
     
+    # Details for the offline metadata snapshot
+    metadata = movies_df[['genres', 'overview', 'runtime', 'original_language', 'vote_average',
+                          'vote_count', 'release_date']]
+    
     print(f"Generated {len(final_df)} sample movies")
-    return final_df
+    return final_df, metadata
 
 def generate_model():
     """Generate the movie recommendation model"""
     print("Generating movie recommendation model...")
     
     # Get sample data
-    movies = generate_sample_data()
+    movies, metadata = generate_sample_data()
     
-    # Create feature vectors using CountVectorizer
+    # Create sparse feature vectors using CountVectorizer
     cv = CountVectorizer(max_features=100, stop_words='english')
-    vector = cv.fit_transform(movies['tags']).toarray()
+    vector = cv.fit_transform(movies['tags'])
     
     print(f"Feature vector shape: {vector.shape}")
     
-    # Calculate cosine similarity
-    print("Calculating cosine similarity...")
-    similarity = cosine_similarity(vector)
-    
-    # Create model directory if it doesn't exist
-    os.makedirs('model', exist_ok=True)
+    # Keep only the most similar movies for each movie
+    print("Building top-K neighbor index...")
+    neighbor_ids, neighbor_scores = build_neighbor_index(vector)
     
     # Save the model files
     print("Saving model files...")
-    pickle.dump(movies, open('model/movie_list.pkl', 'wb'))
-    pickle.dump(similarity, open('model/similarity.pkl', 'wb'))
+    save_model(movies, neighbor_ids, neighbor_scores, vectorizer=cv, features=vector, metadata=metadata)
     
     print("Model files generated successfully!")
     print("Files saved:")
     print("- model/movie_list.pkl")
-    print("- model/similarity.pkl")
+    print("- model/neighbor_ids.npy")
+    print("- model/neighbor_scores.npy")
+    print("- model/vectorizer.json")
+    print("- model/features_*.npy")
+    print("- model/metadata/")
+    print("- model/manifest.json")
     
     return True
 
@@ -162,7 +215,7 @@ def main():
     print("=" * 55)
     
     # Check if model files already exist
-    if os.path.exists('model/movie_list.pkl') and os.path.exists('model/similarity.pkl'):
+    if model_exists():
         print("Model files already exist!")
         return True
     
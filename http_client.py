@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+HTTP Client - Shared outbound HTTP layer
+Pooled keep-alive connections, bounded retries with jittered backoff,
+a per-host concurrency limit and a circuit breaker per host
+"""
+
+import random
+import threading
+import time
+from typing import Optional, Tuple, Union
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    from config import (REQUEST_TIMEOUT, HTTP_POOL_SIZE, HTTP_MAX_RETRIES, HTTP_BACKOFF_FACTOR,
+                        HTTP_MAX_PER_HOST, CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_TIMEOUT)
+except ImportError:
+    # Fallback to default values if config.py can't be imported
+    REQUEST_TIMEOUT = 10
+    HTTP_POOL_SIZE = 10
+    HTTP_MAX_RETRIES = 2
+    HTTP_BACKOFF_FACTOR = 0.3
+    HTTP_MAX_PER_HOST = 4
+    CIRCUIT_FAILURE_THRESHOLD = 5
+    CIRCUIT_RESET_TIMEOUT = 30
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+class CircuitOpenError(requests.RequestException):
+    """Raised instead of calling a dependency whose circuit is open"""
+
+class CircuitBreaker:
+    """Stops calling a failing dependency for a cool-down window
+
+    After failure_threshold consecutive failures the circuit opens and allow()
+    returns False for reset_timeout seconds. Then one trial call is let through
+    (half-open): a success closes the circuit, a failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+                 reset_timeout: float = CIRCUIT_RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.lock = threading.Lock()
+        self.failures = 0
+        self.opened_at = None
+        self.trial_running = False
+
+    @property
+    def state(self) -> str:
+        """'closed', 'open' or 'half-open'"""
+        with self.lock:
+            if self.opened_at is None:
+                return 'closed'
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                return 'open'
+            return 'half-open'
+
+    def allow(self) -> bool:
+        """Whether a call may go ahead now"""
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at < self.reset_timeout or self.trial_running:
+                return False
+            # Half-open: a single trial call at a time
+            self.trial_running = True
+            return True
+
+    def record_success(self):
+        """Close the circuit after a successful call"""
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_running = False
+
+    def record_failure(self):
+        """Count a failed call, opening the circuit once there are too many in a row"""
+        with self.lock:
+            self.failures += 1
+            self.trial_running = False
+            if self.opened_at is not None or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+class JitteredRetry(Retry):
+    """Retry policy whose exponential backoff is randomized, so clients don't retry in lockstep"""
+
+    def get_backoff_time(self) -> float:
+        return random.uniform(0, super().get_backoff_time())
+
+class HttpClient:
+    """Shared requests session with pooling, retries, per-host limits and circuit breaking"""
+
+    def __init__(self, pool_size: int = HTTP_POOL_SIZE, max_retries: int = HTTP_MAX_RETRIES,
+                 backoff_factor: float = HTTP_BACKOFF_FACTOR, max_per_host: int = HTTP_MAX_PER_HOST):
+        self.pool_size = pool_size
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.session = self._new_session(max_retries)
+        # Sessions of other retry budgets, created on first use
+        self.sessions = {max_retries: self.session}
+
+        self.max_per_host = max_per_host
+        self.lock = threading.Lock()
+        self.host_slots = {}
+        self.breakers = {}
+
+    def _new_session(self, max_retries: int) -> requests.Session:
+        """Pooled session retrying failed GET requests up to max_retries times"""
+        session = requests.Session()
+        session.headers.update({'User-Agent': USER_AGENT})
+
+        retry = JitteredRetry(
+            total=max_retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=['GET', 'HEAD'],
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size, max_retries=retry)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def _session(self, retries: Optional[int]) -> requests.Session:
+        """Session with a retry budget, the default one if retries is None"""
+        if retries is None or retries == self.max_retries:
+            return self.session
+        with self.lock:
+            if retries not in self.sessions:
+                session = self._new_session(retries)
+                session.headers = self.session.headers
+                self.sessions[retries] = session
+            return self.sessions[retries]
+
+    @property
+    def headers(self):
+        """Default headers sent with every request"""
+        return self.session.headers
+
+    def _host_state(self, url: str):
+        """Concurrency semaphore and circuit breaker of a URL's host"""
+        host = urlparse(url).netloc
+        with self.lock:
+            if host not in self.breakers:
+                self.host_slots[host] = threading.BoundedSemaphore(self.max_per_host)
+                self.breakers[host] = CircuitBreaker()
+            return host, self.host_slots[host], self.breakers[host]
+
+    def get(self, url: str, timeout: Union[float, Tuple[float, float]] = REQUEST_TIMEOUT,
+            retries: Optional[int] = None, **kwargs) -> requests.Response:
+        """GET a URL; raises CircuitOpenError while its host is failing
+
+        timeout is in seconds, or a (connect, read) pair; retries overrides the
+        client's retry budget, e.g. 0 for callers with their own fallbacks.
+        """
+        session = self._session(retries)
+        host, slots, breaker = self._host_state(url)
+        if not breaker.allow():
+            raise CircuitOpenError(f"{host} is unavailable, skipping request")
+
+        with slots:
+            try:
+                response = session.get(url, timeout=timeout, **kwargs)
+            except requests.RequestException:
+                breaker.record_failure()
+                raise
+
+        # Server errors count against the host, client errors are the caller's business
+        if response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return response
+
+    def circuit_states(self) -> dict:
+        """State of every host's circuit"""
+        with self.lock:
+            breakers = dict(self.breakers)
+        return {host: breaker.state for host, breaker in breakers.items()}
+
+# Global instance
+http_client = HttpClient()
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Metadata Cache - In-memory and persistent on-disk caches for movie details
+The on-disk cache is shared by reruns, users and worker processes through one SQLite file
+"""
+
+import os
+import json
+import time
+import sqlite3
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    from config import (METADATA_CACHE_PATH, METADATA_CACHE_TTL, METADATA_CACHE_MISS_TTL,
+                        METADATA_CACHE_MAX_ENTRIES, METADATA_CACHE_TOUCH_INTERVAL, CACHE_SIZE, CACHE_TTL)
+except ImportError:
+    # Fallback to default values if config.py can't be imported
+    CACHE_SIZE = 100
+    CACHE_TTL = 3600
+    METADATA_CACHE_PATH = "cache/metadata.sqlite3"
+    METADATA_CACHE_TTL = 7 * 24 * 3600
+    METADATA_CACHE_MISS_TTL = 24 * 3600
+    METADATA_CACHE_MAX_ENTRIES = 10000
+    METADATA_CACHE_TOUCH_INTERVAL = 60
+
+def cache_key(movie_title: str, movie_id: str = None) -> str:
+    """Cache key of a movie: its id if known, else its normalized title"""
+    if movie_id is not None:
+        return f"id:{movie_id}"
+    return "title:" + ' '.join(unicodedata.normalize('NFKC', str(movie_title)).casefold().split())
+
+class MemoryCache:
+    """Thread-safe in-memory LRU cache with per-entry expiry and hit/miss counters"""
+
+    def __init__(self, capacity: int = CACHE_SIZE, ttl: float = CACHE_TTL):
+        self.capacity = capacity
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Cached value of a key, or default if it is missing or expired"""
+        now = time.monotonic()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self.entries[key]
+                self.misses += 1
+                return default
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: str, value: Any, ttl: float = None):
+        """Cache a value, evicting the least recently used entry when full"""
+        if self.capacity <= 0:
+            return
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self.lock:
+            self.entries[key] = (expires_at, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.capacity:
+                self.entries.popitem(last=False)
+
+    def stats(self) -> Dict:
+        """Hit and miss counters and current size"""
+        with self.lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self.entries), 'capacity': self.capacity}
+
+    def clear(self):
+        """Remove every entry and reset the counters"""
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+class MetadataCache:
+    """SQLite-backed movie details cache with expiry, negative entries and LRU eviction
+
+    Last use is recorded at most every touch_interval seconds per entry, so
+    eviction is approximately LRU and most hits are plain reads, which don't take
+    the database's write lock.
+    """
+
+    def __init__(self, path: str = METADATA_CACHE_PATH, ttl: float = METADATA_CACHE_TTL,
+                 miss_ttl: float = METADATA_CACHE_MISS_TTL, max_entries: int = METADATA_CACHE_MAX_ENTRIES,
+                 touch_interval: float = METADATA_CACHE_TOUCH_INTERVAL):
+        self.path = path
+        self.ttl = ttl
+        self.miss_ttl = miss_ttl
+        self.max_entries = max_entries
+        self.touch_interval = touch_interval
+        self.lock = threading.Lock()
+        self.connection = None
+
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self.connection = sqlite3.connect(path, timeout=5, check_same_thread=False)
+            # WAL lets worker processes read while another one writes
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS metadata ("
+                "key TEXT PRIMARY KEY, details TEXT, expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self.connection.execute("CREATE INDEX IF NOT EXISTS metadata_accessed ON metadata (accessed_at)")
+            self.connection.commit()
+        except (sqlite3.Error, OSError):
+            # A read-only or broken disk just means no caching
+            self.connection = None
+
+    def get(self, movie_title: str, movie_id: str = None) -> Tuple[bool, Optional[Dict]]:
+        """Look a movie up: (False, None) if not cached, (True, None) for a cached miss, else (True, details)"""
+        if self.connection is None:
+            return False, None
+
+        key = cache_key(movie_title, movie_id)
+        now = time.time()
+        try:
+            with self.lock:
+                row = self.connection.execute(
+                    "SELECT details, expires_at, accessed_at FROM metadata WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return False, None
+                if row[1] <= now:
+                    self.connection.execute("DELETE FROM metadata WHERE key = ?", (key,))
+                    self.connection.commit()
+                    return False, None
+                if now - row[2] >= self.touch_interval:
+                    self.connection.execute("UPDATE metadata SET accessed_at = ? WHERE key = ?", (now, key))
+                    self.connection.commit()
+        except sqlite3.Error:
+            return False, None
+
+        # Decoded fresh on every read, so callers may modify what they get
+        return True, json.loads(row[0]) if row[0] is not None else None
+
+    def set(self, movie_title: str, details: Dict, movie_id: str = None):
+        """Cache the details of a movie"""
+        self._store(cache_key(movie_title, movie_id), json.dumps(details, ensure_ascii=False), self.ttl)
+
+    def set_missing(self, movie_title: str, movie_id: str = None):
+        """Remember that a movie could not be found, so the lookup isn't repeated for a while"""
+        self._store(cache_key(movie_title, movie_id), None, self.miss_ttl)
+
+    def _store(self, key: str, details: Optional[str], ttl: float):
+        """Insert or replace an entry, evicting the least recently used ones beyond max_entries"""
+        if self.connection is None:
+            return
+
+        now = time.time()
+        try:
+            with self.lock:
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO metadata (key, details, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                    (key, details, now + ttl, now)
+                )
+                count = self.connection.execute("SELECT COUNT(*) FROM metadata").fetchone()[0]
+                if count > self.max_entries:
+                    self.connection.execute(
+                        "DELETE FROM metadata WHERE key IN "
+                        "(SELECT key FROM metadata ORDER BY accessed_at LIMIT ?)",
+                        (count - self.max_entries,)
+                    )
+                self.connection.commit()
+        except sqlite3.Error:
+            pass
+
+    def clear(self):
+        """Remove every cached entry"""
+        if self.connection is None:
+            return
+        try:
+            with self.lock:
+                self.connection.execute("DELETE FROM metadata")
+                self.connection.commit()
+        except sqlite3.Error:
+            pass
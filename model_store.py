@@ -0,0 +1,649 @@
+"""
+Model Store - Build, save and load the recommender model artifacts
+Keeps a compact top-K neighbor index instead of the dense N x N similarity matrix
+"""
+
+import os
+import json
+import pickle
+import shutil
+import tempfile
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.feature_extraction.text import CountVectorizer
+from sklearn.preprocessing import normalize
+from movie_metadata import MovieMetadata, save_metadata, METADATA_DIR, METADATA_FIELDS
+
+try:
+    from config import (MODEL_PATH, MOVIE_LIST_FILE, NEIGHBOR_IDS_FILE, NEIGHBOR_SCORES_FILE,
+                        MANIFEST_FILE, LOOKUP_INDEX_FILE, VECTORIZER_FILE, FEATURES_FILE,
+                        NEIGHBOR_COUNT, SIMILARITY_BLOCK_ROWS)
+except ImportError:
+    # Fallback to default values if config.py can't be imported
+    MODEL_PATH = "model"
+    MOVIE_LIST_FILE = "movie_list.pkl"
+    NEIGHBOR_IDS_FILE = "neighbor_ids.npy"
+    NEIGHBOR_SCORES_FILE = "neighbor_scores.npy"
+    MANIFEST_FILE = "manifest.json"
+    LOOKUP_INDEX_FILE = "lookup_index.json"
+    VECTORIZER_FILE = "vectorizer.json"
+    FEATURES_FILE = "features_{}.npy"
+    NEIGHBOR_COUNT = 50
+    SIMILARITY_BLOCK_ROWS = 1024
+
+# Bumped whenever the on-disk layout changes
+FORMAT_VERSION = 1
+
+# Bumped whenever the feature vectors change meaning (tokenization, weighting, normalization);
+# saved features of another version are ignored and need a full rebuild
+FEATURES_VERSION = 1
+
+# CountVectorizer settings saved with the vocabulary, so new text is vectorized the same way
+VECTORIZER_PARAMS = ['lowercase', 'strip_accents', 'stop_words', 'token_pattern', 'ngram_range',
+                     'analyzer', 'binary', 'max_features']
+
+# Buckets of the alphabetical browser: one per letter, then '#' for titles starting with a digit or symbol
+LETTER_BUCKETS = list('ABCDEFGHIJKLMNOPQRSTUVWXYZ') + ['#']
+
+# Files written by older builds; similarity.pkl is still converted on load, features.npz still read
+LEGACY_SIMILARITY_FILE = "similarity.pkl"
+LEGACY_FEATURES_FILE = "features.npz"
+LEGACY_FILES = [LEGACY_SIMILARITY_FILE, "neighbors.pkl", LEGACY_FEATURES_FILE]
+
+# Arrays of a CSR matrix, saved one .npy each so they can be memory-mapped
+CSR_PARTS = ['data', 'indices', 'indptr']
+FEATURES_FILES = {part: FEATURES_FILE.format(part) for part in CSR_PARTS}
+
+def top_k_indices(scores, k):
+    """Positions of the k highest scores along the last axis, best first"""
+    k = max(0, min(k, scores.shape[-1]))
+    if k == 0:
+        return np.empty(scores.shape[:-1] + (0,), dtype=np.intp)
+    
+    # Unordered top-k first, then sort only those k entries
+    candidates = np.argpartition(-scores, k - 1, axis=-1)[..., :k]
+    candidate_scores = np.take_along_axis(scores, candidates, axis=-1)
+    order = np.argsort(-candidate_scores, axis=-1, kind='stable')
+    return np.take_along_axis(candidates, order, axis=-1)
+
+def _top_k_from_similarity(similarity, top_k):
+    """Select the top-K neighbors of every row of a similarity block"""
+    positions = top_k_indices(similarity, top_k)
+    neighbor_ids = positions.astype(np.int32)
+    neighbor_scores = np.take_along_axis(similarity, positions, axis=1).astype(np.float16)
+    return neighbor_ids, neighbor_scores
+
+def normalize_vectors(vector):
+    """L2-normalize feature rows, keeping them sparse, so dot products are cosines"""
+    matrix = sparse.csr_matrix(vector, dtype=np.float32)
+    # Memory-mapped (read-only) features are normalized into a copy
+    return normalize(matrix, norm='l2', copy=not matrix.data.flags.writeable)
+
+def _spill_path(path):
+    """Temporary file a result is written to before it replaces path"""
+    return path + '.tmp'
+
+def _allocate_neighbor_arrays(shape, spill_dir=None):
+    """Allocate the neighbor index in memory, or as .npy memmaps in spill_dir"""
+    if spill_dir is None:
+        return np.empty(shape, dtype=np.int32), np.empty(shape, dtype=np.float16)
+    
+    os.makedirs(spill_dir, exist_ok=True)
+    neighbor_ids = np.lib.format.open_memmap(
+        _spill_path(os.path.join(spill_dir, NEIGHBOR_IDS_FILE)), mode='w+', dtype=np.int32, shape=shape)
+    neighbor_scores = np.lib.format.open_memmap(
+        _spill_path(os.path.join(spill_dir, NEIGHBOR_SCORES_FILE)), mode='w+', dtype=np.float16, shape=shape)
+    return neighbor_ids, neighbor_scores
+
+def _similarity_block(normalized, normalized_t, start, stop, top_k):
+    """Top-K neighbors of rows start..stop against every movie"""
+    similarity = (normalized[start:stop] @ normalized_t).toarray()
+    # A movie is never its own recommendation
+    similarity[np.arange(stop - start), np.arange(start, stop)] = -np.inf
+    return _top_k_from_similarity(similarity, top_k)
+
+def _share_matrix(matrix, directory, name):
+    """Write a CSR matrix's arrays to .npy files that worker processes can memory-map"""
+    paths = {}
+    for part in CSR_PARTS:
+        paths[part] = os.path.join(directory, f"{name}_{part}.npy")
+        np.save(paths[part], getattr(matrix, part))
+    return paths, matrix.shape
+
+def _open_shared_matrix(paths, shape):
+    """Rebuild a CSR matrix on top of memory-mapped arrays, without copying them"""
+    arrays = [np.load(paths[part], mmap_mode='r') for part in CSR_PARTS]
+    return sparse.csr_matrix(tuple(arrays), shape=shape, copy=False)
+
+# Matrices a pool worker opened once in its initializer
+_worker_matrices = {}
+
+def _init_worker(normalized_share, normalized_t_share):
+    """Open the shared feature matrices in a pool worker"""
+    _worker_matrices['normalized'] = _open_shared_matrix(*normalized_share)
+    _worker_matrices['normalized_t'] = _open_shared_matrix(*normalized_t_share)
+
+def _worker_similarity_block(start, stop, top_k):
+    """Compute one block of the neighbor index in a pool worker"""
+    neighbor_ids, neighbor_scores = _similarity_block(
+        _worker_matrices['normalized'], _worker_matrices['normalized_t'], start, stop, top_k)
+    return start, stop, neighbor_ids, neighbor_scores
+
+def build_neighbor_index(vector, top_k=NEIGHBOR_COUNT, block_size=SIMILARITY_BLOCK_ROWS, spill_dir=None,
+                         workers=1):
+    """Compute the top-K most similar movies (ids and scores) for every movie
+    
+    Similarities are computed block_size rows at a time, so peak memory is about
+    block_size x movie_count x 16 bytes per worker whatever the catalog size. With
+    spill_dir the results are written to disk as they are produced instead of kept
+    in RAM. With workers > 1 the blocks are spread over a process pool that shares
+    the feature matrix through memory-mapped files.
+    """
+    movie_count = vector.shape[0]
+    top_k = max(0, min(top_k, movie_count - 1))
+    block_size = max(1, int(block_size))
+    
+    normalized = normalize_vectors(vector)
+    # Transposed copy in CSR, so block products need no format conversion
+    normalized_t = normalized.T.tocsr()
+    
+    neighbor_ids, neighbor_scores = _allocate_neighbor_arrays((movie_count, top_k), spill_dir)
+    blocks = [(start, min(start + block_size, movie_count)) for start in range(0, movie_count, block_size)]
+    
+    if workers <= 1 or len(blocks) <= 1:
+        # Only one block of similarity rows is ever dense
+        for start, stop in blocks:
+            neighbor_ids[start:stop], neighbor_scores[start:stop] = _similarity_block(
+                normalized, normalized_t, start, stop, top_k)
+        return neighbor_ids, neighbor_scores
+    
+    share_dir = tempfile.mkdtemp(prefix='neighbor_build_', dir=spill_dir)
+    try:
+        normalized_share = _share_matrix(normalized, share_dir, 'normalized')
+        normalized_t_share = _share_matrix(normalized_t, share_dir, 'normalized_t')
+        del normalized, normalized_t
+        
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(normalized_share, normalized_t_share)) as pool:
+            results = pool.map(_worker_similarity_block,
+                               [start for start, _ in blocks],
+                               [stop for _, stop in blocks],
+                               [top_k] * len(blocks))
+            for start, stop, block_ids, block_scores in results:
+                neighbor_ids[start:stop] = block_ids
+                neighbor_scores[start:stop] = block_scores
+    finally:
+        shutil.rmtree(share_dir, ignore_errors=True)
+    
+    return neighbor_ids, neighbor_scores
+
+def normalize_title(title):
+    """Normalize a title for case-insensitive lookups"""
+    return ' '.join(unicodedata.normalize('NFKC', str(title)).casefold().split())
+
+def build_lookup_index(movies):
+    """Map titles, normalized titles and movie ids to their row in the movie list"""
+    lookup = {'title': {}, 'normalized_title': {}, 'movie_id': {}}
+    
+    # The first row wins for duplicate titles, like the old boolean scans did
+    for row, (movie_id, title) in enumerate(zip(movies['movie_id'], movies['title'])):
+        lookup['title'].setdefault(str(title), row)
+        lookup['normalized_title'].setdefault(normalize_title(title), row)
+        lookup['movie_id'].setdefault(str(movie_id), row)
+    
+    return lookup
+
+def letter_bucket(title):
+    """Alphabetical browser bucket of a title: its first letter, or '#'"""
+    first = normalize_title(title)[:1].upper()
+    return first if first in LETTER_BUCKETS[:-1] else '#'
+
+def build_letter_index(titles):
+    """Rows sorted by bucket and title, and the (start, stop) range of each bucket in them"""
+    keys = [(LETTER_BUCKETS.index(letter_bucket(title)), normalize_title(title)) for title in titles]
+    rows = np.array(sorted(range(len(keys)), key=keys.__getitem__), dtype=np.int64)
+    
+    # Buckets are contiguous in sorted order, so their bounds are a search away
+    bucket_ids = np.array([keys[row][0] for row in rows], dtype=np.int64)
+    bounds = np.searchsorted(bucket_ids, np.arange(len(LETTER_BUCKETS) + 1))
+    ranges = {letter: (int(bounds[i]), int(bounds[i + 1])) for i, letter in enumerate(LETTER_BUCKETS)}
+    return {'rows': rows, 'ranges': ranges}
+
+def _replace_file(path, write):
+    """Write a file next to its destination and swap it in atomically"""
+    # Processes that still map the old file keep reading it until they reload
+    tmp_path = _spill_path(path)
+    with open(tmp_path, 'wb') as f:
+        write(f)
+    os.replace(tmp_path, path)
+
+def _save_array(path, array, dtype):
+    """Save an array as .npy, moving it into place if it was spilled there already"""
+    spill_path = os.path.abspath(_spill_path(path))
+    if isinstance(array, np.memmap) and array.filename == spill_path and array.dtype == dtype:
+        array.flush()
+        os.replace(spill_path, path)
+    else:
+        array = np.asarray(array, dtype=dtype)
+        _replace_file(path, lambda f: np.save(f, array))
+
+def _vectorizer_state(vectorizer):
+    """JSON-serializable settings and vocabulary of a fitted CountVectorizer"""
+    params = vectorizer.get_params()
+    # A vectorizer given a fixed vocabulary only gets vocabulary_ once it has transformed something
+    vocabulary = getattr(vectorizer, 'vocabulary_', None) or params['vocabulary']
+    return {
+        'params': {name: list(params[name]) if isinstance(params[name], tuple) else params[name]
+                   for name in VECTORIZER_PARAMS},
+        'vocabulary': {term: int(column) for term, column in vocabulary.items()}
+    }
+
+def _vectorizer_from_state(state):
+    """Rebuild a fitted CountVectorizer from its saved settings and vocabulary"""
+    params = dict(state['params'])
+    params['ngram_range'] = tuple(params['ngram_range'])
+    return CountVectorizer(vocabulary=state['vocabulary'], **params)
+
+def save_model(movies, neighbor_ids, neighbor_scores, model_dir=MODEL_PATH, vectorizer=None, features=None,
+               metadata=None):
+    """Save the movie list, the neighbor index arrays and the manifest
+    
+    Passing the fitted vectorizer and the feature vectors as well lets movies be
+    added later without rebuilding the whole model (see add_movies_to_model), lets
+    free-text queries be scored (see query_neighbors) and lets the neighbor index be
+    rebuilt without the raw data (see rebuild_neighbor_index). metadata is a
+    DataFrame of movie details (see movie_metadata.METADATA_FIELDS) aligned with
+    movies, saved as a columnar snapshot the app reads instead of calling APIs.
+    """
+    os.makedirs(model_dir, exist_ok=True)
+    
+    _replace_file(os.path.join(model_dir, MOVIE_LIST_FILE), lambda f: pickle.dump(movies, f))
+    _save_array(os.path.join(model_dir, NEIGHBOR_IDS_FILE), neighbor_ids, np.int32)
+    _save_array(os.path.join(model_dir, NEIGHBOR_SCORES_FILE), neighbor_scores, np.float16)
+    
+    lookup = build_lookup_index(movies)
+    _replace_file(os.path.join(model_dir, LOOKUP_INDEX_FILE),
+                  lambda f: f.write(json.dumps(lookup, ensure_ascii=False).encode('utf-8')))
+    
+    files = {
+        'movie_list': MOVIE_LIST_FILE,
+        'neighbor_ids': NEIGHBOR_IDS_FILE,
+        'neighbor_scores': NEIGHBOR_SCORES_FILE,
+        'lookup_index': LOOKUP_INDEX_FILE
+    }
+    
+    stale_files = list(LEGACY_FILES)
+    feature_info = None
+    if vectorizer is not None and features is not None:
+        state = _vectorizer_state(vectorizer)
+        features = normalize_vectors(features)
+        features.sort_indices()
+        _replace_file(os.path.join(model_dir, VECTORIZER_FILE),
+                      lambda f: f.write(json.dumps(state, ensure_ascii=False).encode('utf-8')))
+        # Uncompressed, so every process memory-maps the same pages instead of inflating a copy
+        for part, name in FEATURES_FILES.items():
+            array = getattr(features, part)
+            _save_array(os.path.join(model_dir, name), array, array.dtype)
+        files['vectorizer'] = VECTORIZER_FILE
+        files['features'] = dict(FEATURES_FILES)
+        feature_info = {
+            'version': FEATURES_VERSION,
+            'shape': [int(size) for size in features.shape],
+            'vocabulary_size': len(state['vocabulary']),
+            'nnz': int(features.nnz)
+        }
+    else:
+        # Features of an earlier build no longer match the movie list
+        stale_files += [VECTORIZER_FILE] + list(FEATURES_FILES.values())
+    
+    # The manifest goes last: a model is complete once it exists
+    manifest = {
+        'format_version': FORMAT_VERSION,
+        'movie_count': int(neighbor_ids.shape[0]),
+        'top_k': int(neighbor_ids.shape[1]),
+        'files': files
+    }
+    if feature_info:
+        manifest['features'] = feature_info
+    if metadata is not None:
+        manifest['metadata'] = save_metadata(metadata, model_dir)
+    _replace_file(os.path.join(model_dir, MANIFEST_FILE),
+                  lambda f: f.write(json.dumps(manifest, indent=2).encode('utf-8')))
+    
+    # Drop artifacts of older builds so they aren't shipped by mistake
+    for stale_file in stale_files:
+        stale_path = os.path.join(model_dir, stale_file)
+        if os.path.exists(stale_path):
+            os.remove(stale_path)
+    if metadata is None:
+        shutil.rmtree(os.path.join(model_dir, METADATA_DIR), ignore_errors=True)
+
+def model_exists(model_dir=MODEL_PATH):
+    """Check whether a saved model is available"""
+    return os.path.exists(os.path.join(model_dir, MOVIE_LIST_FILE)) and (
+        os.path.exists(os.path.join(model_dir, MANIFEST_FILE)) or
+        os.path.exists(os.path.join(model_dir, LEGACY_SIMILARITY_FILE))
+    )
+
+def model_signature(model_dir=MODEL_PATH):
+    """Identify the saved model by its files' modification times and sizes"""
+    signature = []
+    for name in [MANIFEST_FILE, MOVIE_LIST_FILE, NEIGHBOR_IDS_FILE, NEIGHBOR_SCORES_FILE,
+                 LOOKUP_INDEX_FILE, VECTORIZER_FILE, *FEATURES_FILES.values(), LEGACY_FEATURES_FILE,
+                 LEGACY_SIMILARITY_FILE]:
+        path = os.path.join(model_dir, name)
+        if os.path.exists(path):
+            stat = os.stat(path)
+            signature.append((name, stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+def load_manifest(model_dir=MODEL_PATH):
+    """Load the model manifest"""
+    with open(os.path.join(model_dir, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def _load_legacy_neighbors(model_dir, movie_count):
+    """Reduce the dense similarity matrix of an older build to a neighbor index"""
+    with open(os.path.join(model_dir, LEGACY_SIMILARITY_FILE), 'rb') as f:
+        similarity = np.array(pickle.load(f), dtype=np.float64)
+    np.fill_diagonal(similarity, -np.inf)
+    top_k = max(0, min(NEIGHBOR_COUNT, movie_count - 1))
+    return _top_k_from_similarity(similarity, top_k)
+
+def load_model(model_dir=MODEL_PATH):
+    """Load the movie list and memory-map the neighbor index"""
+    with open(os.path.join(model_dir, MOVIE_LIST_FILE), 'rb') as f:
+        movies = pickle.load(f)
+    
+    if not os.path.exists(os.path.join(model_dir, MANIFEST_FILE)):
+        neighbor_ids, neighbor_scores = _load_legacy_neighbors(model_dir, len(movies))
+        return {
+            'movies': movies,
+            'neighbor_ids': neighbor_ids,
+            'neighbor_scores': neighbor_scores,
+            'lookup': build_lookup_index(movies),
+            'letters': build_letter_index(movies['title']),
+            'vectorizer': None,
+            'features': None,
+            'metadata': None
+        }
+    
+    manifest = load_manifest(model_dir)
+    if manifest.get('format_version') != FORMAT_VERSION:
+        raise ValueError(f"Unsupported model format version: {manifest.get('format_version')}")
+    
+    # Read-only maps: pages are shared between processes and loaded on first access
+    files = manifest['files']
+    neighbor_ids = np.load(os.path.join(model_dir, files['neighbor_ids']), mmap_mode='r')
+    neighbor_scores = np.load(os.path.join(model_dir, files['neighbor_scores']), mmap_mode='r')
+    
+    if neighbor_ids.shape[0] != len(movies) or neighbor_scores.shape != neighbor_ids.shape:
+        raise ValueError("Model files are out of sync, please rebuild the model")
+    
+    lookup_file = files.get('lookup_index')
+    if lookup_file and os.path.exists(os.path.join(model_dir, lookup_file)):
+        with open(os.path.join(model_dir, lookup_file), 'r', encoding='utf-8') as f:
+            lookup = json.load(f)
+    else:
+        lookup = build_lookup_index(movies)
+    
+    # Needed for free-text queries and incremental updates; older models have none
+    vectorizer, features = load_features(model_dir, manifest)
+    
+    metadata = None
+    if 'metadata' in manifest and manifest['metadata']['rows'] == len(movies):
+        metadata = MovieMetadata(model_dir, manifest['metadata'])
+    
+    return {
+        'movies': movies,
+        'neighbor_ids': neighbor_ids,
+        'neighbor_scores': neighbor_scores,
+        'lookup': lookup,
+        'letters': build_letter_index(movies['title']),
+        'vectorizer': vectorizer,
+        'features': features,
+        'metadata': metadata
+    }
+
+def load_features(model_dir=MODEL_PATH, manifest=None):
+    """Load the saved vectorizer and memory-map the normalized feature vectors, or (None, None) if the model has none"""
+    if manifest is None:
+        if not os.path.exists(os.path.join(model_dir, MANIFEST_FILE)):
+            return None, None
+        manifest = load_manifest(model_dir)
+    
+    files = manifest['files']
+    if 'vectorizer' not in files or 'features' not in files:
+        return None, None
+    if manifest.get('features', {}).get('version') != FEATURES_VERSION:
+        return None, None
+    
+    with open(os.path.join(model_dir, files['vectorizer']), 'r', encoding='utf-8') as f:
+        vectorizer = _vectorizer_from_state(json.load(f))
+    if isinstance(files['features'], dict):
+        # Memory-mapped like the neighbor index, pages shared between processes
+        paths = {part: os.path.join(model_dir, name) for part, name in files['features'].items()}
+        features = _open_shared_matrix(paths, tuple(manifest['features']['shape']))
+    else:
+        # Compressed single file of older builds
+        features = sparse.load_npz(os.path.join(model_dir, files['features'])).tocsr()
+    if features.shape[0] != manifest['movie_count']:
+        return None, None
+    return vectorizer, features
+
+def query_neighbors(model, text, k):
+    """Ids and similarity scores of the k movies closest to a free-text query, best first"""
+    features = model.get('features')
+    if features is None:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float32)
+    
+    query = normalize_vectors(model['vectorizer'].transform([str(text)]))
+    scores = (features @ query.T).toarray().ravel()
+    positions = top_k_indices(scores, k)
+    # Queries sharing no words with the vocabulary score zero everywhere
+    positions = positions[scores[positions] > 0]
+    return positions, scores[positions].astype(np.float32)
+
+def rebuild_neighbor_index(model_dir=MODEL_PATH, top_k=NEIGHBOR_COUNT, block_size=SIMILARITY_BLOCK_ROWS, workers=1):
+    """Recompute the neighbor index from the saved features, without the raw datasets"""
+    vectorizer, features = load_features(model_dir)
+    if vectorizer is None:
+        return False
+    
+    model = load_model(model_dir)
+    movies = model['movies']
+    metadata = model['metadata'].to_frame() if model['metadata'] is not None else None
+    del model
+    
+    neighbor_ids, neighbor_scores = build_neighbor_index(features, top_k=top_k, block_size=block_size,
+                                                         spill_dir=model_dir, workers=workers)
+    save_model(movies, neighbor_ids, neighbor_scores, model_dir, vectorizer=vectorizer, features=features,
+               metadata=metadata)
+    return True
+
+def _merge_neighbors(neighbor_ids, neighbor_scores, candidate_ids, candidate_scores, top_k):
+    """Keep the top_k best of the current neighbors and some new candidates, row by row"""
+    merged_ids = np.concatenate([np.asarray(neighbor_ids, dtype=np.int32), candidate_ids], axis=1)
+    merged_scores = np.concatenate([np.asarray(neighbor_scores, dtype=np.float32), candidate_scores], axis=1)
+    positions = top_k_indices(merged_scores, top_k)
+    return (np.take_along_axis(merged_ids, positions, axis=1),
+            np.take_along_axis(merged_scores, positions, axis=1).astype(np.float16))
+
+def add_movies_to_model(new_movies, model_dir=MODEL_PATH, block_size=SIMILARITY_BLOCK_ROWS):
+    """Append movies to a saved model without re-fitting the vectorizer or rebuilding the index
+    
+    new_movies needs 'movie_id', 'title' and 'tags' columns, and may have metadata
+    columns (genres, overview, ...) for the snapshot. Only the new rows are
+    vectorized, with the saved vocabulary (words outside it are ignored), and only
+    their similarities to the catalog are computed: O(new x N) instead of O(N^2).
+    Existing movies pick up a new movie as neighbor if it beats their current ones.
+    Returns False, without changing anything, if the model has no saved features.
+    """
+    model = load_model(model_dir)
+    vectorizer, features = model['vectorizer'], model['features']
+    if vectorizer is None:
+        return False
+    old_count = len(model['movies'])
+    
+    new_features = normalize_vectors(vectorizer.transform(new_movies['tags']))
+    all_features = sparse.vstack([features, new_features], format='csr')
+    movie_count = all_features.shape[0]
+    
+    # Existing rows can only gain the new movies, so their lists grow only if they held the whole catalog
+    current_k = model['neighbor_ids'].shape[1]
+    top_k = current_k
+    if current_k == old_count - 1:
+        top_k = max(current_k, min(NEIGHBOR_COUNT, movie_count - 1))
+    block_size = max(1, int(block_size))
+    
+    # Existing movies: merge in the new movies where they rank among the top_k
+    neighbor_ids = np.empty((movie_count, top_k), dtype=np.int32)
+    neighbor_scores = np.empty((movie_count, top_k), dtype=np.float16)
+    new_features_t = new_features.T.tocsr()
+    new_ids = np.arange(old_count, movie_count, dtype=np.int32)
+    for start in range(0, old_count, block_size):
+        stop = min(start + block_size, old_count)
+        candidate_scores = (features[start:stop] @ new_features_t).toarray().astype(np.float32)
+        candidate_ids = np.broadcast_to(new_ids, candidate_scores.shape)
+        neighbor_ids[start:stop], neighbor_scores[start:stop] = _merge_neighbors(
+            model['neighbor_ids'][start:stop], model['neighbor_scores'][start:stop],
+            candidate_ids, candidate_scores, top_k)
+    
+    # New movies: full top_k against the whole catalog
+    all_features_t = all_features.T.tocsr()
+    for start in range(old_count, movie_count, block_size):
+        stop = min(start + block_size, movie_count)
+        neighbor_ids[start:stop], neighbor_scores[start:stop] = _similarity_block(
+            all_features, all_features_t, start, stop, top_k)
+    
+    movies = pd.concat([model['movies'], new_movies.reindex(columns=model['movies'].columns)], ignore_index=True)
+    metadata = None
+    if model['metadata'] is not None:
+        metadata = pd.concat([model['metadata'].to_frame(), new_movies.reindex(columns=METADATA_FIELDS)],
+                             ignore_index=True)
+    del model
+    save_model(movies, neighbor_ids, neighbor_scores, model_dir, vectorizer=vectorizer, features=all_features,
+               metadata=metadata)
+    return True
+
+def update_model_with_new_movies(new_movies, model_dir=MODEL_PATH):
+    """Add movies (dicts of title, overview, genres, keywords, cast and crew) to a saved model
+    
+    The neighbor index is patched with add_movies_to_model; models saved without
+    feature vectors are re-vectorized and rebuilt once. The metadata snapshot is
+    carried over either way. Raises FileNotFoundError if there is no saved model.
+    """
+    model = load_model(model_dir)
+    movie_list = model['movies']
+    metadata = model['metadata'].to_frame() if model['metadata'] is not None else None
+    del model
+    
+    # Same format as the existing movies, tags combining all features
+    new_rows = []
+    for movie in new_movies:
+        tags = []
+        if movie['overview']:
+            tags.extend(movie['overview'].split())
+        tags.extend(movie['genres'])
+        tags.extend(movie['keywords'])
+        tags.extend(movie['cast'])
+        tags.extend(movie['crew'])
+        
+        new_rows.append({
+            'movie_id': f"custom_{len(movie_list) + len(new_rows) + 1}",
+            'title': movie['title'],
+            'tags': ' '.join(tags),
+            'genres': movie['genres'],
+            'overview': movie['overview']
+        })
+    new_rows = pd.DataFrame(new_rows, columns=['movie_id', 'title', 'tags', 'genres', 'overview'])
+    
+    if add_movies_to_model(new_rows, model_dir):
+        return True
+    
+    # Models built before features were saved need one full rebuild
+    movie_list = pd.concat([movie_list, new_rows.reindex(columns=movie_list.columns)], ignore_index=True)
+    if metadata is not None:
+        metadata = pd.concat([metadata, new_rows.reindex(columns=METADATA_FIELDS)], ignore_index=True)
+    cv = CountVectorizer(max_features=5000, stop_words='english')
+    vector = cv.fit_transform(movie_list['tags'])
+    neighbor_ids, neighbor_scores = build_neighbor_index(vector, spill_dir=model_dir)
+    save_model(movie_list, neighbor_ids, neighbor_scores, model_dir, vectorizer=cv, features=vector,
+               metadata=metadata)
+    return True
+
+def find_movie_row(model, title):
+    """Row of a movie by exact title, falling back to its normalized title"""
+    lookup = model['lookup']
+    row = lookup['title'].get(str(title))
+    if row is None:
+        row = lookup['normalized_title'].get(normalize_title(title))
+    return row
+
+def find_movie_row_by_id(model, movie_id):
+    """Row of a movie by its movie id"""
+    return model['lookup']['movie_id'].get(str(movie_id))
+
+def get_movie_metadata(model, index):
+    """Details of a movie from the model's metadata snapshot, or None if it has none"""
+    if model.get('metadata') is None:
+        return None
+    return model['metadata'].get_details(index) or None
+
+def filter_mask(model, **filters):
+    """Boolean mask of the movies matching the filters (see MovieMetadata.filter_mask), or None without metadata"""
+    if model.get('metadata') is None:
+        return None
+    return model['metadata'].filter_mask(**filters)
+
+def letter_counts(model, mask=None):
+    """Number of movies in every alphabetical bucket, counting only the movies allowed by mask"""
+    ranges = model['letters']['ranges']
+    if mask is None:
+        return {letter: stop - start for letter, (start, stop) in ranges.items()}
+    
+    # Running count of allowed movies in sorted order; a bucket's count is the difference at its bounds
+    allowed = np.concatenate([[0], np.cumsum(mask[model['letters']['rows']])])
+    return {letter: int(allowed[stop] - allowed[start]) for letter, (start, stop) in ranges.items()}
+
+def letter_rows(model, letter, mask=None):
+    """Rows of the movies in an alphabetical bucket, sorted by title, among the movies allowed by mask"""
+    start, stop = model['letters']['ranges'][letter]
+    rows = model['letters']['rows'][start:stop]
+    return rows[mask[rows]] if mask is not None else rows
+
+def get_neighbors(model, index, k):
+    """Ids and similarity scores of a movie's k nearest neighbors, best first"""
+    # Rows are sorted at build time, so this only reads k entries
+    neighbor_ids = np.asarray(model['neighbor_ids'][index][:k], dtype=np.intp)
+    neighbor_scores = np.asarray(model['neighbor_scores'][index][:k], dtype=np.float32)
+    return neighbor_ids, neighbor_scores
+
+def get_filtered_neighbors(model, index, k, mask):
+    """Ids and similarity scores of a movie's k nearest neighbors among the movies allowed by mask, best first
+    
+    The precomputed neighbors are used while enough of them pass the mask. When
+    they run out, the movie is scored against the whole catalog with the saved
+    features, a single sparse row product.
+    """
+    if mask is None:
+        return get_neighbors(model, index, k)
+    
+    neighbor_ids = np.asarray(model['neighbor_ids'][index], dtype=np.intp)
+    neighbor_scores = np.asarray(model['neighbor_scores'][index], dtype=np.float32)
+    allowed = mask[neighbor_ids]
+    # A neighbor list covering the whole catalog can't run out
+    complete = len(neighbor_ids) >= len(mask) - 1
+    if allowed.sum() >= k or complete or model.get('features') is None:
+        return neighbor_ids[allowed][:k], neighbor_scores[allowed][:k]
+    
+    features = model['features']
+    scores = (features @ features[index].T).toarray().ravel()
+    scores[~mask] = -np.inf
+    scores[index] = -np.inf
+    positions = top_k_indices(scores, k)
+    positions = positions[np.isfinite(scores[positions])]
+    return positions, scores[positions].astype(np.float32)
@@ -0,0 +1,120 @@
+"""
+Movie Links - Curated trailer and streaming tables
+Loaded once per process from a JSON data file into read-only tables indexed by
+exact and normalized title, so a lookup is a hash probe instead of a scan
+"""
+
+import json
+import os
+from types import MappingProxyType
+from title_matcher import TitleMatcher, normalize_for_matching, TITLE_MATCH_THRESHOLD
+
+try:
+    from config import MOVIE_LINKS_FILE
+except ImportError:
+    # Fallback to default values if config.py can't be imported
+    MOVIE_LINKS_FILE = "data/movie_links.json"
+
+# Bumped whenever the layout of the data file changes
+FORMAT_VERSION = 1
+
+# Relative paths are relative to this module, not to the directory the app is started from
+if not os.path.isabs(MOVIE_LINKS_FILE):
+    MOVIE_LINKS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), MOVIE_LINKS_FILE)
+
+def _freeze(value):
+    """Read-only copy of a JSON value: dicts become mapping proxies, lists tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+class LinkTable:
+    """Read-only title -> value table with exact, normalized and closest-title lookups"""
+
+    def __init__(self, entries):
+        self.entries = _freeze(dict(entries))
+
+        # Normalized title -> first title with it
+        normalized = {}
+        for title in self.entries:
+            normalized.setdefault(normalize_for_matching(title), title)
+        self.normalized = MappingProxyType(normalized)
+        self._matcher = None
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, title):
+        return title in self.entries
+
+    @property
+    def matcher(self):
+        """Title matcher of the table, built on the first fuzzy lookup"""
+        if self._matcher is None:
+            self._matcher = TitleMatcher(self.entries)
+        return self._matcher
+
+    def get(self, title, default=None):
+        """Value of a title, exactly or once normalized ("schindlers list" finds "Schindler's List")"""
+        if title in self.entries:
+            return self.entries[title]
+        key = self.normalized.get(normalize_for_matching(title))
+        return self.entries[key] if key is not None else default
+
+    def match(self, title, threshold=TITLE_MATCH_THRESHOLD):
+        """Value of the title, else of the closest title scoring at least threshold, else None"""
+        value = self.get(title)
+        if value is not None:
+            return value
+        key = self.matcher.best_match(title, threshold)
+        return self.entries[key] if key is not None else None
+
+class TitleSet:
+    """Read-only set of titles, also found as whole words inside longer titles"""
+
+    def __init__(self, titles):
+        # Duplicates are dropped, the first occurrence keeps its place
+        self.titles = tuple(dict.fromkeys(str(title) for title in titles))
+        self.normalized = frozenset(normalize_for_matching(title) for title in self.titles)
+        self._matcher = None
+
+    def __len__(self):
+        return len(self.titles)
+
+    def __contains__(self, title):
+        return normalize_for_matching(title) in self.normalized
+
+    def find_in(self, title, threshold=TITLE_MATCH_THRESHOLD):
+        """Title of the set a title refers to ("toy story" for "Toy Story 3"), scored like LinkTable.match, or None"""
+        if self._matcher is None:
+            self._matcher = TitleMatcher(self.titles)
+        return self._matcher.best_match(title, threshold)
+
+def load_movie_links(path=MOVIE_LINKS_FILE):
+    """Load the curated tables; raises FileNotFoundError if the data file is missing"""
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Movie links file not found: {path}")
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if data.get('format_version') != FORMAT_VERSION:
+        raise ValueError(f"Unsupported movie links format version: {data.get('format_version')}")
+
+    return {
+        'trailer_urls': LinkTable(data.get('trailer_urls', {})),
+        'comprehensive_trailer_urls': LinkTable(data.get('comprehensive_trailer_urls', {})),
+        'common_trailer_ids': LinkTable(data.get('common_trailer_ids', {})),
+        'streaming_services': LinkTable(data.get('streaming_services', {})),
+        'disney_titles': TitleSet(data.get('disney_titles', [])),
+        'netflix_titles': TitleSet(data.get('netflix_titles', []))
+    }
+
+# Loaded once when first imported; Streamlit reruns reuse the module
+_links = load_movie_links()
+TRAILER_URLS = _links['trailer_urls']
+COMPREHENSIVE_TRAILER_URLS = _links['comprehensive_trailer_urls']
+COMMON_TRAILER_IDS = _links['common_trailer_ids']
+STREAMING_SERVICES = _links['streaming_services']
+DISNEY_TITLES = _links['disney_titles']
+NETFLIX_TITLES = _links['netflix_titles']
@@ -0,0 +1,198 @@
+"""
+Movie Metadata - Columnar snapshot of movie details saved with the model
+One .npy file per column, memory-mapped and indexed by movie row, so details
+of catalog movies are served without any network request
+"""
+
+import os
+from collections import Counter
+import numpy as np
+import pandas as pd
+
+try:
+    from config import METADATA_DIR
+except ImportError:
+    # Fallback to default values if config.py can't be imported
+    METADATA_DIR = "metadata"
+
+# Snapshot fields, named like the movie details of the movie service
+NUMERIC_COLUMNS = ['runtime', 'vote_average', 'vote_count']
+TEXT_COLUMNS = ['original_language', 'release_date', 'overview']
+METADATA_FIELDS = ['genres'] + NUMERIC_COLUMNS + TEXT_COLUMNS
+
+# Genres are stored as one bit each in a uint64 per movie
+MAX_GENRES = 64
+
+# Runtime buckets, as shown by the app's runtime filter; -1 is unknown
+RUNTIME_BUCKETS = ["Short (<90 min)", "Medium (90-120 min)", "Long (>120 min)"]
+
+def runtime_buckets(runtimes):
+    """Runtime bucket of every runtime: 0 short (<90), 1 medium (90-120), 2 long (>120), -1 unknown"""
+    runtimes = np.asarray(runtimes, dtype=np.float32)
+    buckets = np.select([runtimes < 90, runtimes <= 120, runtimes > 120], [0, 1, 2], default=-1)
+    return buckets.astype(np.int8)
+
+def release_years(release_dates):
+    """Year of every release date ('1994-09-23' or '1994'), 0 if unknown"""
+    years = pd.to_numeric(pd.Series(release_dates, dtype=object).astype(str).str[:4], errors='coerce')
+    return years.fillna(0).to_numpy(dtype=np.int16)
+
+def _encode_categories(values):
+    """Code of every value and the value of each code, most frequent first; -1 is unknown"""
+    known = [None if _is_missing(value) else str(value) for value in values]
+    names = [name for name, _ in Counter(value for value in known if value is not None).most_common()]
+    code_of = {name: code for code, name in enumerate(names)}
+    codes = np.array([code_of.get(value, -1) for value in known], dtype=np.int16)
+    return codes, names
+
+def _is_missing(value):
+    """Whether a metadata value is unknown"""
+    return value is None or (isinstance(value, float) and np.isnan(value)) or value == ''
+
+def _write_array(path, array):
+    """Save an array as .npy next to its destination and swap it in atomically"""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        np.save(f, array)
+    os.replace(tmp_path, path)
+
+def _encode_text(values):
+    """Pack strings into one UTF-8 byte array plus row offsets, both memory-mappable"""
+    encoded = [b'' if _is_missing(value) else str(value).encode('utf-8') for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    data = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+    return data, offsets
+
+def _encode_genres(values):
+    """Genre bitset of every movie and the genre name of each bit, most frequent genres first"""
+    genre_lists = [list(genres) if isinstance(genres, (list, tuple)) else [] for genres in values]
+    counts = Counter(genre for genres in genre_lists for genre in genres)
+    names = [name for name, _ in counts.most_common(MAX_GENRES)]
+    bit_of = {name: 1 << position for position, name in enumerate(names)}
+
+    bits = np.zeros(len(genre_lists), dtype=np.uint64)
+    for row, genres in enumerate(genre_lists):
+        bits[row] = sum(bit_of.get(genre, 0) for genre in set(genres))
+    return bits, names
+
+def save_metadata(metadata, model_dir):
+    """Write the metadata columns of a DataFrame (rows aligned with the movie list), return their manifest entry"""
+    directory = os.path.join(model_dir, METADATA_DIR)
+    os.makedirs(directory, exist_ok=True)
+    row_count = len(metadata)
+
+    for column in NUMERIC_COLUMNS:
+        if column in metadata:
+            values = pd.to_numeric(metadata[column], errors='coerce').to_numpy(dtype=np.float32)
+        else:
+            values = np.full(row_count, np.nan, dtype=np.float32)
+        _write_array(os.path.join(directory, f"{column}.npy"), values)
+
+    for column in TEXT_COLUMNS:
+        values = metadata[column] if column in metadata else [None] * row_count
+        data, offsets = _encode_text(values)
+        _write_array(os.path.join(directory, f"{column}.npy"), data)
+        _write_array(os.path.join(directory, f"{column}_offsets.npy"), offsets)
+
+    bits, genre_names = _encode_genres(metadata['genres'] if 'genres' in metadata else [None] * row_count)
+    _write_array(os.path.join(directory, "genres.npy"), bits)
+
+    # Indexed columns for filtering the catalog with vectorized masks
+    language_codes, languages = _encode_categories(
+        metadata['original_language'] if 'original_language' in metadata else [None] * row_count)
+    _write_array(os.path.join(directory, "language_code.npy"), language_codes)
+    runtimes = pd.to_numeric(metadata['runtime'], errors='coerce') if 'runtime' in metadata else [np.nan] * row_count
+    _write_array(os.path.join(directory, "runtime_bucket.npy"), runtime_buckets(runtimes))
+    _write_array(os.path.join(directory, "year.npy"),
+                 release_years(metadata['release_date'] if 'release_date' in metadata else [None] * row_count))
+
+    return {'dir': METADATA_DIR, 'rows': row_count, 'genres': genre_names, 'languages': languages}
+
+class MovieMetadata:
+    """Read-only view of the metadata snapshot of a saved model"""
+
+    def __init__(self, model_dir, info):
+        directory = os.path.join(model_dir, info['dir'])
+        self.row_count = info['rows']
+        self.genre_names = list(info['genres'])
+        self.languages = list(info['languages'])
+
+        def load(name):
+            return np.load(os.path.join(directory, f"{name}.npy"), mmap_mode='r')
+
+        self.columns = {column: load(column) for column in NUMERIC_COLUMNS}
+        self.text = {column: (load(column), load(f"{column}_offsets")) for column in TEXT_COLUMNS}
+        self.genre_bits = load("genres")
+        self.language_codes = load("language_code")
+        self.runtime_buckets = load("runtime_bucket")
+        self.years = load("year")
+
+    def __len__(self):
+        return self.row_count
+
+    def get_text(self, column, row):
+        """Text value of a movie, or None if unknown"""
+        data, offsets = self.text[column]
+        start, stop = offsets[row], offsets[row + 1]
+        return bytes(data[start:stop]).decode('utf-8') if stop > start else None
+
+    def get_genres(self, row):
+        """Genre names of a movie"""
+        bits = int(self.genre_bits[row])
+        return [name for position, name in enumerate(self.genre_names) if bits >> position & 1]
+
+    def get_details(self, row):
+        """Known details of a movie, keyed like the movie service's details"""
+        details = {}
+        genres = self.get_genres(row)
+        if genres:
+            details['genres'] = genres
+
+        for column in NUMERIC_COLUMNS:
+            value = float(self.columns[column][row])
+            if not np.isnan(value):
+                details[column] = round(value, 1) if column == 'vote_average' else int(value)
+
+        for column in TEXT_COLUMNS:
+            value = self.get_text(column, row)
+            if value is not None:
+                details[column] = value
+        return details
+
+    def filter_mask(self, languages=None, runtime_bucket=None, genres=None, year_range=None):
+        """Boolean mask of the movies matching every given filter
+        
+        languages: language codes, any of them matches; runtime_bucket: index in
+        RUNTIME_BUCKETS; genres: genre names, all of them must match; year_range:
+        (first, last) release years, inclusive. Movies with an unknown value don't
+        match a filter on it.
+        """
+        mask = np.ones(self.row_count, dtype=bool)
+
+        if languages:
+            codes = [self.languages.index(language) for language in languages if language in self.languages]
+            mask &= np.isin(self.language_codes, codes)
+
+        if runtime_bucket is not None:
+            mask &= self.runtime_buckets == runtime_bucket
+
+        if genres:
+            if any(genre not in self.genre_names for genre in genres):
+                return np.zeros(self.row_count, dtype=bool)
+            required = np.uint64(sum(1 << self.genre_names.index(genre) for genre in genres))
+            mask &= (self.genre_bits & required) == required
+
+        if year_range is not None:
+            first, last = year_range
+            mask &= (self.years >= first) & (self.years <= last)
+
+        return mask
+
+    def to_frame(self):
+        """All metadata as a DataFrame, e.g. to append movies and save it again"""
+        frame = pd.DataFrame({column: np.asarray(self.columns[column]) for column in NUMERIC_COLUMNS})
+        for column in TEXT_COLUMNS:
+            frame[column] = [self.get_text(column, row) for row in range(self.row_count)]
+        frame['genres'] = [self.get_genres(row) for row in range(self.row_count)]
+        return frame[METADATA_FIELDS]
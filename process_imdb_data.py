@@ -1,9 +1,8 @@
 import pandas as pd
-import pickle
 import os
 import gzip
 from sklearn.feature_extraction.text import CountVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from model_store import build_neighbor_index, save_model, MODEL_PATH
 
 def process_imdb_data():
     """Process the downloaded IMDB data"""
@@ -73,23 +72,19 @@ def create_model_from_movies(movies_df):
     """Create the recommendation model from movies dataframe"""
     print("Creating recommendation model...")
     
-    # Create feature vectors
+    # Create sparse feature vectors
     cv = CountVectorizer(max_features=5000, stop_words='english')
-    vector = cv.fit_transform(movies_df['tags']).toarray()
+    vector = cv.fit_transform(movies_df['tags'])
     
     print(f"Feature vector shape: {vector.shape}")
     
-    # Calculate cosine similarity
-    print("Calculating cosine similarity...")
-    similarity = cosine_similarity(vector)
-    
-    # Create model directory
-    os.makedirs('model', exist_ok=True)
+    # Keep only the most similar movies for each movie, spilling to disk
+    print("Building top-K neighbor index...")
+    neighbor_ids, neighbor_scores = build_neighbor_index(vector, spill_dir=MODEL_PATH)
     
     # Save the model files
     print("Saving model files...")
-    pickle.dump(movies_df, open('model/movie_list.pkl', 'wb'))
-    pickle.dump(similarity, open('model/similarity.pkl', 'wb'))
+    save_model(movies_df, neighbor_ids, neighbor_scores, vectorizer=cv, features=vector)
     
     print("✅ Model created successfully!")
     print(f"Total movies in system: {len(movies_df)}")
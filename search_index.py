@@ -0,0 +1,146 @@
+"""
+Search Index - In-memory title search for the search box and the collections
+Prefix matches come from sorted arrays of titles and words, substring and
+misspelled matches from a trigram inverted index
+"""
+
+from bisect import bisect_left
+from collections import defaultdict
+import numpy as np
+from model_store import normalize_title
+
+try:
+    from config import SEARCH_RESULT_COUNT, SEARCH_MIN_SIMILARITY
+except ImportError:
+    # Fallback to default values if config.py can't be imported
+    SEARCH_RESULT_COUNT = 20
+    SEARCH_MIN_SIMILARITY = 0.3
+
+# Sorts after every character a normalized title can contain, closing prefix ranges
+_PREFIX_END = '\U0010ffff'
+
+def trigrams(text):
+    """Distinct three-character substrings of a normalized text, padded so word starts and ends count"""
+    padded = f" {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class TitleSearchIndex:
+    """Ranked title search: exact title, title prefix, word prefix, substring, then closest spellings"""
+
+    def __init__(self, titles):
+        self.titles = [str(title) for title in titles]
+        self.keys = [normalize_title(title) for title in self.titles]
+
+        # Sorted titles and sorted words, each with the row it came from
+        title_order = sorted(range(len(self.keys)), key=self.keys.__getitem__)
+        self.sorted_keys = [self.keys[row] for row in title_order]
+        self.sorted_key_rows = np.array(title_order, dtype=np.int64)
+
+        words = sorted((word, row) for row, key in enumerate(self.keys) for word in set(key.split()))
+        self.sorted_words = [word for word, _ in words]
+        self.sorted_word_rows = np.array([row for _, row in words], dtype=np.int64)
+
+        # Trigram -> rows containing it, ascending
+        postings = defaultdict(list)
+        self.trigram_counts = np.zeros(len(self.keys), dtype=np.int32)
+        for row, key in enumerate(self.keys):
+            grams = trigrams(key)
+            self.trigram_counts[row] = len(grams)
+            for gram in grams:
+                postings[gram].append(row)
+        self.postings = {gram: np.array(rows, dtype=np.int64) for gram, rows in postings.items()}
+
+    def __len__(self):
+        return len(self.titles)
+
+    def _prefix_rows(self, sorted_values, sorted_rows, prefix):
+        """Rows whose sorted value starts with prefix, in sorted order"""
+        start = bisect_left(sorted_values, prefix)
+        stop = bisect_left(sorted_values, prefix + _PREFIX_END, lo=start)
+        return sorted_rows[start:stop]
+
+    def _substring_candidates(self, query):
+        """Rows holding every trigram of the query, a superset of the titles containing it"""
+        padded = f" {query} "
+        grams = {padded[i:i + 3] for i in range(1, len(padded) - 3)}
+        if not grams:
+            # One or two characters: no inner trigram, every title is a candidate
+            return np.arange(len(self.keys))
+        lists = [self.postings.get(gram) for gram in grams]
+        if any(rows is None for rows in lists):
+            return np.empty(0, dtype=np.int64)
+        lists.sort(key=len)
+        rows = lists[0]
+        for other in lists[1:]:
+            rows = np.intersect1d(rows, other, assume_unique=True)
+            if len(rows) == 0:
+                break
+        return rows
+
+    def _similar_rows(self, query, limit, min_similarity, allowed=None):
+        """Rows of the titles sharing the most trigrams with the query (Dice coefficient), best first
+
+        allowed is an optional boolean mask of rows, applied before the best ones are picked.
+        """
+        grams = trigrams(query)
+        lists = [self.postings[gram] for gram in grams if gram in self.postings]
+        if not lists:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+
+        shared = np.bincount(np.concatenate(lists), minlength=len(self.keys))
+        if allowed is not None:
+            shared[~np.asarray(allowed, dtype=bool)] = 0
+        candidates = np.flatnonzero(shared)
+        similarity = 2.0 * shared[candidates] / (len(grams) + self.trigram_counts[candidates])
+        keep = similarity >= min_similarity
+        candidates, similarity = candidates[keep], similarity[keep]
+
+        if len(candidates) > limit:
+            best = np.argpartition(-similarity, limit - 1)[:limit]
+            candidates, similarity = candidates[best], similarity[best]
+        order = np.argsort(-similarity, kind='stable')
+        return candidates[order], similarity[order]
+
+    def search(self, query, limit=SEARCH_RESULT_COUNT, allowed=None, min_similarity=SEARCH_MIN_SIMILARITY):
+        """Rows of the best matching titles, at most limit; allowed is an optional boolean mask of rows
+
+        Matches are ranked by kind (exact title, title prefix, word prefix, substring,
+        similar spelling); title prefixes are alphabetical, word prefixes by matching
+        word, substrings in list order and misspellings by similarity.
+        """
+        query = normalize_title(query)
+        if not query or limit <= 0:
+            return []
+
+        results = []
+        seen = set()
+
+        def collect(rows):
+            for row in rows:
+                row = int(row)
+                if row in seen or (allowed is not None and not allowed[row]):
+                    continue
+                seen.add(row)
+                results.append(row)
+                if len(results) >= limit:
+                    return True
+            return False
+
+        # An exact title sorts first among the titles starting with the query
+        if collect(self._prefix_rows(self.sorted_keys, self.sorted_key_rows, query)):
+            return results
+
+        if collect(self._prefix_rows(self.sorted_words, self.sorted_word_rows, query)):
+            return results
+
+        candidates = self._substring_candidates(query)
+        if collect(row for row in candidates if query in self.keys[row]):
+            return results
+
+        similar, _ = self._similar_rows(query, limit + len(results), min_similarity, allowed)
+        collect(similar)
+        return results
+
+    def search_titles(self, query, limit=SEARCH_RESULT_COUNT, allowed=None, min_similarity=SEARCH_MIN_SIMILARITY):
+        """Titles of the best matches, see search()"""
+        return [self.titles[row] for row in self.search(query, limit, allowed, min_similarity)]
@@ -0,0 +1,76 @@
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+import metadata_cache
+from config import CACHE_FALLBACK_TTL, CIRCUIT_FAILURE_THRESHOLD
+
+OMDB_DETAILS = {'poster_path': 'https://example.com/poster.jpg', 'vote_average': 7.9, 'genres': ['Drama']}
+
+class FakeClock:
+    """Stand-in for time.time and time.monotonic, moved by hand"""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(metadata_cache, 'time', SimpleNamespace(time=fake, monotonic=fake))
+    return fake
+
+@pytest.fixture
+def service(tmp_path, monkeypatch, clock):
+    # The on-disk caches, including the module's shared service, go to a fresh directory
+    monkeypatch.chdir(tmp_path)
+    from enhanced_movie_service import EnhancedMovieService
+    service = EnhancedMovieService()
+    yield service
+    service.executor.shutdown(wait=False)
+
+def omdb_down(movie_title, movie_id=None):
+    raise requests.ConnectionError("omdb is down")
+
+def test_fallback_details_expire_soon(service, clock):
+    service._try_omdb_api = omdb_down
+    fallback = service.get_movie_details("Some Obscure Film")
+    assert fallback['poster_path'] != OMDB_DETAILS['poster_path']
+
+    # Once the API is back, the placeholder is replaced within CACHE_FALLBACK_TTL
+    service._try_omdb_api = lambda movie_title, movie_id=None: dict(OMDB_DETAILS)
+    assert service.get_movie_details("Some Obscure Film") == fallback
+    clock.advance(CACHE_FALLBACK_TTL)
+    assert service.get_movie_details("Some Obscure Film") == OMDB_DETAILS
+
+def test_api_details_are_kept(service, clock):
+    service._try_omdb_api = lambda movie_title, movie_id=None: dict(OMDB_DETAILS)
+    assert service.get_movie_details("Some Obscure Film") == OMDB_DETAILS
+
+    service._try_omdb_api = omdb_down
+    clock.advance(CACHE_FALLBACK_TTL)
+    assert service.get_movie_details("Some Obscure Film") == OMDB_DETAILS
+
+def test_open_breaker_skips_the_api(service):
+    calls = []
+
+    def _try_omdb_api(movie_title, movie_id=None):
+        calls.append(movie_title)
+        raise requests.Timeout("omdb timed out")
+
+    service._try_omdb_api = _try_omdb_api
+    assert service.source_health()['_try_omdb_api'] == 'closed'
+    for number in range(CIRCUIT_FAILURE_THRESHOLD):
+        service.get_movie_details(f"Unknown Film {number}")
+    assert service.source_health()['_try_omdb_api'] == 'open'
+
+    # The next lookup goes straight to the fallbacks
+    details = service.get_movie_details("Another Unknown Film")
+    assert details['poster_path']
+    assert len(calls) == CIRCUIT_FAILURE_THRESHOLD
@@ -0,0 +1,138 @@
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+import http_client
+from http_client import CIRCUIT_FAILURE_THRESHOLD, CircuitBreaker, CircuitOpenError, HttpClient
+
+class FakeClock:
+    """Stand-in for time.monotonic, moved by hand"""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+class FakeSession:
+    """Session answering every GET with the next status code, or raising an exception"""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = []
+
+    def get(self, url, **kwargs):
+        self.calls.append((url, kwargs))
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return SimpleNamespace(status_code=outcome)
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    # Only the client module sees the fake clock
+    monkeypatch.setattr(http_client, 'time', SimpleNamespace(monotonic=fake))
+    return fake
+
+def test_breaker_opens_after_the_threshold(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30)
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.state == 'closed' and breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == 'open'
+    assert not breaker.allow()
+
+def test_success_resets_the_failure_count(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == 'closed'
+
+def test_half_open_lets_one_trial_through(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    clock.advance(29)
+    assert not breaker.allow()
+
+    clock.advance(1)
+    assert breaker.state == 'half-open'
+    assert breaker.allow()
+    # Only one trial at a time
+    assert not breaker.allow()
+
+def test_successful_trial_closes_the_circuit(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    clock.advance(30)
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == 'closed' and breaker.allow()
+
+def test_failed_trial_opens_the_circuit_again(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30)
+    for _ in range(3):
+        breaker.record_failure()
+    clock.advance(30)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == 'open'
+    clock.advance(29)
+    assert not breaker.allow()
+
+def test_server_errors_and_exceptions_open_the_host_circuit(clock):
+    client = HttpClient()
+    client.session = FakeSession(requests.ConnectionError("down"), *[503] * (CIRCUIT_FAILURE_THRESHOLD - 1))
+    with pytest.raises(requests.ConnectionError):
+        client.get("http://down.example/a")
+    for _ in range(CIRCUIT_FAILURE_THRESHOLD - 1):
+        client.get("http://down.example/b")
+
+    assert client.circuit_states() == {'down.example': 'open'}
+    with pytest.raises(CircuitOpenError):
+        client.get("http://down.example/c")
+    assert len(client.session.calls) == CIRCUIT_FAILURE_THRESHOLD
+
+def test_client_errors_do_not_count_against_the_host(clock):
+    client = HttpClient()
+    client.session = FakeSession(*[404] * (CIRCUIT_FAILURE_THRESHOLD * 2))
+    for _ in range(CIRCUIT_FAILURE_THRESHOLD * 2):
+        assert client.get("http://up.example/missing").status_code == 404
+    assert client.circuit_states() == {'up.example': 'closed'}
+
+def test_hosts_have_separate_circuits(clock):
+    client = HttpClient()
+    client.session = FakeSession(*[500] * CIRCUIT_FAILURE_THRESHOLD, 200)
+    for _ in range(CIRCUIT_FAILURE_THRESHOLD):
+        client.get("http://down.example/")
+    assert client.get("http://up.example/").status_code == 200
+    assert client.circuit_states() == {'down.example': 'open', 'up.example': 'closed'}
+
+def test_retry_budgets_get_their_own_sessions():
+    client = HttpClient(max_retries=2)
+    assert client._session(None) is client.session
+    assert client._session(2) is client.session
+
+    no_retries = client._session(0)
+    assert no_retries is not client.session
+    assert client._session(0) is no_retries
+    assert no_retries.get_adapter('https://example.com').max_retries.total == 0
+    assert client.session.get_adapter('https://example.com').max_retries.total == 2
+    # Headers are shared, so updates reach every budget
+    client.headers['X-Test'] = '1'
+    assert no_retries.headers['X-Test'] == '1'
+
+def test_get_uses_the_session_of_the_retry_budget(clock):
+    client = HttpClient(max_retries=2)
+    client.session = FakeSession()
+    client.sessions[0] = FakeSession(200)
+    assert client.get("http://example.com/", timeout=(3, 10), retries=0).status_code == 200
+    assert client.sessions[0].calls == [("http://example.com/", {'timeout': (3, 10)})]
+    assert client.session.calls == []
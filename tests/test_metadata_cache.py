@@ -0,0 +1,107 @@
+from types import SimpleNamespace
+
+import pytest
+
+import metadata_cache
+from metadata_cache import MemoryCache, MetadataCache, cache_key
+
+class FakeClock:
+    """Stand-in for time.time and time.monotonic, moved by hand"""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    # Only the cache module sees the fake clock
+    monkeypatch.setattr(metadata_cache, 'time', SimpleNamespace(time=fake, monotonic=fake))
+    return fake
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    return MetadataCache(str(tmp_path / 'metadata.sqlite3'), ttl=100, miss_ttl=10, max_entries=3, touch_interval=5)
+
+def test_cache_key_normalizes_titles():
+    assert cache_key("  The   MATRIX ") == cache_key("the matrix")
+    assert cache_key("The Matrix", movie_id=603) == "id:603"
+
+def test_metadata_cache_round_trip(cache):
+    assert cache.get("Inception") == (False, None)
+    cache.set("Inception", {'year': '2010', 'genre': ['Sci-Fi']})
+    assert cache.get("inception") == (True, {'year': '2010', 'genre': ['Sci-Fi']})
+
+def test_metadata_cache_returns_fresh_copies(cache):
+    cache.set("Inception", {'year': '2010'})
+    _, details = cache.get("Inception")
+    details['year'] = 'changed'
+    assert cache.get("Inception") == (True, {'year': '2010'})
+
+def test_metadata_cache_entries_expire(cache, clock):
+    cache.set("Inception", {'year': '2010'})
+    clock.advance(99)
+    assert cache.get("Inception")[0]
+    clock.advance(1)
+    assert cache.get("Inception") == (False, None)
+
+def test_metadata_cache_misses_expire_sooner(cache, clock):
+    cache.set_missing("Unknown Movie")
+    assert cache.get("Unknown Movie") == (True, None)
+    clock.advance(10)
+    assert cache.get("Unknown Movie") == (False, None)
+
+def test_metadata_cache_evicts_least_recently_used(cache, clock):
+    for title in ("A", "B", "C"):
+        cache.set(title, {'title': title})
+        clock.advance(5)
+    # Reading A makes B the least recently used
+    assert cache.get("A")[0]
+    clock.advance(1)
+    cache.set("D", {'title': 'D'})
+
+    assert cache.get("B") == (False, None)
+    assert all(cache.get(title)[0] for title in ("A", "C", "D"))
+
+def test_metadata_cache_records_use_at_most_every_touch_interval(cache, clock):
+    def accessed_at():
+        return cache.connection.execute("SELECT accessed_at FROM metadata WHERE key = ?",
+                                        (cache_key("Inception"),)).fetchone()[0]
+
+    cache.set("Inception", {'year': '2010'})
+    stored = accessed_at()
+    clock.advance(4)
+    assert cache.get("Inception")[0]
+    assert accessed_at() == stored
+    clock.advance(1)
+    assert cache.get("Inception")[0]
+    assert accessed_at() == stored + 5
+
+def test_metadata_cache_is_shared_through_the_file(tmp_path, clock):
+    path = str(tmp_path / 'metadata.sqlite3')
+    MetadataCache(path).set("Inception", {'year': '2010'})
+    assert MetadataCache(path).get("Inception") == (True, {'year': '2010'})
+
+def test_metadata_cache_clear(cache):
+    cache.set("Inception", {'year': '2010'})
+    cache.clear()
+    assert cache.get("Inception") == (False, None)
+
+def test_memory_cache_expiry_and_lru(clock):
+    memory = MemoryCache(capacity=2, ttl=5)
+    memory.set("a", 1)
+    memory.set("b", 2)
+    assert memory.get("a") == 1
+    memory.set("c", 3)
+    # b was the least recently used
+    assert memory.get("b") is None
+    assert memory.get("c") == 3
+
+    clock.advance(5)
+    assert memory.get("a", 'expired') == 'expired'
+    assert memory.stats() == {'hits': 2, 'misses': 2, 'size': 1, 'capacity': 2}
@@ -0,0 +1,175 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.feature_extraction.text import CountVectorizer
+
+from model_store import (add_movies_to_model, build_neighbor_index, get_filtered_neighbors, get_neighbors,
+                         load_model, normalize_vectors, save_model, top_k_indices, update_model_with_new_movies)
+
+def brute_force_neighbors(vector, top_k):
+    """Top-K neighbors from the dense cosine similarity matrix"""
+    normalized = normalize_vectors(vector).toarray()
+    similarity = normalized @ normalized.T
+    np.fill_diagonal(similarity, -np.inf)
+    ids = np.argsort(-similarity, axis=1, kind='stable')[:, :top_k]
+    return ids, np.take_along_axis(similarity, ids, axis=1)
+
+def random_features(rows=60, columns=40, seed=0):
+    rng = np.random.default_rng(seed)
+    return sparse.random(rows, columns, density=0.2, format='csr', random_state=rng, dtype=np.float64)
+
+def test_top_k_indices_best_first():
+    scores = np.array([[0.1, 0.9, 0.5, 0.7], [3.0, 1.0, 2.0, 0.0]])
+    assert top_k_indices(scores, 2).tolist() == [[1, 3], [0, 2]]
+
+def test_top_k_indices_clamps_k():
+    scores = np.array([0.2, 0.8, 0.5])
+    assert top_k_indices(scores, 10).tolist() == [1, 2, 0]
+    assert top_k_indices(scores, 0).shape == (0,)
+
+def test_neighbor_index_matches_brute_force():
+    vector = random_features()
+    ids, scores = build_neighbor_index(vector, top_k=5, block_size=7)
+    _, expected_scores = brute_force_neighbors(vector, 5)
+
+    assert ids.shape == scores.shape == (60, 5)
+    np.testing.assert_allclose(scores.astype(np.float32), expected_scores, atol=1e-3)
+    # Ids may differ among tied scores, never the scores they point at
+    similarity = normalize_vectors(vector).toarray() @ normalize_vectors(vector).toarray().T
+    np.testing.assert_allclose(np.take_along_axis(similarity, ids.astype(np.intp), axis=1),
+                               expected_scores, atol=1e-6)
+
+def test_neighbor_index_excludes_the_movie_itself():
+    ids, _ = build_neighbor_index(random_features(), top_k=10, block_size=16)
+    assert not (ids == np.arange(len(ids))[:, None]).any()
+
+def test_neighbor_index_block_size_does_not_change_results():
+    vector = random_features()
+    ids_small, scores_small = build_neighbor_index(vector, top_k=5, block_size=3)
+    ids_large, scores_large = build_neighbor_index(vector, top_k=5, block_size=1000)
+    np.testing.assert_array_equal(scores_small, scores_large)
+    np.testing.assert_array_equal(ids_small, ids_large)
+
+def test_neighbor_index_top_k_capped_by_catalog_size():
+    ids, scores = build_neighbor_index(random_features(rows=4), top_k=50)
+    assert ids.shape == scores.shape == (4, 3)
+
+def test_parallel_build_matches_serial(tmp_path):
+    vector = random_features(rows=80)
+    serial_ids, serial_scores = build_neighbor_index(vector, top_k=6, block_size=16)
+    parallel_ids, parallel_scores = build_neighbor_index(vector, top_k=6, block_size=16,
+                                                         spill_dir=str(tmp_path), workers=2)
+    np.testing.assert_array_equal(np.asarray(parallel_scores), serial_scores)
+    np.testing.assert_array_equal(np.asarray(parallel_ids), serial_ids)
+
+def random_movies(count, seed, start=0):
+    """Movies whose tags are a few words from a small shared vocabulary"""
+    rng = np.random.default_rng(seed)
+    words = [f"word{i}" for i in range(30)]
+    return pd.DataFrame({
+        'movie_id': [str(start + i) for i in range(count)],
+        'title': [f"Movie {start + i}" for i in range(count)],
+        'tags': [' '.join(rng.choice(words, size=6)) for _ in range(count)]
+    })
+
+def save_random_model(model_dir, count, top_k):
+    movies = random_movies(count, seed=1)
+    cv = CountVectorizer()
+    vector = cv.fit_transform(movies['tags'])
+    ids, scores = build_neighbor_index(vector, top_k=top_k)
+    save_model(movies, ids, scores, str(model_dir), vectorizer=cv, features=vector)
+    return cv
+
+def assert_matches_rebuild(model_dir, cv, top_k):
+    """The saved index equals a full build with the same vocabulary"""
+    model = load_model(str(model_dir))
+    ids, scores = build_neighbor_index(cv.transform(model['movies']['tags']), top_k=top_k)
+    assert model['neighbor_ids'].shape == ids.shape
+    np.testing.assert_allclose(np.asarray(model['neighbor_scores'], dtype=np.float32),
+                               scores.astype(np.float32), atol=1e-3)
+
+def test_add_movies_matches_full_rebuild(tmp_path):
+    cv = save_random_model(tmp_path, count=60, top_k=10)
+    assert add_movies_to_model(random_movies(5, seed=2, start=60), str(tmp_path))
+    assert_matches_rebuild(tmp_path, cv, top_k=10)
+
+def test_add_movies_keeps_short_neighbor_lists(tmp_path):
+    # Saved with fewer neighbors than NEIGHBOR_COUNT, e.g. after changing it
+    cv = save_random_model(tmp_path, count=120, top_k=20)
+    update_model_with_new_movies([{'title': 'New Movie', 'overview': 'word1 word2 word3', 'genres': [],
+                                   'keywords': [], 'cast': [], 'crew': []}], str(tmp_path))
+    assert_matches_rebuild(tmp_path, cv, top_k=20)
+
+def test_add_movies_grows_complete_neighbor_lists(tmp_path):
+    cv = save_random_model(tmp_path, count=8, top_k=50)
+    assert add_movies_to_model(random_movies(3, seed=2, start=8), str(tmp_path))
+    assert_matches_rebuild(tmp_path, cv, top_k=10)
+
+def test_features_are_memory_mapped(tmp_path):
+    cv = save_random_model(tmp_path, count=20, top_k=5)
+    features = load_model(str(tmp_path))['features']
+    assert not features.data.flags.writeable
+    expected = normalize_vectors(cv.transform(random_movies(20, seed=1)['tags']))
+    np.testing.assert_allclose(features.toarray(), expected.toarray())
+
+def masked_brute_force(model, index, k, mask):
+    """Scores of the k movies most similar to index among those allowed by mask"""
+    features = model['features'].toarray()
+    similarity = features @ features[index]
+    similarity[~mask] = -np.inf
+    similarity[index] = -np.inf
+    ranked = np.sort(similarity)[::-1][:k]
+    return ranked[np.isfinite(ranked)]
+
+def test_filtered_neighbors_without_mask(tmp_path):
+    save_random_model(tmp_path, count=30, top_k=5)
+    model = load_model(str(tmp_path))
+    for actual, expected in zip(get_filtered_neighbors(model, 3, 4, None), get_neighbors(model, 3, 4)):
+        np.testing.assert_array_equal(actual, expected)
+
+def test_filtered_neighbors_from_the_cached_list(tmp_path):
+    save_random_model(tmp_path, count=60, top_k=10)
+    model = load_model(str(tmp_path))
+    cached_ids = np.asarray(model['neighbor_ids'][0])
+    mask = np.ones(60, dtype=bool)
+    mask[cached_ids[::2]] = False
+
+    ids, scores = get_filtered_neighbors(model, 0, 5, mask)
+    np.testing.assert_array_equal(ids, cached_ids[1::2])
+    assert mask[ids].all()
+    np.testing.assert_allclose(scores, masked_brute_force(model, 0, 5, mask), atol=1e-3)
+
+def test_filtered_neighbors_fall_back_to_the_features(tmp_path):
+    save_random_model(tmp_path, count=60, top_k=10)
+    model = load_model(str(tmp_path))
+    # None of the cached neighbors are allowed
+    mask = np.ones(60, dtype=bool)
+    mask[np.asarray(model['neighbor_ids'][0])] = False
+
+    ids, scores = get_filtered_neighbors(model, 0, 5, mask)
+    assert len(ids) == 5
+    assert mask[ids].all() and 0 not in ids
+    np.testing.assert_allclose(scores, masked_brute_force(model, 0, 5, mask), atol=1e-6)
+
+def test_filtered_neighbors_of_a_complete_list(tmp_path):
+    save_random_model(tmp_path, count=8, top_k=50)
+    model = load_model(str(tmp_path))
+    mask = np.zeros(8, dtype=bool)
+    mask[[2, 5, 6]] = True
+
+    # Every other movie is in the list already: fewer than k allowed is the answer
+    ids, scores = get_filtered_neighbors(model, 0, 5, mask)
+    assert sorted(ids.tolist()) == [2, 5, 6]
+    np.testing.assert_allclose(scores, masked_brute_force(model, 0, 5, mask), atol=1e-3)
+
+def test_filtered_neighbors_without_features(tmp_path):
+    save_random_model(tmp_path, count=60, top_k=10)
+    model = dict(load_model(str(tmp_path)), features=None)
+    cached_ids = np.asarray(model['neighbor_ids'][0])
+    mask = np.zeros(60, dtype=bool)
+    mask[cached_ids[:3]] = True
+    mask[[row for row in range(1, 60) if row not in cached_ids][:5]] = True
+
+    # Only the cached neighbors can be returned
+    ids, _ = get_filtered_neighbors(model, 0, 5, mask)
+    np.testing.assert_array_equal(ids, cached_ids[:3])
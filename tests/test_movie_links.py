@@ -0,0 +1,54 @@
+import json
+import os
+
+import pytest
+
+import movie_links
+from movie_links import LinkTable, TitleSet, load_movie_links
+
+def test_data_file_resolves_against_the_module():
+    assert os.path.isabs(movie_links.MOVIE_LINKS_FILE)
+    assert os.path.exists(movie_links.MOVIE_LINKS_FILE)
+    assert len(movie_links.TRAILER_URLS) > 0
+
+def test_missing_data_file_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        load_movie_links(str(tmp_path / 'missing.json'))
+
+def test_unknown_format_version_raises(tmp_path):
+    path = tmp_path / 'movie_links.json'
+    path.write_text(json.dumps({'format_version': 99}))
+    with pytest.raises(ValueError):
+        load_movie_links(str(path))
+
+def test_link_table_lookups():
+    table = LinkTable({"Schindler's List": 'a', "Toy Story": 'b'})
+    assert table.get("schindlers list") == 'a'
+    assert table.get("Unknown") is None
+    assert table.match("Toy Story 3") == 'b'
+    assert table.match("Toy") is None
+    with pytest.raises(TypeError):
+        table.entries["New"] = 'c'
+
+def test_title_set_find_in():
+    titles = TitleSet(["toy story", "up", "toy story"])
+    assert len(titles) == 2
+    assert "Toy Story" in titles
+    assert titles.find_in("Toy Story 3") == "toy story"
+    assert titles.find_in("Upside Down") is None
+
+@pytest.mark.parametrize('title', [
+    "Zero Dark Thirty", "Dark City", "The Dark Knight Rises", "You Only Live Twice",
+])
+def test_single_words_are_not_netflix_originals(title):
+    assert movie_links.NETFLIX_TITLES.find_in(title) is None
+
+@pytest.mark.parametrize('title', [
+    "Up in the Air", "Soul Surfer", "Wish Upon", "Planes, Trains and Automobiles",
+])
+def test_single_words_are_not_disney_titles(title):
+    assert movie_links.DISNEY_TITLES.find_in(title) is None
+
+def test_disney_titles_and_sequels():
+    assert movie_links.DISNEY_TITLES.find_in("Toy Story 3") == "toy story"
+    assert movie_links.DISNEY_TITLES.find_in("Monsters, Inc.") == "monsters inc"
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from model_store import filter_mask
+from movie_metadata import MovieMetadata, runtime_buckets, release_years, save_metadata
+
+MOVIES = pd.DataFrame({
+    'genres': [['Action', 'Sci-Fi'], ['Drama'], ['Action', 'Drama'], [], ['Comedy']],
+    'runtime': [136, 89, 120, None, 95],
+    'vote_average': [8.7, 7.1, 8.0, None, 6.4],
+    'vote_count': [20000, 150, 9000, None, 320],
+    'original_language': ['en', 'fr', 'en', None, 'ja'],
+    'release_date': ['1999-03-31', '2001', '2008-07-18', '', '1999'],
+    'overview': ['Neo wakes up.', None, 'Gotham burns.', None, 'Short and funny.']
+})
+
+@pytest.fixture
+def metadata(tmp_path):
+    info = save_metadata(MOVIES, str(tmp_path))
+    return MovieMetadata(str(tmp_path), info)
+
+def rows(mask):
+    return np.flatnonzero(mask).tolist()
+
+def test_runtime_buckets_and_release_years():
+    assert runtime_buckets([60, 89.9, 90, 120, 121, np.nan]).tolist() == [0, 0, 1, 1, 2, -1]
+    assert release_years(['1994-09-23', '1994', '', None, 'unknown']).tolist() == [1994, 1994, 0, 0, 0]
+
+def test_no_filters_match_everything(metadata):
+    assert rows(metadata.filter_mask()) == [0, 1, 2, 3, 4]
+
+def test_filter_by_language(metadata):
+    assert rows(metadata.filter_mask(languages=['en'])) == [0, 2]
+    assert rows(metadata.filter_mask(languages=['fr', 'ja'])) == [1, 4]
+    assert rows(metadata.filter_mask(languages=['de'])) == []
+
+def test_filter_by_runtime_bucket(metadata):
+    assert rows(metadata.filter_mask(runtime_bucket=0)) == [1]
+    assert rows(metadata.filter_mask(runtime_bucket=1)) == [2, 4]
+    assert rows(metadata.filter_mask(runtime_bucket=2)) == [0]
+
+def test_filter_by_genres_needs_all_of_them(metadata):
+    assert rows(metadata.filter_mask(genres=['Action'])) == [0, 2]
+    assert rows(metadata.filter_mask(genres=['Action', 'Drama'])) == [2]
+    assert rows(metadata.filter_mask(genres=['Western'])) == []
+
+def test_filter_by_year_range_is_inclusive(metadata):
+    assert rows(metadata.filter_mask(year_range=(1999, 2001))) == [0, 1, 4]
+    assert rows(metadata.filter_mask(year_range=(2002, 2010))) == [2]
+
+def test_filters_combine(metadata):
+    assert rows(metadata.filter_mask(languages=['en'], genres=['Drama'], year_range=(2000, 2010))) == [2]
+
+def test_unknown_values_match_no_filter(metadata):
+    filters = [{'languages': ['en', 'fr', 'ja']}, {'year_range': (1900, 2100)}]
+    filters += [{'runtime_bucket': bucket} for bucket in range(3)]
+    for movie_filter in filters:
+        assert 3 not in rows(metadata.filter_mask(**movie_filter))
+
+def test_details_round_trip(metadata):
+    assert metadata.get_details(0) == {
+        'genres': ['Action', 'Sci-Fi'], 'runtime': 136, 'vote_average': 8.7, 'vote_count': 20000,
+        'original_language': 'en', 'release_date': '1999-03-31', 'overview': 'Neo wakes up.'
+    }
+    assert metadata.get_details(3) == {}
+
+def test_model_filter_mask(metadata):
+    assert rows(filter_mask({'metadata': metadata}, languages=['en'])) == [0, 2]
+    # Models saved without a snapshot can't be filtered
+    assert filter_mask({'metadata': None}, languages=['en']) is None
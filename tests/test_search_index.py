@@ -0,0 +1,66 @@
+import numpy as np
+
+from search_index import TitleSearchIndex, trigrams
+
+TITLES = [
+    "The Dark Knight Rises",
+    "Batman Begins",
+    "The Dark Knight",
+    "Dark City",
+    "Knight and Day",
+    "The Darkest Hour",
+    "Inception",
+    "The Matrix",
+    "The Matrix Reloaded",
+    "Zero Dark Thirty",
+]
+
+def search(query, **kwargs):
+    return TitleSearchIndex(TITLES).search_titles(query, **kwargs)
+
+def test_trigrams_mark_word_boundaries():
+    assert trigrams("up") == {" up", "up "}
+    assert trigrams("dark") == {" da", "dar", "ark", "rk "}
+
+def test_exact_title_comes_first():
+    assert search("the dark knight")[:2] == ["The Dark Knight", "The Dark Knight Rises"]
+    assert search("THE MATRIX")[:2] == ["The Matrix", "The Matrix Reloaded"]
+
+def test_title_prefixes_before_word_prefixes_before_substrings():
+    assert search("dark", min_similarity=1.0) == [
+        # Title starts with the query
+        "Dark City",
+        # A word starts with the query, by that word then in list order
+        "The Dark Knight Rises", "The Dark Knight", "Zero Dark Thirty", "The Darkest Hour",
+    ]
+    assert search("atri", min_similarity=1.0) == ["The Matrix", "The Matrix Reloaded"]
+
+def test_misspellings_ranked_by_similarity():
+    assert search("incepton")[0] == "Inception"
+    assert search("batmn begins")[0] == "Batman Begins"
+
+def test_unrelated_queries_find_nothing():
+    assert search("qwxz") == []
+    assert search("") == []
+    assert search("   ") == []
+
+def test_limit_and_allowed_mask():
+    assert len(search("dark", limit=2)) == 2
+    assert search("dark", limit=0) == []
+
+    allowed = np.ones(len(TITLES), dtype=bool)
+    allowed[TITLES.index("Dark City")] = False
+    assert "Dark City" not in search("dark", allowed=allowed)
+    assert search("dark city", allowed=allowed, min_similarity=1.0) == []
+
+    # Misspellings are picked among the allowed titles, not cut down before the mask
+    titles = [f"Batmn {number}" for number in range(30)] + ["Batmam Forever", "Batmn Under"]
+    allowed = np.zeros(len(titles), dtype=bool)
+    allowed[-2:] = True
+    found = TitleSearchIndex(titles).search_titles("batmn", limit=5, allowed=allowed)
+    assert found == ["Batmn Under", "Batmam Forever"]
+
+def test_search_returns_rows():
+    index = TitleSearchIndex(TITLES)
+    assert len(index) == len(TITLES)
+    assert index.search("inception") == [TITLES.index("Inception")]
@@ -0,0 +1,61 @@
+import pytest
+
+from title_matcher import TITLE_MATCH_THRESHOLD, TitleMatcher, normalize_for_matching
+
+KEYS = [
+    "The Dark Knight", "The Matrix", "Inception", "Schindler's List", "Harry Potter", "Toy Story",
+    "Wreck It Ralph", "Ant-Man", "X-Men", "The Batman", "Star Wars", "The Lion King", "Up", "The Nun", "Brave",
+    "Frozen",
+]
+
+@pytest.fixture(scope='module')
+def matcher():
+    return TitleMatcher(KEYS)
+
+def test_normalize_for_matching():
+    assert normalize_for_matching("Schindler’s List") == "schindlers list"
+    assert normalize_for_matching("  Amélie  ") == "amelie"
+    assert normalize_for_matching("Fast & Furious") == "fast and furious"
+    assert normalize_for_matching("Spider-Man: No Way Home") == "spider man no way home"
+
+@pytest.mark.parametrize('title, key', [
+    ("the dark knight", "The Dark Knight"),
+    ("Schindlers List", "Schindler's List"),
+    ("Wreck-It Ralph", "Wreck It Ralph"),
+    ("UP", "Up"),
+])
+def test_same_normalized_title(matcher, title, key):
+    assert matcher.match(title) == (key, 1.0)
+    assert matcher.exact(title) == key
+
+@pytest.mark.parametrize('title, key', [
+    ("Matrix", "The Matrix"),
+    ("Lion King", "The Lion King"),
+    ("Toy Story 3", "Toy Story"),
+    ("Frozen II", "Frozen"),
+])
+def test_contained_titles(matcher, title, key):
+    found, score = matcher.match(title)
+    assert found == key
+    assert score >= TITLE_MATCH_THRESHOLD
+
+@pytest.mark.parametrize('title, key', [
+    ("The Dark Knigt", "The Dark Knight"),
+    ("Incepton", "Inception"),
+])
+def test_misspelled_titles(matcher, title, key):
+    assert matcher.best_match(title) == key
+
+@pytest.mark.parametrize('title', [
+    # One short word of a longer title
+    "It", "X", "The Man", "Star", "Man", "Story",
+    # A key that is only part of the title
+    "The Brave One", "Harry Potter and the Goblet of Fire",
+    # Similar spelling, different movie
+    "Batman Begins",
+    # Stop words alone
+    "The", "The Of",
+    "", "Completely Unrelated",
+])
+def test_short_and_unrelated_titles_match_nothing(matcher, title):
+    assert matcher.best_match(title) is None
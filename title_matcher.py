@@ -0,0 +1,149 @@
+"""
+Title Matcher - Resolve a movie title to the closest key of a lookup table
+Shared by the trailer and streaming lookups: exact normalized titles first, then
+titles containing one another as whole words, then similar spellings by trigram
+similarity, all through indexes built once per table
+"""
+
+import re
+import unicodedata
+from collections import defaultdict
+import numpy as np
+from search_index import trigrams
+
+try:
+    from config import TITLE_MATCH_THRESHOLD
+except ImportError:
+    # Fallback to default values if config.py can't be imported
+    TITLE_MATCH_THRESHOLD = 0.7
+
+# Words too common to make two titles related on their own
+STOP_WORDS = frozenset(['the', 'a', 'an', 'of', 'and', 'in', 'on', 'at', 'to', 'for'])
+
+def normalize_for_matching(title):
+    """Lowercase words of a title without accents, apostrophes or punctuation ("Schindler's List" -> "schindlers list")"""
+    text = unicodedata.normalize('NFKD', str(title))
+    text = ''.join(char for char in text if not unicodedata.combining(char)).casefold()
+    text = re.sub(r"['’]", '', text).replace('&', ' and ')
+    return ' '.join(re.sub(r'[\W_]+', ' ', text).split())
+
+def _content_text(tokens):
+    """Words of a normalized title without stop words, the part compared for misspellings"""
+    return ' '.join(token for token in tokens if token not in STOP_WORDS)
+
+def _content_length(tokens):
+    """Letters in the distinct words of a normalized title besides stop words"""
+    return sum(len(token) for token in set(tokens) - STOP_WORDS)
+
+class TitleMatcher:
+    """Index of the keys of a lookup table, answering which key a movie title refers to"""
+
+    def __init__(self, keys):
+        self.keys = list(keys)
+        self.normalized = [normalize_for_matching(key) for key in self.keys]
+        self.token_lists = [normalized.split() for normalized in self.normalized]
+
+        # Normalized key -> first key with it
+        self.by_normalized = {}
+        for position, normalized in enumerate(self.normalized):
+            self.by_normalized.setdefault(normalized, position)
+
+        # Word -> keys containing it, and first word -> keys starting with it
+        self.word_index = defaultdict(list)
+        self.first_word_index = defaultdict(list)
+        for position, tokens in enumerate(self.token_lists):
+            for token in set(tokens):
+                self.word_index[token].append(position)
+            if tokens:
+                self.first_word_index[tokens[0]].append(position)
+
+        # Trigram -> keys containing it (stop words left out), for misspelled titles
+        postings = defaultdict(list)
+        self.trigram_counts = np.zeros(len(self.keys), dtype=np.int32)
+        for position, tokens in enumerate(self.token_lists):
+            grams = trigrams(_content_text(tokens))
+            self.trigram_counts[position] = len(grams)
+            for gram in grams:
+                postings[gram].append(position)
+        self.postings = {gram: np.array(positions, dtype=np.int64) for gram, positions in postings.items()}
+
+    def __len__(self):
+        return len(self.keys)
+
+    def exact(self, title):
+        """Key equal to the title once normalized, or None"""
+        position = self.by_normalized.get(normalize_for_matching(title))
+        return self.keys[position] if position is not None else None
+
+    def _phrases_in(self, tokens):
+        """Positions of the keys whose words appear consecutively in tokens"""
+        found = []
+        for start, token in enumerate(tokens):
+            for position in self.first_word_index.get(token, ()):
+                key_tokens = self.token_lists[position]
+                if tokens[start:start + len(key_tokens)] == key_tokens:
+                    found.append(position)
+        return found
+
+    def match(self, title):
+        """Closest key and its similarity score (0-1), or (None, 0.0) if nothing is related
+
+        1.0 for the same normalized title; when one title contains the other as
+        whole words, the share of the longer one's letters it covers (stop words
+        aside), so "Toy Story" in "Toy Story 3" scores high and "It" in "Wreck It
+        Ralph" low; for misspellings, titles differing in more than added or dropped
+        words, the trigram (Dice) similarity of the words besides stop words. The
+        best of these is returned, however low.
+        """
+        query = normalize_for_matching(title)
+        if not query:
+            return None, 0.0
+        position = self.by_normalized.get(query)
+        if position is not None:
+            return self.keys[position], 1.0
+
+        tokens = query.split()
+        content = set(tokens) - STOP_WORDS
+        if not content:
+            # "The" alone relates nothing
+            return None, 0.0
+        scores = {}
+
+        def containment(shorter, longer):
+            return _content_length(shorter) / _content_length(longer)
+
+        # Keys inside the title ("Toy Story" in "Toy Story 3")
+        for position in self._phrases_in(tokens):
+            scores[position] = containment(self.token_lists[position], tokens)
+
+        # The title inside keys ("Matrix" in "The Matrix"); candidates share its rarest word
+        rarest = min(content, key=lambda token: len(self.word_index.get(token, ())))
+        padded_query = f" {query} "
+        for position in self.word_index.get(rarest, ()):
+            if padded_query in f" {self.normalized[position]} ":
+                scores[position] = max(scores.get(position, 0.0), containment(tokens, self.token_lists[position]))
+
+        # Similar spellings ("The Dark Knigt")
+        grams = trigrams(_content_text(tokens))
+        lists = [self.postings[gram] for gram in grams if gram in self.postings]
+        if lists:
+            shared = np.bincount(np.concatenate(lists), minlength=len(self.keys))
+            best = int(np.argmax(2.0 * shared / (len(grams) + self.trigram_counts)))
+            similarity = 2.0 * shared[best] / (len(grams) + self.trigram_counts[best])
+            # Titles only adding or dropping words ("The Brave One", "Brave") are scored by coverage above
+            key_content = set(self.token_lists[best]) - STOP_WORDS
+            if not (key_content <= content or content <= key_content):
+                scores[best] = max(scores.get(best, 0.0), float(similarity))
+
+        # Keys of stop words only ("The") relate nothing
+        scores = {position: score for position, score in scores.items() if score > 0}
+        if not scores:
+            return None, 0.0
+        # Ties go to the key listed first, like the old scans
+        position = max(sorted(scores), key=scores.__getitem__)
+        return self.keys[position], scores[position]
+
+    def best_match(self, title, threshold=TITLE_MATCH_THRESHOLD):
+        """Closest key if it scores at least threshold, else None"""
+        key, score = self.match(title)
+        return key if score >= threshold else None